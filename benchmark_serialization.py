@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for tool output serialization.
+
+Compares the previous ``json.dumps(indent=2, default=str)`` call with the
+serializer layer on 10k and 100k converted records.
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from neo4j.spatial import WGS84Point
+from neo4j.time import DateTime, Duration
+
+from neo4j_mcp import serialization
+from neo4j_mcp.serialization import dumps
+
+
+def make_records(count):
+    """Build records shaped like converted read results."""
+    return [
+        {
+            "id": i,
+            "name": f"customer-{i}",
+            "score": i * 0.25,
+            "active": i % 2 == 0,
+            "tags": ["a", "b", "c"],
+            "created": DateTime(2024, 1, 1 + i % 28, 12, 30, 15),
+            "tenure": Duration(months=i % 12, days=3),
+            "location": WGS84Point((13.4 + i * 1e-6, 52.5)),
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    print(f"Serializer backend: {serialization.BACKEND}")
+    print("=" * 60)
+    for count in (10_000, 100_000):
+        records = make_records(count)
+        baseline = best_of(lambda: json.dumps(records, indent=2, default=str))
+        pretty = best_of(lambda: dumps(records))
+        compact = best_of(lambda: dumps(records, compact=True))
+        size_baseline = len(json.dumps(records, indent=2, default=str))
+        size_compact = len(dumps(records, compact=True))
+
+        print(f"\n{count:,} records")
+        print(f"  json.dumps(indent=2, default=str): {baseline * 1000:8.1f} ms  {size_baseline:,} chars")
+        print(f"  dumps():                           {pretty * 1000:8.1f} ms  ({baseline / pretty:.1f}x)")
+        print(f"  dumps(compact=True):               {compact * 1000:8.1f} ms  "
+              f"({baseline / compact:.1f}x)  {size_compact:,} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,10 @@ setup(
         ],
     },
     extras_require={
+        # Faster JSON encoding of tool output; the standard library is used without it
+        "fast": [
+            "orjson>=3",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
@@ -3,12 +3,17 @@
 import os
 import platform
 import subprocess
-from typing import List, Optional
+import tempfile
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from .discovery import host_discovery_cache
+
 load_dotenv()
 
+DEFAULT_STATE_DIR = os.path.join("~", ".cache", "neo4j-mcp")
+
 
 class Neo4jConfig(BaseModel):
     """Neo4j connection configuration with cross-platform support."""
@@ -22,12 +27,88 @@ class Neo4jConfig(BaseModel):
     windows_host_ips: List[str] = Field(default_factory=list)
     connection_timeout: int = Field(default=30)
     max_connection_retries: int = Field(default=3)
+    connection_probe_stagger: float = Field(default=0.25)
+
+    # Health checks and failover between candidate URIs
+    health_check_interval: float = Field(default=30.0)
+    health_check_timeout: float = Field(default=5.0)
+    health_failure_threshold: int = Field(default=2)
+    failover_drain_timeout: float = Field(default=30.0)
+
+    # Background warm-up at server start
+    warmup_enabled: bool = Field(default=False)
+    warmup_connections: int = Field(default=2)
+    warmup_schema: bool = Field(default=True)
+
+    # Write transaction retry settings
+    write_retry_attempts: int = Field(default=5)
+    write_retry_max_time: float = Field(default=30.0)
+    write_retry_initial_delay: float = Field(default=0.1)
+    write_retry_max_delay: float = Field(default=5.0)
+
+    # Driver connection pool settings
+    max_connection_pool_size: int = Field(default=100)
+    connection_acquisition_timeout: float = Field(default=60.0)
+    max_connection_lifetime: float = Field(default=3600.0)
+    liveness_check_timeout: Optional[float] = Field(default=None)
+
+    # Local state directory for caches that survive restarts (empty disables them)
+    state_dir: str = Field(default="")
+
+    # Cached schema snapshot refresh (0 disables background refresh)
+    schema_refresh_interval: float = Field(default=300.0)
+    # Recent schema versions kept for `since` diffs
+    schema_history_size: int = Field(default=5)
+    # Recent distinct tool queries the index advisor checks (0 disables the log)
+    query_log_size: int = Field(default=200)
+    # Seconds an index listing stays current enough for the index advisor (0 lists on every call)
+    index_usage_max_age: float = Field(default=60.0)
+
+    # Seconds each schema section may take before it is reported as timed out (0 disables)
+    schema_query_timeout: float = Field(default=30.0)
+
+    # Property schema: the db.schema procedures up to this many nodes or relationships, sampling above it
+    schema_property_scan_limit: int = Field(default=1000000)
+    # Nodes per label and relationships per type sampled for property schema (0 disables sampling)
+    schema_property_sample: int = Field(default=100)
+
+    # Nodes sampled for the label combination breakdown (0 disables it)
+    schema_combination_sample: int = Field(default=0)
 
     # Tool enablement settings
     enable_schema_tool: bool = Field(default=True)
     enable_read_tool: bool = Field(default=True)
     enable_write_tool: bool = Field(default=True)
 
+    # Read result streaming settings
+    read_fetch_size: int = Field(default=1000)
+    read_result_limit: int = Field(default=1000)
+    compact_json: bool = Field(default=False)
+    read_output_budget: int = Field(default=40000)
+    read_output_budget_unit: str = Field(default="bytes")
+
+    # Read result cache (a size or TTL of 0 disables it)
+    read_cache_size: int = Field(default=256)
+    read_cache_ttl: float = Field(default=30.0)
+
+    # Spill files for full read results (empty spill_dir uses the state dir)
+    spill_dir: str = Field(default="")
+    spill_max_file_bytes: int = Field(default=1024 ** 3)
+    spill_max_total_bytes: int = Field(default=5 * 1024 ** 3)
+    spill_max_files: int = Field(default=20)
+    spill_chunk_bytes: int = Field(default=65536)
+
+    # Paginated read cursor settings
+    max_open_cursors: int = Field(default=8)
+    cursor_ttl: float = Field(default=300.0)
+    max_page_size: int = Field(default=1000)
+
+    # Tool call concurrency settings
+    schema_concurrency: int = Field(default=1)
+    read_concurrency: int = Field(default=8)
+    write_concurrency: int = Field(default=2)
+    max_queued_calls: int = Field(default=64)
+
     @classmethod
     def from_env(cls) -> "Neo4jConfig":
         """Create configuration from environment variables."""
@@ -38,9 +119,53 @@ class Neo4jConfig(BaseModel):
             database=os.getenv("NEO4J_DATABASE", "neo4j"),
             connection_timeout=int(os.getenv("NEO4J_TIMEOUT", "30")),
             max_connection_retries=int(os.getenv("NEO4J_RETRIES", "3")),
+            connection_probe_stagger=float(os.getenv("NEO4J_PROBE_STAGGER", "0.25")),
+            state_dir=os.getenv("NEO4J_STATE_DIR", DEFAULT_STATE_DIR),
+            health_check_interval=float(os.getenv("NEO4J_HEALTH_CHECK_INTERVAL", "30")),
+            health_check_timeout=float(os.getenv("NEO4J_HEALTH_CHECK_TIMEOUT", "5")),
+            health_failure_threshold=int(os.getenv("NEO4J_HEALTH_FAILURE_THRESHOLD", "2")),
+            failover_drain_timeout=float(os.getenv("NEO4J_FAILOVER_DRAIN_TIMEOUT", "30")),
+            warmup_enabled=os.getenv("NEO4J_WARMUP", "false").lower() == "true",
+            warmup_connections=int(os.getenv("NEO4J_WARMUP_CONNECTIONS", "2")),
+            warmup_schema=os.getenv("NEO4J_WARMUP_SCHEMA", "true").lower() == "true",
+            write_retry_attempts=int(os.getenv("NEO4J_WRITE_RETRIES", "5")),
+            write_retry_max_time=float(os.getenv("NEO4J_WRITE_RETRY_TIME", "30")),
+            write_retry_initial_delay=float(os.getenv("NEO4J_WRITE_RETRY_DELAY", "0.1")),
+            write_retry_max_delay=float(os.getenv("NEO4J_WRITE_RETRY_MAX_DELAY", "5")),
+            max_connection_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+            connection_acquisition_timeout=float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60")),
+            max_connection_lifetime=float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+            liveness_check_timeout=float(os.environ["NEO4J_LIVENESS_CHECK_TIMEOUT"]) if os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT") else None,
+            schema_refresh_interval=float(os.getenv("NEO4J_SCHEMA_REFRESH_INTERVAL", "300")),
+            schema_history_size=int(os.getenv("NEO4J_SCHEMA_HISTORY", "5")),
+            query_log_size=int(os.getenv("NEO4J_QUERY_LOG_SIZE", "200")),
+            index_usage_max_age=float(os.getenv("NEO4J_INDEX_USAGE_MAX_AGE", "60")),
+            schema_query_timeout=float(os.getenv("NEO4J_SCHEMA_QUERY_TIMEOUT", "30")),
+            schema_property_scan_limit=int(os.getenv("NEO4J_SCHEMA_PROPERTY_SCAN_LIMIT", "1000000")),
+            schema_property_sample=int(os.getenv("NEO4J_SCHEMA_PROPERTY_SAMPLE", "100")),
+            schema_combination_sample=int(os.getenv("NEO4J_SCHEMA_COMBINATION_SAMPLE", "0")),
             enable_schema_tool=os.getenv("NEO4J_ENABLE_SCHEMA", "true").lower() == "true",
             enable_read_tool=os.getenv("NEO4J_ENABLE_READ", "true").lower() == "true",
             enable_write_tool=os.getenv("NEO4J_ENABLE_WRITE", "true").lower() == "true",
+            read_fetch_size=int(os.getenv("NEO4J_FETCH_SIZE", "1000")),
+            read_result_limit=int(os.getenv("NEO4J_READ_RESULT_LIMIT", "1000")),
+            compact_json=os.getenv("NEO4J_COMPACT_JSON", "false").lower() == "true",
+            read_output_budget=int(os.getenv("NEO4J_READ_OUTPUT_BUDGET", "40000")),
+            read_output_budget_unit=os.getenv("NEO4J_READ_OUTPUT_UNIT", "bytes").lower(),
+            read_cache_size=int(os.getenv("NEO4J_READ_CACHE_SIZE", "256")),
+            read_cache_ttl=float(os.getenv("NEO4J_READ_CACHE_TTL", "30")),
+            spill_dir=os.getenv("NEO4J_SPILL_DIR", ""),
+            spill_max_file_bytes=int(os.getenv("NEO4J_SPILL_MAX_FILE_BYTES", str(1024 ** 3))),
+            spill_max_total_bytes=int(os.getenv("NEO4J_SPILL_MAX_TOTAL_BYTES", str(5 * 1024 ** 3))),
+            spill_max_files=int(os.getenv("NEO4J_SPILL_MAX_FILES", "20")),
+            spill_chunk_bytes=int(os.getenv("NEO4J_SPILL_CHUNK_BYTES", "65536")),
+            max_open_cursors=int(os.getenv("NEO4J_MAX_CURSORS", "8")),
+            cursor_ttl=float(os.getenv("NEO4J_CURSOR_TTL", "300")),
+            max_page_size=int(os.getenv("NEO4J_MAX_PAGE_SIZE", "1000")),
+            schema_concurrency=int(os.getenv("NEO4J_SCHEMA_CONCURRENCY", "1")),
+            read_concurrency=int(os.getenv("NEO4J_READ_CONCURRENCY", "8")),
+            write_concurrency=int(os.getenv("NEO4J_WRITE_CONCURRENCY", "2")),
+            max_queued_calls=int(os.getenv("NEO4J_MAX_QUEUED_CALLS", "64")),
         )
 
     def detect_wsl_environment(self) -> bool:
@@ -81,12 +206,32 @@ class Neo4jConfig(BaseModel):
 
         return None
 
+    def get_state_path(self, name: str) -> Optional[str]:
+        """Get the path of a file in the local state directory, if one is configured."""
+        if not self.state_dir:
+            return None
+        return os.path.join(os.path.expanduser(self.state_dir), name)
+
+    def get_spill_dir(self) -> str:
+        """Get the directory for spill files: the spill dir, the state dir, or a temp dir."""
+        if self.spill_dir:
+            return os.path.expanduser(self.spill_dir)
+        return self.get_state_path("spill") or os.path.join(tempfile.gettempdir(), "neo4j-mcp-spill")
+
     def get_connection_uris(self) -> List[str]:
         """Get list of URIs to try for connection."""
+        return self._build_connection_uris(host_discovery_cache.get(self))
+
+    async def get_connection_uris_async(self) -> List[str]:
+        """Get list of URIs without blocking the event loop on host discovery."""
+        return self._build_connection_uris(await host_discovery_cache.get_async(self))
+
+    def _build_connection_uris(self, discovery: Dict[str, Any]) -> List[str]:
+        """Build the candidate URI list from a host discovery result."""
         uris = [self.uri]
 
-        if self.detect_wsl_environment():
-            windows_ip = self.get_windows_host_ip()
+        if discovery["is_wsl"]:
+            windows_ip = discovery["windows_ip"]
             if windows_ip:
                 # Replace localhost/127.0.0.1 with Windows host IP
                 original_uri = self.uri
@@ -1,14 +1,104 @@
 """Neo4j connection management with cross-platform support."""
 
 import asyncio
+import json
 import logging
-from typing import Optional, Any, Dict, List
+import os
+import random
+import time
+from contextlib import AsyncExitStack
+from typing import Optional, Any, Callable, Dict, List, Set, Tuple
 
-from neo4j import GraphDatabase, Driver
-from neo4j.exceptions import ServiceUnavailable, AuthError
+from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncManagedTransaction, Record, ResultSummary, READ_ACCESS, WRITE_ACCESS
+from neo4j.exceptions import ServiceUnavailable, AuthError, DriverError, Neo4jError
 from neo4j.graph import Node, Relationship, Path
 
 from .config import Neo4jConfig
+from .cursors import ResultCursorTable
+from .index_advisor import (
+    LEGACY_CONSTRAINTS_QUERY, LEGACY_INDEXES_QUERY, SHOW_CONSTRAINTS_QUERY, SHOW_INDEXES_QUERY,
+    QueryLog, normalize_constraint, normalize_index,
+)
+from .result_cache import ReadResultCache
+from .schema_cache import (
+    LABEL_COMBINATIONS_QUERY, SchemaSnapshotCache, label_count_queries, relationship_count_queries,
+)
+from .schema_properties import (
+    NODE_TYPE_PROPERTIES_QUERY, REL_TYPE_PROPERTIES_QUERY, node_properties_from_procedure, node_sample_queries,
+    properties_from_samples, relationship_properties_from_procedure, relationship_sample_queries,
+)
+from .schema_view import SchemaView
+from .singleflight import SingleFlight
+from .spill import SpillStore, SpillWriter
+from .health import EndpointHealth, HealthMonitor
+
+# File in the state dir that remembers the last winning URI per configured URI
+URI_CACHE_FILE = "connection_cache.json"
+
+# Standard Neo4j schema queries - no APOC required
+LABELS_QUERY = """
+    CALL db.labels() YIELD label
+    RETURN label, [] as properties
+    ORDER BY label
+"""
+
+RELATIONSHIP_TYPES_QUERY = """
+    CALL db.relationshipTypes() YIELD relationshipType
+    RETURN relationshipType, [] as properties
+    ORDER BY relationshipType
+"""
+
+SCHEMA_VISUALIZATION_QUERY = "CALL db.schema.visualization()"
+
+
+class PoolMetrics:
+    """Connection acquisition counters for the active driver's pool."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_acquisition(self, waited: float) -> None:
+        self.acquisitions += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def record_failure(self, waited: float) -> None:
+        self.failures += 1
+        self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "acquisitions": self.acquisitions,
+            "acquisition_failures": self.failures,
+            "avg_acquisition_ms": (self.total_wait / self.acquisitions * 1000) if self.acquisitions else 0.0,
+            "max_acquisition_ms": self.max_wait * 1000,
+        }
+
+
+class RetryStats:
+    """Counters for retried write transactions, keyed by error class."""
+
+    def __init__(self):
+        self.retries = 0
+        self.gave_up = 0
+        self.errors: Dict[str, int] = {}
+
+    def record_error(self, error_class: str) -> None:
+        self.errors[error_class] = self.errors.get(error_class, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "errors": dict(self.errors),
+        }
+
+
+def _keep_record(record: Record) -> Record:
+    return record
 
 
 class Neo4jConnectionManager:
@@ -16,64 +106,345 @@ class Neo4jConnectionManager:
 
     def __init__(self, config: Neo4jConfig):
         self.config = config
-        self.driver: Optional[Driver] = None
+        self.driver: Optional[AsyncDriver] = None
+        self.active_uri: Optional[str] = None
+        self.pool_metrics = PoolMetrics()
+        self.retry_stats = RetryStats()
+        self.cursors = ResultCursorTable(config.max_open_cursors, config.cursor_ttl)
+        self.read_cache = ReadResultCache(config.read_cache_size, config.read_cache_ttl)
+        self.read_flights = SingleFlight()
+        self.schema_cache = SchemaSnapshotCache(self)
+        # Recent tool queries, for the index advisor in the schema tool
+        self.query_log = QueryLog(config.query_log_size)
+        # Last index listing as (monotonic time, schema generation, rows), reused by the advisor
+        self._index_listing: Optional[Tuple[float, int, List[Dict[str, Any]]]] = None
+        self.spills = SpillStore(
+            config.get_spill_dir(), config.spill_max_file_bytes,
+            config.spill_max_total_bytes, config.spill_max_files
+        )
         self.logger = logging.getLogger(__name__)
+        self._connect_lock = asyncio.Lock()
+        self.endpoint_health: Dict[str, EndpointHealth] = {}
+        self.health_monitor = HealthMonitor(self)
+        self.failovers = 0
+        self._retired_drivers: Set[asyncio.Task] = set()
 
-    async def connect(self) -> Driver:
+    async def connect(self) -> AsyncDriver:
         """Establish connection to Neo4j with URI fallback."""
         if self.driver:
             return self.driver
 
-        uris = self.config.get_connection_uris()
+        # Serialize concurrent first calls so only one driver gets created
+        async with self._connect_lock:
+            if self.driver:
+                return self.driver
+            return await self._connect_uris()
+
+    async def _connect_uris(self) -> AsyncDriver:
+        """Probe all candidate URIs concurrently and keep the first working driver."""
+        uris = self._order_uris(await self.config.get_connection_uris_async())
+        uri, driver = await self._race_uris(uris)
+        self._activate(uri, driver)
+        return driver
+
+    async def failover(self) -> bool:
+        """Switch to the next healthy URI without interrupting in-flight calls.
+
+        The failed endpoint is probed last. The previous driver is retired
+        rather than closed, so sessions already running on it can finish.
+        With no other URI to switch to, the current driver and its warm pool
+        are kept.
+        """
+        async with self._connect_lock:
+            failed_uri, old_driver = self.active_uri, self.driver
+            uris = await self.config.get_connection_uris_async()
+            candidates = [uri for uri in uris if uri != failed_uri]
+            if not candidates and old_driver is not None:
+                self.logger.warning(f"No other Neo4j URI to fail over to from {failed_uri}")
+                return False
+            if failed_uri in uris:
+                candidates.append(failed_uri)
+
+            try:
+                uri, driver = await self._race_uris(candidates)
+            except ServiceUnavailable as e:
+                self.logger.error(f"Failover found no healthy Neo4j endpoint: {str(e)}")
+                return False
+
+            self._activate(uri, driver)
+            self.failovers += 1
+            self.logger.warning(f"Failed over from {failed_uri} to {uri}")
+            if old_driver is not None:
+                self._retire_driver(old_driver)
+            return True
+
+    async def _race_uris(self, uris: List[str]) -> Tuple[str, AsyncDriver]:
+        """Probe URIs concurrently and return the first one that answers."""
+        if not uris:
+            raise ServiceUnavailable("No URIs available for connection")
+
         self.logger.info(f"Attempting connection to Neo4j with {len(uris)} URI(s)")
 
+        # Happy-eyeballs style: each URI starts a little after the previous one,
+        # the preferred URI gets a head start, and the first healthy one wins.
+        stagger = self.config.connection_probe_stagger
+        tasks = [
+            asyncio.create_task(self._probe_uri(uri, i * stagger))
+            for i, uri in enumerate(uris)
+        ]
+
+        winner = None
         last_exception = None
-        for i, uri in enumerate(uris):
-            try:
-                self.logger.info(f"Attempting connection {i+1}/{len(uris)}: {uri}")
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    winner = await next_done
+                    break
+                except Exception as e:
+                    last_exception = e
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Close any loser that also managed to connect
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, tuple) and (winner is None or result[1] is not winner[1]):
+                    await self._close_driver_quietly(result[1])
+
+        if winner is None:
+            raise ServiceUnavailable(f"Failed to connect to Neo4j after trying {len(uris)} URI(s). Last error: {str(last_exception)}")
+
+        return winner
+
+    def _activate(self, uri: str, driver: AsyncDriver) -> None:
+        """Make a verified driver the one used for new sessions."""
+        self._instrument_pool(driver)
+        self.driver = driver
+        self.active_uri = uri
+        self.logger.info(f"Successfully connected to Neo4j at: {uri}")
+        self._save_cached_uri(uri)
 
-                driver = GraphDatabase.driver(
-                    uri,
-                    auth=(self.config.user, self.config.password),
-                    connection_timeout=self.config.connection_timeout
-                )
+    def _retire_driver(self, driver: AsyncDriver) -> None:
+        """Close a replaced driver once its in-flight sessions are done."""
+        task = asyncio.create_task(self._drain_and_close(driver))
+        self._retired_drivers.add(task)
+        task.add_done_callback(self._retired_drivers.discard)
 
-                # Test the connection
-                self._test_connection(driver)
+    async def _drain_and_close(self, driver: AsyncDriver) -> None:
+        """Wait until a retired driver has no connections in use, then close it."""
+        deadline = time.monotonic() + self.config.failover_drain_timeout
+        try:
+            while time.monotonic() < deadline and self._count_in_use(driver) != 0:
+                await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+        finally:
+            await self._close_driver_quietly(driver)
+
+    def _count_in_use(self, driver: AsyncDriver) -> Optional[int]:
+        """Count pooled connections a driver has checked out, if its pool is visible."""
+        connections = getattr(getattr(driver, "_pool", None), "connections", None)
+        if not isinstance(connections, dict):
+            return None
+        return sum(
+            1
+            for address_connections in list(connections.values())
+            for connection in list(address_connections)
+            if connection.in_use
+        )
+
+    def pool_saturated(self, driver: AsyncDriver) -> bool:
+        """Whether every pooled connection of a driver is checked out."""
+        in_use = self._count_in_use(driver)
+        return in_use is not None and in_use >= self.config.max_connection_pool_size
+
+    def get_endpoint_health(self, uri: str) -> EndpointHealth:
+        """Get the latency and failure history tracked for a URI."""
+        if uri not in self.endpoint_health:
+            self.endpoint_health[uri] = EndpointHealth(uri)
+        return self.endpoint_health[uri]
+
+    def start_health_monitor(self) -> None:
+        """Start periodic health checks of the active endpoint."""
+        self.health_monitor.start()
+
+    def start_schema_refresh(self) -> None:
+        """Start refreshing the cached schema snapshot in the background."""
+        self.schema_cache.start()
+
+    async def _probe_uri(self, uri: str, delay: float) -> Tuple[str, AsyncDriver]:
+        """Open and verify a driver for a single URI."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self.logger.info(f"Probing Neo4j URI: {uri}")
+        driver = None
+        try:
+            driver = AsyncGraphDatabase.driver(
+                uri,
+                auth=(self.config.user, self.config.password),
+                **self._driver_options()
+            )
 
-                self.driver = driver
-                self.logger.info(f"Successfully connected to Neo4j at: {uri}")
-                return driver
+            # Test the connection
+            started = time.monotonic()
+            await self._test_connection(driver)
+            self.get_endpoint_health(uri).record_success(time.monotonic() - started)
+            return uri, driver
 
-            except Exception as e:
-                last_exception = e
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
                 self.logger.warning(f"Connection failed for {uri}: {str(e)}")
-                if 'driver' in locals():
-                    try:
-                        driver.close()
-                    except:
-                        pass
+                self.get_endpoint_health(uri).record_failure(str(e))
+            if driver is not None:
+                await self._close_driver_quietly(driver)
+            raise
 
-        if last_exception:
-            raise ServiceUnavailable(f"Failed to connect to Neo4j after trying {len(uris)} URI(s). Last error: {str(last_exception)}")
-        else:
-            raise ServiceUnavailable("No URIs available for connection")
+    def _driver_options(self) -> Dict[str, Any]:
+        """Driver keyword arguments for connection and pool tuning."""
+        return {
+            "connection_timeout": self.config.connection_timeout,
+            "max_connection_pool_size": self.config.max_connection_pool_size,
+            "connection_acquisition_timeout": self.config.connection_acquisition_timeout,
+            "max_connection_lifetime": self.config.max_connection_lifetime,
+            "liveness_check_timeout": self.config.liveness_check_timeout,
+        }
+
+    def _instrument_pool(self, driver: AsyncDriver) -> None:
+        """Time every connection acquisition made by the driver's pool.
+
+        The driver has no public pool metrics, so this wraps the pool's
+        ``acquire`` coroutine. Drivers without a recognizable pool are left as is.
+        """
+        pool = getattr(driver, "_pool", None)
+        acquire = getattr(pool, "acquire", None)
+        if acquire is None:
+            return
+
+        metrics = self.pool_metrics
+
+        async def timed_acquire(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                connection = await acquire(*args, **kwargs)
+            except Exception:
+                metrics.record_failure(time.monotonic() - started)
+                raise
+            metrics.record_acquisition(time.monotonic() - started)
+            return connection
 
-    def _test_connection(self, driver: Driver) -> None:
+        pool.acquire = timed_acquire
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage and acquisition statistics."""
+        stats: Dict[str, Any] = {
+            "connected": self.driver is not None,
+            "uri": self.active_uri,
+            "max_connection_pool_size": self.config.max_connection_pool_size,
+            "connection_acquisition_timeout": self.config.connection_acquisition_timeout,
+            "max_connection_lifetime": self.config.max_connection_lifetime,
+            "liveness_check_timeout": self.config.liveness_check_timeout,
+            "in_use": 0,
+            "idle": 0,
+            "addresses": {},
+        }
+        stats.update(self.pool_metrics.as_dict())
+        stats["routing"] = self._get_routing_table()
+
+        connections = getattr(getattr(self.driver, "_pool", None), "connections", None)
+        if isinstance(connections, dict):
+            for address, address_connections in list(connections.items()):
+                in_use = sum(1 for connection in list(address_connections) if connection.in_use)
+                idle = len(address_connections) - in_use
+                stats["addresses"][str(address)] = {"in_use": in_use, "idle": idle}
+                stats["in_use"] += in_use
+                stats["idle"] += idle
+
+        return stats
+
+    def _get_routing_table(self) -> Optional[Dict[str, List[str]]]:
+        """Get the routers, readers and writers the driver currently routes to.
+
+        Only routing (``neo4j://``) drivers keep a routing table; direct
+        ``bolt://`` connections return None.
+        """
+        routing_tables = getattr(getattr(self.driver, "_pool", None), "routing_tables", None)
+        if not isinstance(routing_tables, dict):
+            return None
+
+        table = routing_tables.get(self.config.database)
+        if table is None:
+            return None
+
+        return {
+            role: sorted(str(address) for address in getattr(table, role, ()))
+            for role in ("routers", "readers", "writers")
+        }
+
+    async def _close_driver_quietly(self, driver: AsyncDriver) -> None:
+        """Close a driver, ignoring errors from already broken connections."""
+        try:
+            await driver.close()
+        except Exception:
+            pass
+
+    def _order_uris(self, uris: List[str]) -> List[str]:
+        """Move the last successful URI to the front of the candidate list."""
+        cached_uri = self._load_cached_uri()
+        if cached_uri in uris:
+            return [cached_uri] + [uri for uri in uris if uri != cached_uri]
+        return uris
+
+    def _load_cached_uri(self) -> Optional[str]:
+        """Read the last winning URI for the configured URI from the state dir."""
+        path = self.config.get_state_path(URI_CACHE_FILE)
+        if not path:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get(self.config.uri)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _save_cached_uri(self, uri: str) -> None:
+        """Remember the winning URI so the next startup tries it first."""
+        path = self.config.get_state_path(URI_CACHE_FILE)
+        if not path:
+            return
+        try:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+                if not isinstance(cache, dict):
+                    cache = {}
+            except (OSError, ValueError):
+                cache = {}
+            if cache.get(self.config.uri) == uri:
+                return
+            cache[self.config.uri] = uri
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            self.logger.debug(f"Could not save connection cache {path}: {str(e)}")
+
+    async def _test_connection(self, driver: AsyncDriver) -> None:
         """Test if the connection is working."""
         # Create a test session to verify connectivity
-        with driver.session(database=self.config.database) as session:
-            result = session.run("RETURN 1 as test")
-            record = result.single()
+        async with driver.session(database=self.config.database) as session:
+            result = await session.run("RETURN 1 as test")
+            record = await result.single()
             if not record or record["test"] != 1:
                 raise ServiceUnavailable("Connection test failed")
 
-    def get_session(self):
-        """Get a session context manager with automatic connection management."""
+    def get_session(self, access_mode: str = WRITE_ACCESS, **session_options: Any):
+        """Get a session context manager with automatic connection management.
+
+        Sessions opened with ``READ_ACCESS`` are routed to followers and read
+        replicas when connected to a cluster through a ``neo4j://`` URI.
+        """
         if not self.driver:
             raise ServiceUnavailable("Not connected to Neo4j. Call connect() first.")
 
-        return self.driver.session(database=self.config.database)
+        return self.driver.session(database=self.config.database, default_access_mode=access_mode, **session_options)
 
     def _convert_neo4j_value(self, value: Any) -> Any:
         """Convert Neo4j-specific types to JSON-serializable types."""
@@ -103,89 +474,531 @@ class Neo4jConnectionManager:
         else:
             return value
 
-    async def execute_read_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Execute a read-only query and return results."""
+    async def execute_read_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        convert: Optional[Callable[[Record], Any]] = None,
+        cache: bool = True
+    ) -> List[Any]:
+        """Execute a read-only query and return results.
+
+        With ``limit`` set, at most that many records are pulled from the
+        server; the rest of the result is discarded without being streamed.
+        ``convert`` replaces the default record-to-dict conversion.
+
+        Unless ``cache`` is False, results are served from the read cache when
+        an identical query with the same parameters was read recently and no
+        write has touched it.
+        Identical reads that are already in flight share one execution; each
+        caller converts the shared records itself, since callers may ask for
+        different output formats. Reads only share an execution started at
+        the same cache generation, so a read issued after a write never joins
+        one that began before it.
+        """
+        key = self.read_cache.make_key(self.config.database, query, parameters, limit)
+        cache = cache and self.read_cache.enabled
+        records = self.read_cache.get(key) if cache else None
+        if records is None:
+            generation = self.read_cache.generation
+            records = await self.read_flights.run(
+                key + (generation,),
+                lambda: self._read_and_cache(key, query, parameters, limit, cache, generation)
+            )
+
+        convert = convert or self._convert_record
+        return [convert(record) for record in records]
+
+    async def _read_and_cache(
+        self,
+        key: Tuple[Any, ...],
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        limit: Optional[int],
+        cache: bool,
+        generation: int
+    ) -> List[Record]:
+        """Read raw records and store them in the read cache if no write came in between."""
+        records = await self._run_read(query, parameters, limit, _keep_record)
+        if cache:
+            self.read_cache.put(key, query, records, generation)
+        return records
+
+    async def _run_read(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        limit: Optional[int],
+        convert: Optional[Callable[[Record], Any]]
+    ) -> List[Any]:
+        """Run a read query in a managed read transaction."""
         if not self.driver:
             await self.connect()
 
-        with self.get_session() as session:
-            result = session.run(query, parameters or {})
-            records = []
-            for record in result:
-                # Convert Neo4j types to JSON-serializable types
-                record_dict = {}
-                for key, value in record.items():
-                    record_dict[key] = self._convert_neo4j_value(value)
-                records.append(record_dict)
+        fetch_size = self.config.read_fetch_size
+        if limit is not None:
+            fetch_size = max(1, min(fetch_size, limit))
+
+        # Managed read transactions go to a reader from the routing table
+        async with self.get_session(READ_ACCESS, fetch_size=fetch_size) as session:
+            return await session.execute_read(self._read_records, query, parameters or {}, limit, convert)
+
+    async def _read_records(
+        self,
+        tx: AsyncManagedTransaction,
+        query: str,
+        parameters: Dict[str, Any],
+        limit: Optional[int] = None,
+        convert: Optional[Callable[[Record], Any]] = None
+    ) -> List[Any]:
+        """Transaction function that runs a read query and converts its records."""
+        convert = convert or self._convert_record
+        result = await tx.run(query, parameters)
+        records = []
+        if limit is not None and limit <= 0:
             return records
+        async for record in result:
+            records.append(convert(record))
+            if limit is not None and len(records) >= limit:
+                break
+        return records
+
+    async def spill_read_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        output_format: str,
+        preview_rows: int
+    ) -> Tuple[SpillWriter, str]:
+        """Stream a whole read result into a spill file and return the writer and its resource URI.
+
+        Records are buffered and flushed to disk from a worker thread as they
+        arrive, so memory use does not grow with the result size. A retried
+        transaction starts the file over.
+        """
+        if not self.driver:
+            await self.connect()
+
+        writer = self.spills.create(output_format, self._convert_record, preview_rows)
+        try:
+            async with self.get_session(READ_ACCESS, fetch_size=self.config.read_fetch_size) as session:
+                await session.execute_read(self._spill_records, query, parameters or {}, writer)
+            await writer.flush()
+        except BaseException:
+            self.spills.discard(writer)
+            raise
+        return writer, self.spills.register(writer)
+
+    async def _spill_records(
+        self,
+        tx: AsyncManagedTransaction,
+        query: str,
+        parameters: Dict[str, Any],
+        writer: SpillWriter
+    ) -> None:
+        """Transaction function that writes every record to a spill file."""
+        writer.reset()
+        result = await tx.run(query, parameters)
+        async for record in result:
+            if not writer.write(record):
+                break
+            if writer.needs_flush:
+                await writer.flush()
+
+    def _convert_record(self, record: Any) -> Dict[str, Any]:
+        """Convert a record's Neo4j types to JSON-serializable types."""
+        record_dict = {}
+        for key, value in record.items():
+            record_dict[key] = self._convert_neo4j_value(value)
+        return record_dict
+
+    async def open_read_cursor(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        page_size: int,
+        convert: Optional[Callable[[Record], Any]] = None
+    ) -> Tuple[List[Any], Optional[str], int]:
+        """Run a read query and return its first page plus a continuation token.
+
+        The read transaction stays open until the result is exhausted, the
+        cursor expires or it is evicted to make room for a newer one.
+        """
+        if not self.driver:
+            await self.connect()
+
+        session = self.get_session(READ_ACCESS, fetch_size=page_size)
+        return await self.cursors.open(session, query, parameters or {}, page_size, convert or self._convert_record)
+
+    async def fetch_read_cursor(
+        self,
+        token: str,
+        page_size: int,
+        convert: Optional[Callable[[Record], Any]] = None
+    ) -> Tuple[List[Any], Optional[str], int]:
+        """Return the next page of an open read cursor."""
+        return await self.cursors.fetch(token, page_size, convert or self._convert_record)
 
     async def execute_write_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute a write query and return summary information."""
         if not self.driver:
             await self.connect()
 
-        with self.get_session() as session:
-            result = session.run(query, parameters or {})
-            summary = result.consume()
+        summary = await self._run_write_with_retry(query, parameters or {})
 
-            return {
-                "query": query,
-                "parameters": parameters or {},
-                "counters": {
-                    "nodes_created": summary.counters.nodes_created,
-                    "nodes_deleted": summary.counters.nodes_deleted,
-                    "relationships_created": summary.counters.relationships_created,
-                    "relationships_deleted": summary.counters.relationships_deleted,
-                    "properties_set": summary.counters.properties_set,
-                    "labels_added": summary.counters.labels_added,
-                    "labels_removed": summary.counters.labels_removed,
-                    "indexes_added": summary.counters.indexes_added,
-                    "indexes_removed": summary.counters.indexes_removed,
-                    "constraints_added": summary.counters.constraints_added,
-                    "constraints_removed": summary.counters.constraints_removed,
-                },
-                "result_available_after": summary.result_available_after,
-                "result_consumed_after": summary.result_consumed_after
-            }
+        counters = {
+            "nodes_created": summary.counters.nodes_created,
+            "nodes_deleted": summary.counters.nodes_deleted,
+            "relationships_created": summary.counters.relationships_created,
+            "relationships_deleted": summary.counters.relationships_deleted,
+            "properties_set": summary.counters.properties_set,
+            "labels_added": summary.counters.labels_added,
+            "labels_removed": summary.counters.labels_removed,
+            "indexes_added": summary.counters.indexes_added,
+            "indexes_removed": summary.counters.indexes_removed,
+            "constraints_added": summary.counters.constraints_added,
+            "constraints_removed": summary.counters.constraints_removed,
+        }
+        self.read_cache.invalidate_write(query, counters)
+        self.schema_cache.invalidate_write(query, counters)
+
+        return {
+            "query": query,
+            "parameters": parameters or {},
+            "counters": counters,
+            "result_available_after": summary.result_available_after,
+            "result_consumed_after": summary.result_consumed_after
+        }
+
+    async def _run_write_with_retry(self, query: str, parameters: Dict[str, Any]) -> ResultSummary:
+        """Run a write in an explicit transaction, retrying transient failures.
+
+        Each attempt is one ``begin_transaction`` run, consume and commit, so
+        the driver never retries on its own: every retry goes through the
+        configured budget, the jittered backoff and the per-error-class counters.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                async with self.get_session(WRITE_ACCESS) as session:
+                    async with await session.begin_transaction() as tx:
+                        result = await tx.run(query, parameters)
+                        summary = await result.consume()
+                        await tx.commit()
+                        return summary
+            except (Neo4jError, DriverError) as e:
+                if not e.is_retryable():
+                    raise
+
+                self.retry_stats.record_error(type(e).__name__)
+                attempt += 1
+                elapsed = time.monotonic() - started
+                if attempt > self.config.write_retry_attempts or elapsed >= self.config.write_retry_max_time:
+                    self.retry_stats.gave_up += 1
+                    raise
+
+                # Exponential backoff with full jitter
+                ceiling = min(self.config.write_retry_max_delay, self.config.write_retry_initial_delay * 2 ** (attempt - 1))
+                delay = random.uniform(0, ceiling)
+                self.retry_stats.retries += 1
+                self.logger.warning(f"Write failed with {type(e).__name__}, retry {attempt}/{self.config.write_retry_attempts} in {delay:.2f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+    async def warm_up(self, connections: int, prefetch_schema: bool) -> None:
+        """Connect eagerly, fill the pool with idle connections and prefetch the schema."""
+        await self.connect()
+
+        # Hold one open transaction per connection so the pool has to create
+        # ``connections`` distinct connections instead of reusing the first one.
+        async with AsyncExitStack() as stack:
+            for _ in range(max(0, connections)):
+                session = await stack.enter_async_context(self.get_session(READ_ACCESS))
+                tx = await stack.enter_async_context(await session.begin_transaction())
+                result = await tx.run("RETURN 1 as test")
+                await result.consume()
+        self.logger.info(f"Warmed up {connections} pooled Neo4j connection(s)")
+
+        if prefetch_schema:
+            snapshot = await self.schema_cache.refresh()
+            self.logger.info(f"Prefetched Neo4j schema (version {snapshot['version']})")
 
     async def get_schema_info(self) -> Dict[str, Any]:
         """Get comprehensive schema information using standard Neo4j procedures only."""
-        # Standard Neo4j queries - no APOC required
-        schema_queries = {
-            "nodes": """
-                CALL db.labels() YIELD label
-                RETURN label, [] as properties
-                ORDER BY label
-            """,
-            "relationships": """
-                CALL db.relationshipTypes() YIELD relationshipType
-                RETURN relationshipType, [] as properties
-                ORDER BY relationshipType
-            """,
-            "schema": """
-                CALL db.schema.visualization()
-            """,
-            "counts": """
-                MATCH (n)
-                RETURN labels(n) as labels, count(*) as count
-                ORDER BY count DESC
-            """
+        return (await self.get_schema_snapshot())["schema"]
+
+    async def get_schema_snapshot(self) -> Dict[str, Any]:
+        """Get the cached schema snapshot with its version stamp, fetching it if there is none."""
+        snapshot = self.schema_cache.get()
+        if snapshot is not None:
+            return snapshot
+
+        # Concurrent schema calls share one round of introspection queries
+        return await self.read_flights.run(("schema", self.config.database), self.schema_cache.refresh)
+
+    async def get_schema_view(self, view: SchemaView) -> Dict[str, Any]:
+        """Get a filtered page of the schema.
+
+        A cached snapshot is filtered in memory; without one, the filters run
+        in the introspection queries. Such partial results are not cached.
+        """
+        snapshot = self.schema_cache.get()
+        if snapshot is not None:
+            return {"source": f"snapshot version {snapshot['version']}", "schema": view.apply(snapshot["schema"])}
+        return {"source": "filtered query", "schema": await self._fetch_schema_info(view)}
+
+    async def list_indexes(self, max_age: float = 0.0) -> List[Dict[str, Any]]:
+        """List the indexes with their usage statistics, bypassing the schema snapshot.
+
+        Read counts are left out of the snapshot hash, so a snapshot never
+        refreshes just because they changed; the index advisor reads them here.
+        The last listing, including one made by a schema fetch, is reused
+        while it is at most ``max_age`` seconds old and no write has changed
+        the schema since.
+        """
+        generation = self.schema_cache.generation
+        if self._index_listing is not None and max_age > 0:
+            listed_at, listed_generation, rows = self._index_listing
+            if listed_generation == generation and time.monotonic() - listed_at <= max_age:
+                return rows
+
+        rows = await self._read_listing(SHOW_INDEXES_QUERY, LEGACY_INDEXES_QUERY, normalize_index)
+        self._index_listing = (time.monotonic(), generation, rows)
+        return rows
+
+    async def _list_constraints(self) -> List[Dict[str, Any]]:
+        return await self._read_listing(SHOW_CONSTRAINTS_QUERY, LEGACY_CONSTRAINTS_QUERY, normalize_constraint)
+
+    async def _fetch_schema_info(self, view: Optional[SchemaView] = None) -> Dict[str, Any]:
+        """Run the schema introspection queries.
+
+        Sections run concurrently, each on its own session and with its own
+        timeout. A section that fails or times out is left empty and listed
+        under ``errors``; the other sections are still returned. With a
+        ``view``, labels and types are filtered and paged in the listing
+        queries and only the selected sections are fetched for that page.
+        """
+        errors: Dict[str, str] = {}
+        wants = view.wants if view is not None else (lambda section: True)
+
+        jobs = {
+            "nodes": self._fetch_labels(view, errors),
+            "relationships": self._fetch_relationship_types(view, errors),
         }
+        if wants("indexes"):
+            jobs["indexes"] = self._fetch_listing("indexes", self.list_indexes, view, errors)
+            jobs["constraints"] = self._fetch_listing("constraints", self._list_constraints, view, errors)
+        if wants("visualization"):
+            jobs["schema"] = self._schema_section(
+                "schema", lambda: self.execute_read_query(SCHEMA_VISUALIZATION_QUERY, cache=False), errors, []
+            )
+        sample = self.config.schema_combination_sample
+        if view is None and sample > 0:
+            jobs["label_combinations"] = self._schema_section(
+                "label_combinations", lambda: self._fetch_label_combinations(sample), errors
+            )
+        fetched = dict(zip(jobs, await asyncio.gather(*jobs.values())))
 
-        results = {}
+        results: Dict[str, Any] = {}
+        more: Dict[str, bool] = {}
+        property_sources: Dict[str, str] = {}
+        for kind in ("nodes", "relationships"):
+            section = fetched.pop(kind)
+            more[kind] = section.pop("more")
+            source = section.pop("property_source")
+            if source is not None:
+                property_sources[kind] = source
+            if view is not None and not view.lists(kind):
+                section.pop(kind)
+            results.update(section)
+        results.update((key, value) for key, value in fetched.items() if value is not None)
 
-        try:
-            for key, query in schema_queries.items():
-                results[key] = await self.execute_read_query(query)
+        if property_sources:
+            results["property_sources"] = property_sources
+        if view is not None:
+            results["page"] = {"number": view.page, "size": view.page_size, "more": more}
+
+        if errors:
+            results["errors"] = errors
+            self.logger.warning(f"Schema retrieved with {len(errors)} incomplete section(s)")
+        else:
             self.logger.info("Successfully retrieved schema information using standard Neo4j procedures")
-            return results
+        return results
+
+    async def _schema_section(
+        self, key: str, fetch: Callable[[], Any], errors: Dict[str, str], default: Any = None
+    ) -> Any:
+        """Run one schema section with the section timeout; a failure is recorded in ``errors``."""
+        timeout = self.config.schema_query_timeout or None
+        try:
+            return await asyncio.wait_for(fetch(), timeout)
+        except asyncio.TimeoutError:
+            errors[key] = f"timed out after {timeout:g}s"
         except Exception as e:
-            self.logger.error(f"Schema queries failed: {str(e)}")
-            return {"nodes": [], "relationships": [], "schema": [], "counts": []}
+            errors[key] = str(e)
+        self.logger.warning(f"Schema section '{key}' failed: {errors[key]}")
+        return default
+
+    async def _fetch_labels(self, view: Optional[SchemaView], errors: Dict[str, str]) -> Dict[str, Any]:
+        """List labels with their node counts and properties."""
+        rows, more = await self._fetch_names("nodes", LABELS_QUERY, view, errors)
+        section: Dict[str, Any] = {"nodes": rows, "more": more, "property_source": None}
+        if "nodes" in errors:
+            self._skip_sections(errors, "nodes", "counts", "node_properties")
+            section["counts"] = []
+            return section
+
+        labels = [row["label"] for row in rows if row.get("label")]
+        # Per-label counts come from the count store, never a node scan
+        if view is None or view.wants("counts"):
+            section["counts"] = await self._schema_section(
+                "counts", lambda: self._run_batched_queries(label_count_queries(labels)), errors, []
+            )
+        if view is None or view.wants("properties"):
+            # A view only counts its page, which says nothing about the size of the store scan
+            nodes = None
+            if view is None and "counts" not in errors:
+                nodes = sum(row.get("count") or 0 for row in section["counts"])
+            found, section["property_source"] = await self._fetch_properties(
+                "node_properties", nodes,
+                lambda: self._procedure_properties(NODE_TYPE_PROPERTIES_QUERY, node_properties_from_procedure),
+                lambda sample: self._sampled_properties(node_sample_queries(labels, sample), "label"),
+                "label", errors,
+            )
+            for row in rows:
+                row["properties"] = found.get(row.get("label"), [])
+        return section
+
+    async def _fetch_relationship_types(self, view: Optional[SchemaView], errors: Dict[str, str]) -> Dict[str, Any]:
+        """List relationship types with their relationship counts and properties."""
+        rows, more = await self._fetch_names("relationships", RELATIONSHIP_TYPES_QUERY, view, errors)
+        section: Dict[str, Any] = {"relationships": rows, "more": more, "property_source": None}
+        if "relationships" in errors:
+            self._skip_sections(errors, "relationships", "relationship_counts", "relationship_properties")
+            section["relationship_counts"] = []
+            return section
+
+        types = [row["relationshipType"] for row in rows if row.get("relationshipType")]
+        if view is None or view.wants("counts"):
+            section["relationship_counts"] = await self._schema_section(
+                "relationship_counts", lambda: self._run_batched_queries(relationship_count_queries(types)),
+                errors, [],
+            )
+        if view is None or view.wants("properties"):
+            relationships = None
+            if view is None and "relationship_counts" not in errors:
+                relationships = sum(row.get("count") or 0 for row in section["relationship_counts"])
+            found, section["property_source"] = await self._fetch_properties(
+                "relationship_properties", relationships,
+                lambda: self._procedure_properties(REL_TYPE_PROPERTIES_QUERY, relationship_properties_from_procedure),
+                lambda sample: self._sampled_properties(relationship_sample_queries(types, sample), "relationshipType"),
+                "type", errors,
+            )
+            for row in rows:
+                row["properties"] = found.get(row.get("relationshipType"), [])
+        return section
+
+    async def _fetch_names(
+        self, kind: str, query: str, view: Optional[SchemaView], errors: Dict[str, str]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """List all label or type names, or one filtered page of them, and whether more exist."""
+        if view is None:
+            rows = await self._schema_section(kind, lambda: self.execute_read_query(query, cache=False), errors, [])
+            return rows, False
+        page_query, parameters = view.names_query(kind)
+        rows = await self._schema_section(
+            kind, lambda: self.execute_read_query(page_query, parameters, cache=False), errors, []
+        )
+        return view.page_names(rows)
+
+    def _skip_sections(self, errors: Dict[str, str], failed: str, *keys: str) -> None:
+        for key in keys:
+            errors[key] = f"skipped because '{failed}' failed"
+
+    async def _fetch_properties(
+        self,
+        key: str,
+        scan_size: Optional[int],
+        from_procedure: Callable[[], Any],
+        from_samples: Callable[[int], Any],
+        per: str,
+        errors: Dict[str, str]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[str]]:
+        """Get properties per label or type, and where they came from.
+
+        The schema procedures scan the store, so they only run when the
+        number of entities to scan is known and within the scan limit;
+        otherwise, or when they fail, a bounded sample per name is read.
+        """
+        if scan_size is not None and scan_size <= self.config.schema_property_scan_limit:
+            found = await self._schema_section(key, from_procedure, errors)
+            if key not in errors:
+                return found, "db.schema procedure"
+            self.logger.info(f"Sampling {key} instead: {errors.pop(key)}")
+
+        sample = self.config.schema_property_sample
+        if sample <= 0:
+            return {}, None
+        found = await self._schema_section(key, lambda: from_samples(sample), errors)
+        if key in errors:
+            return {}, None
+        return found, f"sampled, up to {sample:,} per {per}"
+
+    async def _procedure_properties(
+        self, query: str, parse: Callable[[List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        return parse(await self.execute_read_query(query, cache=False))
+
+    async def _sampled_properties(
+        self, queries: List[Tuple[str, Dict[str, Any]]], name_field: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        return properties_from_samples(await self._run_batched_queries(queries), name_field)
+
+    async def _fetch_listing(
+        self,
+        key: str,
+        read: Callable[[], Any],
+        view: Optional[SchemaView],
+        errors: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """List indexes or constraints, filtered to the view's labels and types."""
+        rows = await self._schema_section(key, read, errors, [])
+        return view.filter_entities(rows) if view is not None else rows
+
+    async def _read_listing(
+        self, show_query: str, legacy_query: str, normalize: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        # SHOW commands need Neo4j 4.2+; older servers still have the db.indexes()/db.constraints() procedures
+        try:
+            rows = await self.execute_read_query(show_query, cache=False)
+        except Exception as e:
+            self.logger.info(f"Listing with {legacy_query} instead: {str(e)}")
+            rows = await self.execute_read_query(legacy_query, cache=False)
+        return [normalize(row) for row in rows]
+
+    async def _fetch_label_combinations(self, sample: int) -> Dict[str, Any]:
+        rows = await self.execute_read_query(LABEL_COMBINATIONS_QUERY, {"sample": sample}, cache=False)
+        return {"sample": sample, "rows": rows}
+
+    async def _run_batched_queries(self, queries: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run query batches concurrently and return their rows in order."""
+        batches = await asyncio.gather(*[
+            self.execute_read_query(query, parameters, cache=False) for query, parameters in queries
+        ])
+        return [row for batch in batches for row in batch]
 
     async def close(self):
         """Close the database connection."""
+        await self.health_monitor.stop()
+        await self.schema_cache.stop()
+        retired = list(self._retired_drivers)
+        for task in retired:
+            task.cancel()
+        await asyncio.gather(*retired, return_exceptions=True)
+        await self.cursors.close_all()
         if self.driver:
-            self.driver.close()
+            await self.driver.close()
             self.driver = None
+            self.active_uri = None
             self.logger.info("Neo4j connection closed")
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Open result cursors for paginated read queries."""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Shortest wait between sweeps, e.g. while an expired cursor is still serving a page
+_MIN_SWEEP_INTERVAL = 0.1
+
+
+class CursorNotFoundError(LookupError):
+    """Raised when a continuation token is unknown, expired or already exhausted."""
+
+
+class _OpenCursor:
+    """A read transaction kept open between pages of one result."""
+
+    def __init__(self, session: Any, tx: Any, result: Any, query: str):
+        self.session = session
+        self.tx = tx
+        self.result = result
+        self.query = query
+        self.page = 0
+        self.rows_served = 0
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        for closer in (self.tx.close, self.session.close):
+            try:
+                await closer()
+            except Exception:
+                pass
+
+
+class ResultCursorTable:
+    """Bounded, TTL-evicted table of open result cursors keyed by opaque tokens.
+
+    Every open cursor pins one pooled connection, so the table holds at most
+    ``max_cursors`` of them. Idle cursors are closed after ``ttl`` seconds by
+    a background sweep that runs while any cursor is open, and the least
+    recently used cursor is closed when a new one needs room.
+    """
+
+    def __init__(self, max_cursors: int, ttl: float):
+        self.max_cursors = max(1, max_cursors)
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        self._cursors: "OrderedDict[str, _OpenCursor]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.opened = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    async def open(
+        self,
+        session: Any,
+        query: str,
+        parameters: Dict[str, Any],
+        page_size: int,
+        convert: Callable[[Any], Any]
+    ) -> Tuple[List[Any], Optional[str], int]:
+        """Start a query on ``session`` and return its first page.
+
+        Returns the records, a continuation token (None when the result is
+        exhausted) and the page number.
+        """
+        await self._expire()
+
+        tx = None
+        try:
+            tx = await session.begin_transaction()
+            result = await tx.run(query, parameters)
+        except BaseException:
+            if tx is not None:
+                await _OpenCursor(session, tx, None, query).close()
+            else:
+                await session.close()
+            raise
+
+        cursor = _OpenCursor(session, tx, result, query)
+        token = secrets.token_urlsafe(16)
+
+        while len(self._cursors) >= self.max_cursors:
+            _, oldest = self._cursors.popitem(last=False)
+            self.evicted += 1
+            await oldest.close()
+
+        self._cursors[token] = cursor
+        self.opened += 1
+        self._start_sweeper()
+        return await self._next_page(token, cursor, page_size, convert)
+
+    async def fetch(
+        self,
+        token: str,
+        page_size: int,
+        convert: Callable[[Any], Any]
+    ) -> Tuple[List[Any], Optional[str], int]:
+        """Return the next page of an open cursor."""
+        await self._expire()
+
+        cursor = self._cursors.get(token)
+        if cursor is None:
+            raise CursorNotFoundError(
+                "Unknown or expired cursor. Re-run the query with page_size to start a new one."
+            )
+        self._cursors.move_to_end(token)
+        return await self._next_page(token, cursor, page_size, convert)
+
+    def get_query(self, token: str) -> Optional[str]:
+        """Get the query an open cursor belongs to."""
+        cursor = self._cursors.get(token)
+        return cursor.query if cursor else None
+
+    async def _next_page(
+        self,
+        token: str,
+        cursor: _OpenCursor,
+        page_size: int,
+        convert: Callable[[Any], Any]
+    ) -> Tuple[List[Any], Optional[str], int]:
+        async with cursor.lock:
+            try:
+                records = [convert(record) for record in await cursor.result.fetch(page_size)]
+                has_more = await cursor.result.peek() is not None
+            except BaseException:
+                await self.close(token)
+                raise
+
+            cursor.page += 1
+            cursor.rows_served += len(records)
+            cursor.last_used = time.monotonic()
+            page = cursor.page
+
+        if not has_more:
+            await self.close(token)
+            return records, None, page
+        return records, token, page
+
+    async def close(self, token: str) -> None:
+        """Close a cursor and release its connection."""
+        cursor = self._cursors.pop(token, None)
+        if cursor is not None:
+            await cursor.close()
+
+    async def close_all(self) -> None:
+        """Close every open cursor and stop the sweep."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        while self._cursors:
+            _, cursor = self._cursors.popitem(last=False)
+            await cursor.close()
+
+    def _start_sweeper(self) -> None:
+        if self.ttl > 0 and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        """Expire idle cursors until none are left open; a new cursor starts the sweep again."""
+        while self._cursors:
+            # Wake when the least recently used cursor reaches the TTL
+            oldest = min(cursor.last_used for cursor in self._cursors.values())
+            await asyncio.sleep(max(_MIN_SWEEP_INTERVAL, oldest + self.ttl - time.monotonic()))
+            try:
+                await self._expire()
+            except Exception as e:
+                self.logger.warning(f"Cursor sweep failed unexpectedly: {str(e)}")
+
+    async def _expire(self) -> None:
+        """Close cursors that have been idle for longer than the TTL."""
+        now = time.monotonic()
+        for token, cursor in list(self._cursors.items()):
+            if now - cursor.last_used > self.ttl and not cursor.lock.locked():
+                self._cursors.pop(token, None)
+                self.expired += 1
+                await cursor.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return open cursor counts and eviction counters."""
+        return {
+            "open": len(self._cursors),
+            "max_cursors": self.max_cursors,
+            "ttl": self.ttl,
+            "opened": self.opened,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
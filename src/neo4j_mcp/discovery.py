@@ -0,0 +1,128 @@
+"""Cached WSL host discovery for Neo4j MCP Server."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from .config import Neo4jConfig
+
+
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+RESOLV_CONF_PATH = "/etc/resolv.conf"
+
+# File in the state dir holding the last discovery result
+HOST_DISCOVERY_FILE = "host_discovery.json"
+
+logger = logging.getLogger(__name__)
+
+
+def get_discovery_key() -> str:
+    """Build a cache key that changes when the WSL VM reboots or its DNS config is rewritten.
+
+    WSL regenerates /etc/resolv.conf (and gets a new boot ID) whenever the
+    Windows host address can change, so both are cheap change detectors.
+    """
+    try:
+        with open(BOOT_ID_PATH, "r") as f:
+            boot_id = f.read().strip()
+    except OSError:
+        boot_id = ""
+
+    try:
+        resolv_mtime = str(os.stat(RESOLV_CONF_PATH).st_mtime_ns)
+    except OSError:
+        resolv_mtime = ""
+
+    return f"{boot_id}:{resolv_mtime}"
+
+
+class HostDiscoveryCache:
+    """Remembers WSL detection and Windows host IP per discovery key.
+
+    Results are kept in memory for the life of the process and, when the config
+    has a state dir, on disk so a restarted server skips the /proc parsing and
+    the ``ip route`` subprocess entirely.
+    """
+
+    def __init__(self):
+        self._entry: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def peek(self, config: "Neo4jConfig") -> Optional[Dict[str, Any]]:
+        """Return a still-valid cached result without running discovery."""
+        key = get_discovery_key()
+        entry = self._entry
+        if entry and entry["key"] == key:
+            return entry
+
+        entry = self._load(config)
+        if entry and entry.get("key") == key:
+            self._entry = entry
+            return entry
+
+        return None
+
+    def get(self, config: "Neo4jConfig") -> Dict[str, Any]:
+        """Return the cached result, running discovery if it is missing or stale."""
+        entry = self.peek(config)
+        if entry:
+            return entry
+
+        # Only one thread runs the subprocess; the others pick up its result
+        with self._lock:
+            entry = self.peek(config)
+            if entry:
+                return entry
+            return self.refresh(config)
+
+    def refresh(self, config: "Neo4jConfig") -> Dict[str, Any]:
+        """Run discovery now and store the result."""
+        is_wsl = config.detect_wsl_environment()
+        entry = {
+            "key": get_discovery_key(),
+            "is_wsl": is_wsl,
+            "windows_ip": config.get_windows_host_ip() if is_wsl else None,
+        }
+        self._entry = entry
+        self._save(config, entry)
+        return entry
+
+    async def get_async(self, config: "Neo4jConfig") -> Dict[str, Any]:
+        """Return the cached result, running any needed discovery in a worker thread."""
+        entry = self.peek(config)
+        if entry:
+            return entry
+        return await asyncio.to_thread(self.get, config)
+
+    def clear(self) -> None:
+        """Forget the in-memory result."""
+        self._entry = None
+
+    def _load(self, config: "Neo4jConfig") -> Optional[Dict[str, Any]]:
+        path = config.get_state_path(HOST_DISCOVERY_FILE)
+        if not path:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry if isinstance(entry, dict) else None
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, config: "Neo4jConfig", entry: Dict[str, Any]) -> None:
+        path = config.get_state_path(HOST_DISCOVERY_FILE)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.debug(f"Could not save host discovery cache {path}: {str(e)}")
+
+
+host_discovery_cache = HostDiscoveryCache()
@@ -0,0 +1,123 @@
+"""Result encodings for Neo4j query records."""
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from neo4j.graph import Node, Relationship, Path
+
+
+class GraphResultEncoder:
+    """Encodes records as rows that reference shared node and relationship tables.
+
+    Every node and relationship is stored once, keyed by element ID, however
+    many rows or paths it appears in. Rows hold ``{"node_ref": id}``,
+    ``{"relationship_ref": id}`` and ``{"path_ref": {...}}`` markers instead of
+    the full entities. Values are walked with an explicit stack, so deeply
+    nested lists and maps cannot hit the recursion limit.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships: Dict[str, Dict[str, Any]] = {}
+        # Entities referenced by each encoded row, as (kind, element_id) pairs
+        self._row_refs: List[Set[Tuple[str, str]]] = []
+
+    def encode_record(self, record: Any) -> Dict[str, Any]:
+        """Encode one record, adding its entities to the shared tables."""
+        refs: Set[Tuple[str, str]] = set()
+        self._row_refs.append(refs)
+        row = dict.fromkeys(record.keys())
+        for key, value in record.items():
+            self._encode_into(row, key, value, refs)
+        return row
+
+    def _encode_into(self, parent: Any, key: Any, value: Any, refs: Set[Tuple[str, str]]) -> None:
+        stack = [(parent, key, value)]
+        while stack:
+            parent, key, item = stack.pop()
+            if isinstance(item, Node):
+                parent[key] = {"node_ref": self._add_node(item, refs)}
+            elif isinstance(item, Relationship):
+                parent[key] = {"relationship_ref": self._add_relationship(item, refs)}
+            elif isinstance(item, Path):
+                parent[key] = {"path_ref": {
+                    "nodes": [self._add_node(node, refs) for node in item.nodes],
+                    "relationships": [self._add_relationship(rel, refs) for rel in item.relationships],
+                }}
+            elif isinstance(item, (list, tuple)):
+                out = [None] * len(item)
+                parent[key] = out
+                stack.extend((out, i, child) for i, child in enumerate(item))
+            elif isinstance(item, dict):
+                out = dict.fromkeys(item)
+                parent[key] = out
+                stack.extend((out, k, child) for k, child in item.items())
+            else:
+                parent[key] = item
+
+    def _add_node(self, node: Node, refs: Set[Tuple[str, str]]) -> str:
+        element_id = node.element_id
+        refs.add(("node", element_id))
+        if element_id not in self.nodes:
+            self.nodes[element_id] = {
+                "id": element_id,
+                "labels": sorted(node.labels),
+                "properties": dict(node.items()),
+            }
+        return element_id
+
+    def _add_relationship(self, rel: Relationship, refs: Set[Tuple[str, str]]) -> str:
+        element_id = rel.element_id
+        refs.add(("relationship", element_id))
+        if element_id not in self.relationships:
+            self.relationships[element_id] = {
+                "id": element_id,
+                "type": rel.type,
+                "start_node": rel.start_node.element_id if rel.start_node is not None else None,
+                "end_node": rel.end_node.element_id if rel.end_node is not None else None,
+                "properties": dict(rel.items()),
+            }
+        return element_id
+
+    def tables(self, row_count: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the node and relationship tables, optionally only for the first rows."""
+        if row_count is None or row_count >= len(self._row_refs):
+            return {
+                "nodes": list(self.nodes.values()),
+                "relationships": list(self.relationships.values()),
+            }
+
+        used: Set[Tuple[str, str]] = set().union(*self._row_refs[:row_count])
+        return {
+            "nodes": [node for element_id, node in self.nodes.items() if ("node", element_id) in used],
+            "relationships": [rel for element_id, rel in self.relationships.items() if ("relationship", element_id) in used],
+        }
+
+    def encode_result(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine the first encoded rows with the entity tables they reference."""
+        result = self.tables(len(rows))
+        result["rows"] = rows
+        return result
+
+
+class ColumnarResultEncoder:
+    """Encodes records as value arrays with the column names kept once.
+
+    Values are taken straight from ``record.values()``, so no per-record dict
+    is built. The same rows can be rendered as a columnar document or as
+    newline-delimited JSON objects.
+    """
+
+    def __init__(self, convert_value: Callable[[Any], Any]):
+        self.columns: Optional[List[str]] = None
+        self._convert_value = convert_value
+
+    def encode_record(self, record: Any) -> List[Any]:
+        """Encode one record as a list of converted values."""
+        if self.columns is None:
+            self.columns = list(record.keys())
+        convert_value = self._convert_value
+        return [convert_value(value) for value in record.values()]
+
+    def encode_result(self, rows: List[List[Any]]) -> Dict[str, Any]:
+        """Combine encoded rows with the shared column header."""
+        return {"columns": self.columns or [], "rows": rows}
@@ -0,0 +1,134 @@
+"""Background health checks and failover for Neo4j MCP Server."""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from neo4j.exceptions import ConnectionAcquisitionTimeoutError
+
+if TYPE_CHECKING:
+    from .connection import Neo4jConnectionManager
+
+
+class EndpointHealth:
+    """Latency and failure history of a single Neo4j URI."""
+
+    # Weight of the newest sample in the moving latency average
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.checks = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_latency_ms: Optional[float] = None
+        self.avg_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+
+    def record_success(self, latency: float) -> None:
+        latency_ms = latency * 1000
+        self.checks += 1
+        self.consecutive_failures = 0
+        self.last_latency_ms = latency_ms
+        if self.avg_latency_ms is None:
+            self.avg_latency_ms = latency_ms
+        else:
+            self.avg_latency_ms += self.LATENCY_SMOOTHING * (latency_ms - self.avg_latency_ms)
+        self.last_checked = time.time()
+
+    def record_failure(self, error: str) -> None:
+        self.checks += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        self.last_checked = time.time()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "uri": self.uri,
+            "checks": self.checks,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_latency_ms": self.last_latency_ms,
+            "avg_latency_ms": self.avg_latency_ms,
+            "last_error": self.last_error,
+        }
+
+
+class HealthMonitor:
+    """Pings the active endpoint on an interval and fails over when it stops answering.
+
+    A ping that errors or takes longer than ``health_check_timeout`` counts as a
+    failure. After ``health_failure_threshold`` failures in a row the connection
+    manager is asked to switch to the next healthy URI. The ping borrows a
+    connection from the driver's pool, so when the pool is saturated the check
+    is skipped rather than counting the wait for a connection against the
+    endpoint.
+    """
+
+    def __init__(self, connection_manager: "Neo4jConnectionManager"):
+        self.connection_manager = connection_manager
+        self.config = connection_manager.config
+        self.logger = logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background check loop."""
+        if self.config.health_check_interval > 0 and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background check loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.health_check_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                self.logger.warning(f"Health check failed unexpectedly: {str(e)}")
+
+    async def check(self) -> bool:
+        """Ping the active endpoint once; returns False if it is unhealthy."""
+        manager = self.connection_manager
+        driver, uri = manager.driver, manager.active_uri
+        if driver is None or uri is None:
+            return True
+
+        health = manager.get_endpoint_health(uri)
+        if manager.pool_saturated(driver):
+            self.logger.info(f"Health check of {uri} skipped: every pooled connection is in use")
+            return True
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(manager._test_connection(driver), self.config.health_check_timeout)
+        except Exception as e:
+            # Waiting for a free pooled connection says nothing about the endpoint
+            if isinstance(e, ConnectionAcquisitionTimeoutError) or manager.pool_saturated(driver):
+                self.logger.info(f"Health check of {uri} skipped: no pooled connection was free in time")
+                return True
+            health.record_failure(str(e) or type(e).__name__)
+            self.logger.warning(
+                f"Health check {health.consecutive_failures}/{self.config.health_failure_threshold} "
+                f"failed for {uri}: {str(e) or type(e).__name__}"
+            )
+            if health.consecutive_failures >= self.config.health_failure_threshold:
+                await manager.failover()
+            return False
+
+        health.record_success(time.monotonic() - started)
+        return True
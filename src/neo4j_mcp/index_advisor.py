@@ -0,0 +1,185 @@
+"""Index and constraint introspection and an advisor based on recent queries."""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .result_cache import normalize_query
+from .serialization import encode_value
+
+
+# Neo4j 4.2+ and 5.x; YIELD * returns whatever columns the server version has
+SHOW_INDEXES_QUERY = "SHOW INDEXES YIELD *"
+SHOW_CONSTRAINTS_QUERY = "SHOW CONSTRAINTS YIELD *"
+
+# Procedures used by servers without SHOW commands
+LEGACY_INDEXES_QUERY = "CALL db.indexes()"
+LEGACY_CONSTRAINTS_QUERY = "CALL db.constraints()"
+
+INDEX_FIELDS = (
+    "name", "type", "entityType", "labelsOrTypes", "properties", "state",
+    "populationPercent", "readCount", "lastRead", "owningConstraint",
+)
+CONSTRAINT_FIELDS = ("name", "type", "entityType", "labelsOrTypes", "properties", "ownedIndex", "description")
+
+# Usage statistics that change with every read; left out of schema hashes and diffs
+VOLATILE_INDEX_FIELDS = ("populationPercent", "readCount", "lastRead")
+
+# Index types that can answer equality and range predicates on a property
+_PREDICATE_INDEX_TYPES = {"RANGE", "BTREE", "TEXT", "POINT"}
+
+_STRIP_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|//[^\n]*|/\*.*?\*/", re.DOTALL)
+_NAME = r"(?:\w+|`[^`]*`)"
+# "(n:Label:Other {key: ...})" and "[r:TYPE {key: ...}]"; the variable and map are optional
+_NODE_RE = re.compile(rf"\(\s*({_NAME})?\s*:\s*({_NAME}(?:\s*:\s*{_NAME})*)[^(){{}}]*?(\{{[^{{}}]*\}})?\s*\)")
+_REL_RE = re.compile(rf"\[\s*({_NAME})?\s*:\s*({_NAME})[^\[\]{{}}]*?(\{{[^{{}}]*\}})?\s*\]")
+_LABEL_RE = re.compile(_NAME)
+_MAP_KEY_RE = re.compile(rf"({_NAME})\s*:")
+# Clause keywords; "ON MATCH" and "OPTIONAL MATCH" come first so they are not split as MATCH,
+# and WITH is not a clause inside "STARTS WITH"/"ENDS WITH" (whitespace is collapsed first)
+_CLAUSE_RE = re.compile(
+    r"\b(ON\s+CREATE|ON\s+MATCH|OPTIONAL\s+MATCH|MATCH|MERGE|CREATE|WHERE|(?<!STARTS )(?<!ENDS )WITH|RETURN|SET|REMOVE"
+    r"|DETACH\s+DELETE|DELETE|UNWIND|CALL|FOREACH|ORDER\s+BY|SKIP|LIMIT|UNION)\b",
+    re.IGNORECASE,
+)
+# Clauses whose inline property maps look up existing entities
+_LOOKUP_CLAUSES = {"MATCH", "OPTIONAL MATCH", "MERGE"}
+_PROPERTY_PREDICATE_RE = re.compile(
+    rf"({_NAME})\.({_NAME})\s*(?:=|<>|<=|>=|<|>|=~|\bIN\b|\bSTARTS\s+WITH\b|\bENDS\s+WITH\b|\bCONTAINS\b|\bIS\s+NOT\s+NULL\b)",
+    re.IGNORECASE,
+)
+
+
+def normalize_index(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the index fields the schema reports; temporal values become ISO strings."""
+    index = {field: row.get(field) for field in INDEX_FIELDS if field in row}
+    if index.get("lastRead") is not None:
+        index["lastRead"] = encode_value(index["lastRead"])
+    return index
+
+
+def normalize_constraint(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the constraint fields the schema reports."""
+    return {field: row.get(field) for field in CONSTRAINT_FIELDS if field in row}
+
+
+def stable_index(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the usage statistics of an index entry."""
+    return {key: value for key, value in index.items() if key not in VOLATILE_INDEX_FIELDS}
+
+
+class QueryLog:
+    """The most recent distinct queries run through the read and write tools.
+
+    Queries are keyed by their normalized text, so repeated runs only bump a
+    counter; the least recently run query is dropped once ``max_queries`` are
+    kept.
+    """
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+        self._queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def record(self, query: str, write: bool = False) -> None:
+        if self.max_queries <= 0:
+            return
+        text = normalize_query(query)
+        entry = self._queries.pop(text, None) or {"query": text, "runs": 0, "write": write}
+        entry["runs"] += 1
+        entry["last_run"] = time.time()
+        self._queries[text] = entry
+        while len(self._queries) > self.max_queries:
+            self._queries.popitem(last=False)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return the logged queries, most recent first."""
+        return list(reversed(self._queries.values()))
+
+
+def query_predicates(query: str) -> Set[Tuple[str, Tuple[str, ...], str]]:
+    """Find ``(entityType, labels or type, property)`` lookups a query filters on.
+
+    Covers inline property maps in node and relationship patterns and
+    ``var.prop`` comparisons on variables bound to labels or a type. A node
+    pattern with several labels gives all of them, since an index on any
+    one can serve the lookup.
+    """
+    text = _STRIP_RE.sub("''", normalize_query(query))
+    parts = _CLAUSE_RE.split(text)
+    # re.split keeps the keywords: [prefix, keyword, body, keyword, body, ...]
+    clauses = [(" ".join(parts[i].upper().split()), parts[i + 1]) for i in range(1, len(parts) - 1, 2)]
+
+    predicates = set()
+    variables: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+    for keyword, body in clauses:
+        for entity_type, pattern in (("NODE", _NODE_RE), ("RELATIONSHIP", _REL_RE)):
+            for match in pattern.finditer(body):
+                variable, properties = match.group(1), match.group(3)
+                names = tuple(_unquote(name) for name in _LABEL_RE.findall(match.group(2)))
+                if variable:
+                    variables[_unquote(variable)] = (entity_type, names)
+                if keyword in _LOOKUP_CLAUSES:
+                    for key in _MAP_KEY_RE.findall(properties or ""):
+                        predicates.add((entity_type, names, _unquote(key)))
+
+    for keyword, body in clauses:
+        if keyword != "WHERE":
+            continue
+        for variable, key in _PROPERTY_PREDICATE_RE.findall(body):
+            bound = variables.get(_unquote(variable))
+            if bound is not None:
+                predicates.add((bound[0], bound[1], _unquote(key)))
+    return predicates
+
+
+def advise(
+    queries: Iterable[Dict[str, Any]], indexes: Optional[List[Dict[str, Any]]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Flag predicates no index serves and indexes that were never read.
+
+    A predicate counts as served when an index on one of its labels, or on
+    its type, starts with the property. Indexes are only reported as unused
+    when the server tracks read counts; token lookup indexes and indexes
+    backing a constraint are never reported. Read counts are only as fresh
+    as ``indexes``, so pass a current listing.
+    """
+    indexes = indexes or []
+    covered = {
+        (index.get("entityType"), label, index["properties"][0])
+        for index in indexes
+        if (index.get("type") or "").upper() in _PREDICATE_INDEX_TYPES and index.get("properties")
+        for label in index.get("labelsOrTypes") or []
+    }
+
+    missing: "OrderedDict[Tuple[str, Tuple[str, ...], str], Dict[str, Any]]" = OrderedDict()
+    for entry in queries:
+        for predicate in sorted(query_predicates(entry["query"])):
+            entity_type, names, prop = predicate
+            if any((entity_type, name, prop) in covered for name in names):
+                continue
+            found = missing.setdefault(predicate, {
+                "entityType": entity_type, "labelsOrTypes": list(names), "property": prop,
+                "runs": 0, "example": entry["query"],
+            })
+            found["runs"] += entry["runs"]
+
+    unused = [
+        index for index in indexes
+        if index.get("readCount") == 0
+        and (index.get("type") or "").upper() != "LOOKUP"
+        and not index.get("owningConstraint")
+    ]
+    return {
+        "missing": sorted(missing.values(), key=lambda found: -found["runs"]),
+        "unused": unused,
+    }
+
+
+def _unquote(name: str) -> str:
+    if len(name) >= 2 and name.startswith("`") and name.endswith("`"):
+        return name[1:-1].replace("``", "`")
+    return name
@@ -0,0 +1,193 @@
+"""In-process cache of read query results."""
+
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .serialization import encode_value
+
+
+# String literals and quoted identifiers are kept verbatim; comments and whitespace collapse
+_LITERAL = r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`"
+_TOKEN_RE = re.compile(rf"{_LITERAL}|//[^\n]*|/\*.*?\*/|\s+", re.DOTALL)
+_STRIP_RE = re.compile(rf"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+# A node pattern "(var:Label ...)" or a relationship pattern "-[var:TYPE ...]"
+_NODE_RE = re.compile(r"(?<![\w`])\(\s*(?:\w+|`[^`]*`)?\s*(:?)")
+_REL_RE = re.compile(r"-\s*\[\s*(?:\w+|`[^`]*`)?\s*(:?)")
+# Label and type names; map values such as "{id: 1}" or "{id: row.id}" are skipped
+_NAME_RE = re.compile(r":\s*!?\s*([A-Za-z_]\w*|`[^`]*`)(?!\w|\s*[.(])")
+# Label expressions a name set cannot describe: "A|B", "A&B", "!A", "%", "(A|B)" and dynamic "$(...)"
+_LABEL_EXPRESSION_RE = re.compile(r":\s*(?:[!%(]|\$\s*\()|:\s*(?:\w+|`[^`]*`)\s*[|&]")
+_CALL_RE = re.compile(r"\bCALL\b", re.IGNORECASE)
+_MATCHING_CLAUSE_RE = re.compile(r"\b(MATCH|MERGE|CALL)\b", re.IGNORECASE)
+
+# Write counters that mean stored data changed
+DATA_COUNTERS = (
+    "nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted",
+    "properties_set", "labels_added", "labels_removed",
+)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and drop comments outside string literals."""
+    def replace(match: "re.Match[str]") -> str:
+        token = match.group(0)
+        if token[0] in "'\"`":
+            return token
+        return " "
+    return _TOKEN_RE.sub(replace, query).strip()
+
+
+def canonical_params(parameters: Optional[Dict[str, Any]]) -> str:
+    """Serialize parameters with sorted keys so equal parameter maps give equal keys."""
+    return json.dumps(parameters or {}, sort_keys=True, separators=(",", ":"), default=encode_value)
+
+
+def query_scope(query: str) -> Optional[FrozenSet[str]]:
+    """Get the labels and relationship types a read query can depend on.
+
+    Returns None when the query may depend on the whole graph: a node or
+    relationship pattern without a label or type, a label expression such
+    as ``A|B`` or ``!A``, or a procedure call.
+    """
+    text = _STRIP_RE.sub("", query)
+    if _CALL_RE.search(text) or _LABEL_EXPRESSION_RE.search(text):
+        return None
+    for pattern in (_NODE_RE, _REL_RE):
+        if any(not match.group(1) for match in pattern.finditer(text)):
+            return None
+    return frozenset(name.strip("`") for name in _NAME_RE.findall(text))
+
+
+def query_names(query: str) -> Optional[FrozenSet[str]]:
+    """Get every label and relationship type a query names.
+
+    Returns None when the query can use names it does not spell out: a
+    procedure call or a dynamic ``:$(...)`` label.
+    """
+    text = _STRIP_RE.sub("", query)
+    if _CALL_RE.search(text) or re.search(r":\s*\$", text):
+        return None
+    return frozenset(name.strip("`") for name in _NAME_RE.findall(text))
+
+
+def write_scope(query: str) -> Optional[FrozenSet[str]]:
+    """Get the labels and relationship types a write can have changed.
+
+    Only CREATE-only writes can be scoped: a write that matches existing
+    nodes can change nodes that also carry labels the query does not name.
+    Returns None when every cached result has to be dropped.
+    """
+    text = _STRIP_RE.sub("", query)
+    if _MATCHING_CLAUSE_RE.search(text):
+        return None
+    return query_scope(text)
+
+
+class _CacheEntry:
+    def __init__(self, records: List[Any], scope: Optional[FrozenSet[str]], expires_at: float):
+        self.records = records
+        self.scope = scope
+        self.expires_at = expires_at
+
+
+class ReadResultCache:
+    """LRU and TTL bounded cache of raw read records.
+
+    Entries are keyed by database, normalized query text, canonical parameters
+    and record limit. Raw records are cached rather than converted rows, since
+    the conversion depends on the requested output format. Writes that change
+    data drop the entries whose labels overlap the write, or every entry when
+    either side cannot be scoped to labels.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[Any, ...], _CacheEntry]" = OrderedDict()
+        # Bumped by every invalidation so reads that raced a write are not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def make_key(
+        self, database: str, query: str, parameters: Optional[Dict[str, Any]], limit: Optional[int]
+    ) -> Tuple[Any, ...]:
+        return (database, normalize_query(query), canonical_params(parameters), limit)
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[List[Any]]:
+        """Get cached records, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.records
+
+    def put(self, key: Tuple[Any, ...], query: str, records: List[Any], generation: int) -> None:
+        """Store records read while the cache was at ``generation``."""
+        if not self.enabled or generation != self.generation:
+            return
+        self._entries[key] = _CacheEntry(records, query_scope(query), time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_write(self, query: str, counters: Dict[str, int]) -> int:
+        """Drop entries a write may have changed; returns how many were dropped."""
+        if not any(counters.get(name, 0) for name in DATA_COUNTERS):
+            return 0
+
+        self.generation += 1
+        scope = write_scope(query)
+        if scope is None:
+            return self.clear()
+
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.scope is None or entry.scope & scope
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> int:
+        """Drop every entry."""
+        dropped = len(self._entries)
+        self._entries.clear()
+        self.generation += 1
+        self.invalidations += dropped
+        return dropped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return entry counts and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,92 @@
+"""Bounded concurrency scheduling for Neo4j MCP tool calls."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+
+class ToolQueueFullError(RuntimeError):
+    """Raised when a tool class already has a full wait queue."""
+
+
+class _ToolClassState:
+    """Concurrency limit and statistics for a single tool class."""
+
+    def __init__(self, limit: int, max_queued: int):
+        self.limit = max(1, limit)
+        self.max_queued = max(0, max_queued)
+        self.semaphore = asyncio.Semaphore(self.limit)
+        self.active = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class ToolScheduler:
+    """Limits concurrent tool executions per tool class (schema/read/write).
+
+    Each class gets its own semaphore so a burst of reads never waits behind a
+    slow schema or write call. Callers that cannot start immediately wait in a
+    bounded queue; once the queue is full new calls are rejected instead of
+    piling up.
+    """
+
+    def __init__(self, limits: Dict[str, int], max_queued: int):
+        self.logger = logging.getLogger(__name__)
+        self._classes: Dict[str, _ToolClassState] = {
+            name: _ToolClassState(limit, max_queued) for name, limit in limits.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, tool_class: str) -> AsyncIterator[None]:
+        """Wait for a free execution slot for ``tool_class``."""
+        state = self._classes[tool_class]
+
+        if state.semaphore.locked() and state.queued >= state.max_queued:
+            state.rejected += 1
+            raise ToolQueueFullError(
+                f"Too many pending '{tool_class}' calls "
+                f"({state.active} running, {state.queued} queued). Retry shortly."
+            )
+
+        state.queued += 1
+        state.max_queue_depth = max(state.max_queue_depth, state.queued)
+        started = time.monotonic()
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.queued -= 1
+
+        waited = time.monotonic() - started
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        state.active += 1
+        try:
+            yield
+        finally:
+            state.active -= 1
+            state.completed += 1
+            state.semaphore.release()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-class queue depth, wait time and throughput counters."""
+        stats = {}
+        for name, state in self._classes.items():
+            started = state.completed + state.active
+            stats[name] = {
+                "limit": state.limit,
+                "active": state.active,
+                "queued": state.queued,
+                "max_queued": state.max_queued,
+                "max_queue_depth": state.max_queue_depth,
+                "completed": state.completed,
+                "rejected": state.rejected,
+                "avg_wait_ms": (state.total_wait / started * 1000) if started else 0.0,
+                "max_wait_ms": state.max_wait * 1000,
+            }
+        return stats
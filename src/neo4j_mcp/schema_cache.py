@@ -0,0 +1,296 @@
+"""Cached schema snapshot for Neo4j MCP Server."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .result_cache import query_names
+from .schema_diff import schema_hash
+from .serialization import dumps
+
+if TYPE_CHECKING:
+    from .connection import Neo4jConnectionManager
+
+
+# File in the state dir holding the last schema snapshot
+SCHEMA_SNAPSHOT_FILE = "schema_snapshot.json"
+
+# Bumped when the layout of the stored schema changes, so older saved snapshots are ignored
+SCHEMA_FORMAT = 4
+
+# Labels or relationship types counted per query; each is a UNION ALL of count-store lookups
+COUNT_BATCH_SIZE = 100
+
+# Opt-in label combination breakdown over the first $sample nodes
+LABEL_COMBINATIONS_QUERY = """
+    MATCH (n)
+    WITH n LIMIT $sample
+    RETURN labels(n) AS labels, count(*) AS count
+    ORDER BY count DESC
+"""
+
+# Write counters that always change the schema
+SCHEMA_COUNTERS = (
+    "indexes_added", "indexes_removed", "constraints_added", "constraints_removed", "labels_removed",
+)
+
+# Write counters that can introduce a label or relationship type the snapshot does not list
+NEW_NAME_COUNTERS = ("labels_added", "relationships_created")
+
+
+def quote_name(name: str) -> str:
+    """Quote a label or relationship type for use in a Cypher pattern."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def label_count_queries(labels: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build per-label node count queries.
+
+    Each UNION ALL branch counts a single label with no other predicates and
+    no grouping key, so Neo4j plans it as ``NodeCountFromCountStore`` instead
+    of scanning nodes; the name is only projected after the count.
+    """
+    return batch_name_queries(
+        labels, "MATCH (n:{name}) WITH count(n) AS count RETURN ${param} AS label, count"
+    )
+
+
+def relationship_count_queries(types: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build per-type relationship count queries planned as ``RelationshipCountFromCountStore``."""
+    return batch_name_queries(
+        types, "MATCH ()-[r:{name}]->() WITH count(r) AS count RETURN ${param} AS relationshipType, count"
+    )
+
+
+def batch_name_queries(
+    names: List[str], template: str, parameters: Optional[Dict[str, Any]] = None
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build UNION ALL queries with one ``template`` branch per name, ``COUNT_BATCH_SIZE`` names each.
+
+    The template gets the quoted name as ``{name}`` and the parameter holding
+    the plain name as ``{param}``; ``parameters`` are shared by every batch.
+    """
+    queries = []
+    for start in range(0, len(names), COUNT_BATCH_SIZE):
+        branches = []
+        batch_parameters = dict(parameters or {})
+        for index, name in enumerate(names[start:start + COUNT_BATCH_SIZE]):
+            param = f"name{index}"
+            branches.append(template.format(name=quote_name(name), param=param))
+            batch_parameters[param] = name
+        queries.append(("\nUNION ALL\n".join(branches), batch_parameters))
+    return queries
+
+
+class SchemaSnapshotCache:
+    """Keeps the last schema introspection result with a version stamp.
+
+    The snapshot answers schema calls until a write changes the schema, and
+    is refreshed every ``schema_refresh_interval`` seconds in the background.
+    When the config has a state dir it is also saved to disk, so a restarted
+    server can answer its first schema call without querying.
+    """
+
+    def __init__(self, connection_manager: "Neo4jConnectionManager"):
+        self.connection_manager = connection_manager
+        self.config = connection_manager.config
+        self.logger = logging.getLogger(__name__)
+        self.snapshot: Optional[Dict[str, Any]] = None
+        # Recent snapshots by content hash, oldest first, for diffs against earlier versions
+        self.history: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+        # Bumped by every invalidation so a fetch that raced a write is not stored
+        self.generation = 0
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+        self.last_invalidation: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """Get the current snapshot, loading the saved one on first use."""
+        if not self._loaded:
+            self._loaded = True
+            self._load()
+
+        if self.snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self.snapshot
+
+    def store(self, schema: Dict[str, Any], generation: int) -> Dict[str, Any]:
+        """Make ``schema`` the current snapshot unless the schema changed while it was fetched.
+
+        A schema whose content hash matches the latest snapshot keeps that
+        snapshot's version, so refreshes that find no change do not bump it.
+        Only kept snapshots get a version; others have ``None``.
+        """
+        content_hash = schema_hash(schema)
+        # Partial results are returned but not kept, so the next call retries the failed sections
+        keep = generation == self.generation and not schema.get("errors") and any(schema.values())
+        version = None
+        if keep:
+            latest = next(reversed(self.history.values()), None)
+            if latest is not None and latest["hash"] == content_hash:
+                version = latest["version"]
+            else:
+                self.version += 1
+                version = self.version
+        snapshot = {
+            "version": version,
+            "hash": content_hash,
+            "fetched_at": time.time(),
+            "schema": schema,
+        }
+        if keep:
+            self.snapshot = snapshot
+            self._remember(snapshot)
+            self._save(snapshot)
+        return snapshot
+
+    def find(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a recent snapshot by its content hash, or None if it is no longer kept."""
+        return self.history.get(content_hash)
+
+    def _remember(self, snapshot: Dict[str, Any]) -> None:
+        self.history.pop(snapshot["hash"], None)
+        self.history[snapshot["hash"]] = snapshot
+        while len(self.history) > max(1, self.config.schema_history_size):
+            self.history.popitem(last=False)
+
+    def invalidate(self, reason: str) -> None:
+        """Drop the snapshot so the next schema call queries the database."""
+        self.generation += 1
+        if self.snapshot is not None:
+            self.invalidations += 1
+            self.logger.info(f"Schema snapshot invalidated: {reason}")
+        self.snapshot = None
+        self.last_invalidation = reason
+        self._loaded = True
+        self._remove()
+
+    def invalidate_write(self, query: str, counters: Dict[str, int]) -> bool:
+        """Invalidate the snapshot if a write changed the schema; returns True if it did."""
+        changed = [name for name in SCHEMA_COUNTERS if counters.get(name, 0)]
+        if not changed and any(counters.get(name, 0) for name in NEW_NAME_COUNTERS):
+            # Labels and types the write names that the snapshot does not know yet
+            if self._has_unknown_names(query):
+                changed = [name for name in NEW_NAME_COUNTERS if counters.get(name, 0)]
+
+        if changed:
+            self.invalidate(f"write reported {', '.join(changed)}")
+            return True
+        return False
+
+    def _has_unknown_names(self, query: str) -> bool:
+        snapshot = self.snapshot
+        names = query_names(query)
+        if snapshot is None or names is None:
+            return True
+        schema = snapshot["schema"]
+        known = {node.get("label") for node in schema.get("nodes") or []}
+        known.update(rel.get("relationshipType") for rel in schema.get("relationships") or [])
+        return not names <= known
+
+    def start(self) -> None:
+        """Start the background refresh loop."""
+        if self.config.schema_refresh_interval > 0 and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.schema_refresh_interval)
+            # Only refresh over an existing connection; never connect just for this
+            if self.connection_manager.driver is None:
+                continue
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.warning(f"Background schema refresh failed: {str(e)}")
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Fetch the schema now and store it as the new snapshot."""
+        generation = self.generation
+        schema = await self.connection_manager._fetch_schema_info()
+        self.refreshes += 1
+        return self.store(schema, generation)
+
+    def _load(self) -> None:
+        path = self.config.get_state_path(SCHEMA_SNAPSHOT_FILE)
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # Only a snapshot of the same database and layout applies
+        if saved.get("uri") != self.config.uri or saved.get("database") != self.config.database:
+            return
+        if saved.get("format") != SCHEMA_FORMAT:
+            return
+        self.version = max(self.version, saved.get("version", 0))
+        self.snapshot = {key: saved[key] for key in ("version", "hash", "fetched_at", "schema") if key in saved}
+        # Rehash rather than trust the saved hash, which may predate the current hash layout
+        self.snapshot["hash"] = schema_hash(self.snapshot.get("schema") or {})
+        self.snapshot["restored"] = True
+        self._remember(self.snapshot)
+
+    def _save(self, snapshot: Dict[str, Any]) -> None:
+        path = self.config.get_state_path(SCHEMA_SNAPSHOT_FILE)
+        if not path:
+            return
+        saved = dict(snapshot, format=SCHEMA_FORMAT, uri=self.config.uri, database=self.config.database)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(dumps(saved, compact=True))
+        except OSError as e:
+            self.logger.debug(f"Could not save schema snapshot {path}: {str(e)}")
+
+    def _remove(self) -> None:
+        path = self.config.get_state_path(SCHEMA_SNAPSHOT_FILE)
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the snapshot version, age and hit/refresh/invalidation counters."""
+        snapshot = self.snapshot
+        return {
+            "version": snapshot["version"] if snapshot else None,
+            "hash": snapshot["hash"] if snapshot else None,
+            "history": len(self.history),
+            "age": time.time() - snapshot["fetched_at"] if snapshot else None,
+            "restored": bool(snapshot and snapshot.get("restored")),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+            "last_invalidation": self.last_invalidation,
+            "refresh_interval": self.config.schema_refresh_interval,
+        }
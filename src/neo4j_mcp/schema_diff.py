@@ -0,0 +1,96 @@
+"""Content hashes and diffs of schema snapshots."""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from .index_advisor import stable_index
+from .serialization import encode_value
+
+
+# Schema sections that can be diffed, with the field identifying each entry
+DIFF_SECTIONS = {
+    "nodes": "label",
+    "relationships": "relationshipType",
+    "counts": "label",
+    "relationship_counts": "relationshipType",
+    "indexes": "name",
+    "constraints": "name",
+}
+
+# Per section, how to drop fields that change without the schema changing
+_STABLE_ENTRY = {"indexes": stable_index}
+
+# Per section, nested lists diffed per entry rather than reported as a whole changed value
+_NESTED_LISTS = {
+    "nodes": {"properties": "property"},
+    "relationships": {"properties": "property"},
+}
+
+# Sections holding data counts, which ordinary writes change without changing the schema
+COUNT_SECTIONS = ("counts", "relationship_counts", "label_combinations")
+
+# Keys that describe how a snapshot was fetched rather than the schema itself
+_UNHASHED_KEYS = ("errors", "property_sources") + COUNT_SECTIONS
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Hash the schema structure; equal schemas hash equally regardless of key order.
+
+    Counts are left out, so the hash and the version built on it only change
+    when labels, types, properties, indexes or constraints do.
+    """
+    content = {key: value for key, value in schema.items() if key not in _UNHASHED_KEYS}
+    for section, stable in _STABLE_ENTRY.items():
+        if content.get(section):
+            content[section] = [stable(entry) for entry in content[section]]
+    text = json.dumps(content, sort_keys=True, separators=(",", ":"), default=encode_value)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def diff_schemas(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, List[Any]]]:
+    """Get the entries added, removed or changed per section between two schemas.
+
+    Sections without changes are left out, so an empty result means the
+    diffed sections are identical.
+    """
+    changes = {}
+    for section, key_field in DIFF_SECTIONS.items():
+        before, after = old.get(section) or [], new.get(section) or []
+        if section in _STABLE_ENTRY:
+            before = [_STABLE_ENTRY[section](entry) for entry in before]
+            after = [_STABLE_ENTRY[section](entry) for entry in after]
+        section_diff = _diff_entries(before, after, key_field, _NESTED_LISTS.get(section, {}))
+        if section_diff:
+            changes[section] = section_diff
+    return changes
+
+
+def _diff_entries(
+    old: List[Dict[str, Any]], new: List[Dict[str, Any]], key_field: str, nested: Optional[Dict[str, str]] = None
+) -> Optional[Dict[str, List[Any]]]:
+    nested = nested or {}
+    before = {entry.get(key_field): entry for entry in old}
+    after = {entry.get(key_field): entry for entry in new}
+
+    added = [after[key] for key in after if key not in before]
+    removed = [before[key] for key in before if key not in after]
+    changed = []
+    for key in after:
+        if key not in before or before[key] == after[key]:
+            continue
+        change: Dict[str, Any] = {key_field: key}
+        for field in sorted(set(before[key]) | set(after[key])):
+            if field == key_field or before[key].get(field) == after[key].get(field):
+                continue
+            if field in nested:
+                change[field] = _diff_entries(
+                    before[key].get(field) or [], after[key].get(field) or [], nested[field]
+                )
+            else:
+                change[field] = {"before": before[key].get(field), "after": after[key].get(field)}
+        changed.append(change)
+
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
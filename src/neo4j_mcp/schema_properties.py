@@ -0,0 +1,145 @@
+"""Property-level schema for node labels and relationship types."""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from neo4j.spatial import Point
+from neo4j.time import Date, DateTime, Duration, Time
+
+from .schema_cache import batch_name_queries
+
+
+# Built-in procedures; both scan the store, so they are only used below the scan limit
+NODE_TYPE_PROPERTIES_QUERY = """
+    CALL db.schema.nodeTypeProperties()
+    YIELD nodeType, nodeLabels, propertyName, propertyTypes, mandatory
+    RETURN nodeType, nodeLabels, propertyName, propertyTypes, mandatory
+"""
+
+REL_TYPE_PROPERTIES_QUERY = """
+    CALL db.schema.relTypeProperties()
+    YIELD relType, propertyName, propertyTypes, mandatory
+    RETURN relType, propertyName, propertyTypes, mandatory
+"""
+
+# A property's entry: the type names seen and the entity kinds that always carry it
+_Property = Tuple[Set[str], Set[str]]
+
+
+def property_type(value: Any) -> str:
+    """Name a property value's type the way ``db.schema.nodeTypeProperties()`` does."""
+    if isinstance(value, bool):
+        return "Boolean"
+    if isinstance(value, int):
+        return "Long"
+    if isinstance(value, float):
+        return "Double"
+    if isinstance(value, str):
+        return "String"
+    if isinstance(value, DateTime):
+        return "DateTime" if value.tzinfo is not None else "LocalDateTime"
+    if isinstance(value, Time):
+        return "Time" if value.tzinfo is not None else "LocalTime"
+    if isinstance(value, Date):
+        return "Date"
+    if isinstance(value, Duration):
+        return "Duration"
+    if isinstance(value, Point):
+        return "Point"
+    if isinstance(value, (bytes, bytearray)):
+        return "ByteArray"
+    if isinstance(value, list):
+        return property_type(value[0]) + "Array" if value else "List"
+    return type(value).__name__
+
+
+def node_sample_queries(labels: List[str], sample: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build queries reading the properties of at most ``sample`` nodes per label."""
+    return batch_name_queries(
+        labels,
+        "MATCH (n:{name}) WITH n LIMIT $sample RETURN ${param} AS label, properties(n) AS props",
+        {"sample": sample},
+    )
+
+
+def relationship_sample_queries(types: List[str], sample: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build queries reading the properties of at most ``sample`` relationships per type."""
+    return batch_name_queries(
+        types,
+        "MATCH ()-[r:{name}]->() WITH r LIMIT $sample RETURN ${param} AS relationshipType, properties(r) AS props",
+        {"sample": sample},
+    )
+
+
+def node_properties_from_procedure(rows: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group ``db.schema.nodeTypeProperties()`` rows by label.
+
+    The procedure reports one row set per label combination; a property is
+    mandatory for a label only if every combination with that label has it.
+    """
+    return _collect(
+        (label, row["nodeType"], row.get("propertyName"), row.get("propertyTypes"), row.get("mandatory"))
+        for row in rows
+        for label in row.get("nodeLabels") or []
+    )
+
+
+def relationship_properties_from_procedure(rows: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group ``db.schema.relTypeProperties()`` rows by relationship type."""
+    return _collect(
+        (_unquote_rel_type(row["relType"]), row["relType"], row.get("propertyName"),
+         row.get("propertyTypes"), row.get("mandatory"))
+        for row in rows
+    )
+
+
+def properties_from_samples(rows: Iterable[Dict[str, Any]], name_field: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Derive property types from sampled entities; mandatory means present on every sampled one."""
+    sampled: Dict[str, int] = defaultdict(int)
+    # Per label or type and property: the type names seen and how many sampled entities had it
+    seen: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+    for row in rows:
+        name = row[name_field]
+        sampled[name] += 1
+        for key, value in (row.get("props") or {}).items():
+            found = seen[name].setdefault(key, {"types": set(), "count": 0})
+            found["types"].add(property_type(value))
+            found["count"] += 1
+
+    return {
+        name: [
+            {"property": key, "types": sorted(found["types"]), "mandatory": found["count"] == sampled[name]}
+            for key, found in sorted(seen[name].items())
+        ]
+        for name in sampled
+    }
+
+
+def _collect(entries: Iterable[Tuple[str, Any, Optional[str], Optional[List[str]], Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    # Each entry is (name, kind, property, types, mandatory); a kind without a property still counts
+    kinds: Dict[str, Set[Any]] = defaultdict(set)
+    properties: Dict[str, Dict[str, _Property]] = defaultdict(dict)
+    for name, kind, prop, types, mandatory in entries:
+        kinds[name].add(kind)
+        if prop is None:
+            continue
+        seen_types, mandatory_in = properties[name].setdefault(prop, (set(), set()))
+        seen_types.update(types or [])
+        if mandatory:
+            mandatory_in.add(kind)
+
+    return {
+        name: [
+            {"property": prop, "types": sorted(seen_types), "mandatory": mandatory_in == kinds[name]}
+            for prop, (seen_types, mandatory_in) in sorted(properties[name].items())
+        ]
+        for name in kinds
+    }
+
+
+def _unquote_rel_type(rel_type: str) -> str:
+    # The procedure reports types as ":`TYPE`"
+    name = rel_type[1:] if rel_type.startswith(":") else rel_type
+    if len(name) >= 2 and name.startswith("`") and name.endswith("`"):
+        name = name[1:-1].replace("``", "`")
+    return name
@@ -0,0 +1,153 @@
+"""Filtered, paginated views of the schema."""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .schema_diff import DIFF_SECTIONS
+
+
+# Sections a schema view can select
+SCHEMA_SECTIONS = ("nodes", "relationships", "counts", "properties", "indexes", "visualization")
+
+# Sections returned when a view does not name any; the visualization spans the whole graph
+DEFAULT_VIEW_SECTIONS = ("nodes", "relationships", "counts", "properties")
+
+# Labels and relationship types per page
+SCHEMA_PAGE_SIZE = 100
+
+# Per kind: the procedure listing the names and the field it yields
+_NAME_PROCEDURES = {
+    "nodes": ("db.labels()", "label"),
+    "relationships": ("db.relationshipTypes()", "relationshipType"),
+}
+
+
+class SchemaView:
+    """Label and type filters, a section selection and a page of the schema.
+
+    Filters combine a ``STARTS WITH`` prefix and a full-match regular
+    expression (Cypher ``=~``). When no snapshot is cached they are applied
+    in the listing queries themselves, so only one page of names is read
+    and counted; otherwise the snapshot is filtered in memory.
+    """
+
+    def __init__(
+        self,
+        label_prefix: Optional[str] = None,
+        label_regex: Optional[str] = None,
+        type_prefix: Optional[str] = None,
+        type_regex: Optional[str] = None,
+        sections: Optional[Iterable[str]] = None,
+        page: int = 1,
+        page_size: int = SCHEMA_PAGE_SIZE,
+    ):
+        self.filters = {
+            "nodes": (label_prefix or None, label_regex or None),
+            "relationships": (type_prefix or None, type_regex or None),
+        }
+        self.sections: FrozenSet[str] = frozenset(sections or DEFAULT_VIEW_SECTIONS)
+        self.page = page
+        self.page_size = page_size
+
+        unknown = self.sections - set(SCHEMA_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown schema sections: {', '.join(sorted(unknown))}. Use: {', '.join(SCHEMA_SECTIONS)}")
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be at least 1")
+        self._patterns = {}
+        for kind, (_, regex) in self.filters.items():
+            if regex is not None:
+                try:
+                    self._patterns[kind] = re.compile(regex)
+                except re.error as e:
+                    raise ValueError(f"Invalid regular expression {regex!r}: {e}") from e
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.page_size
+
+    def wants(self, section: str) -> bool:
+        return section in self.sections
+
+    def lists(self, kind: str) -> bool:
+        """Whether the labels or types of ``kind`` are listed; properties are shown on those entries."""
+        return self.wants(kind) or self.wants("properties")
+
+    def describe(self) -> List[str]:
+        """Describe the active filters, one per entry."""
+        descriptions = []
+        for kind, (prefix, regex) in self.filters.items():
+            noun = "labels" if kind == "nodes" else "types"
+            if prefix is not None:
+                descriptions.append(f"{noun} starting with `{prefix}`")
+            if regex is not None:
+                descriptions.append(f"{noun} matching `{regex}`")
+        return descriptions
+
+    def names_query(self, kind: str) -> Tuple[str, Dict[str, Any]]:
+        """Build the query listing one page of filtered names, plus one to tell if more exist."""
+        procedure, field = _NAME_PROCEDURES[kind]
+        prefix, regex = self.filters[kind]
+        conditions = []
+        parameters: Dict[str, Any] = {"skip": self.offset, "limit": self.page_size + 1}
+        if prefix is not None:
+            conditions.append(f"{field} STARTS WITH $prefix")
+            parameters["prefix"] = prefix
+        if regex is not None:
+            conditions.append(f"{field} =~ $regex")
+            parameters["regex"] = regex
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (
+            f"CALL {procedure} YIELD {field}{where}\n"
+            f"RETURN {field}, [] as properties\n"
+            f"ORDER BY {field} SKIP $skip LIMIT $limit"
+        )
+        return query, parameters
+
+    def page_names(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Split the rows read by ``names_query`` into the page and whether more exist."""
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    def matches(self, kind: str, name: str) -> bool:
+        prefix, _ = self.filters[kind]
+        if prefix is not None and not name.startswith(prefix):
+            return False
+        pattern = self._patterns.get(kind)
+        return pattern is None or pattern.fullmatch(name) is not None
+
+    def filter_entities(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the indexes or constraints on a matching label or type, and those on none."""
+        kept = []
+        for row in rows:
+            kind = "relationships" if row.get("entityType") == "RELATIONSHIP" else "nodes"
+            names = row.get("labelsOrTypes") or []
+            if not names or any(self.matches(kind, name) for name in names):
+                kept.append(row)
+        return kept
+
+    def apply(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter and page a full schema snapshot in memory."""
+        view: Dict[str, Any] = {"page": {"number": self.page, "size": self.page_size, "more": {}}}
+        for kind, counts_key in (("nodes", "counts"), ("relationships", "relationship_counts")):
+            field = DIFF_SECTIONS[kind]
+            matched = [row for row in schema.get(kind) or [] if self.matches(kind, row.get(field) or "")]
+            rows = matched[self.offset:self.offset + self.page_size]
+            view["page"]["more"][kind] = len(matched) > self.offset + self.page_size
+            names = {row.get(field) for row in rows}
+
+            if self.lists(kind):
+                if not self.wants("properties"):
+                    rows = [dict(row, properties=[]) for row in rows]
+                view[kind] = rows
+            if self.wants("counts"):
+                view[counts_key] = [row for row in schema.get(counts_key) or [] if row.get(field) in names]
+
+        if self.wants("indexes"):
+            for key in ("indexes", "constraints"):
+                if key in schema:
+                    view[key] = self.filter_entities(schema[key] or [])
+        if self.wants("visualization"):
+            view["schema"] = schema.get("schema") or []
+        if self.wants("properties") and schema.get("property_sources"):
+            view["property_sources"] = schema["property_sources"]
+        return view
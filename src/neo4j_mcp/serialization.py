@@ -0,0 +1,75 @@
+"""JSON serialization for tool output.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+backends encode Neo4j temporal, duration and spatial values the same way:
+temporals and durations as ISO 8601 strings, points as ``{"srid", "x", "y"[, "z"]}``.
+"""
+
+import datetime
+import json
+from typing import Any
+
+from neo4j.spatial import Point
+from neo4j.time import Date, DateTime, Duration, Time
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a value the JSON backends cannot encode natively."""
+    if isinstance(value, (Date, Time, DateTime, Duration)):
+        return value.iso_format()
+    if isinstance(value, Point):
+        point = {"srid": value.srid, "x": value.x, "y": value.y}
+        if len(value) > 2:
+            point["z"] = value.z
+        return point
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def dumps(value: Any, compact: bool = False) -> str:
+    """Serialize ``value`` to JSON text, indented unless ``compact`` is set."""
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            options |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=encode_value, option=options).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; the stdlib handles those
+            pass
+
+    return _stdlib_dumps(value, compact)
+
+
+def _stdlib_dumps(value: Any, compact: bool) -> str:
+    # The stdlib encodes tuple subclasses such as Point and Duration as plain
+    # lists without calling ``default``, so those are converted up front.
+    value = _prepare(value)
+    if compact:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=encode_value)
+    return json.dumps(value, indent=2, ensure_ascii=False, default=encode_value)
+
+
+def _prepare(value: Any) -> Any:
+    if isinstance(value, (Point, Duration)):
+        return encode_value(value)
+    if isinstance(value, (list, tuple)):
+        return [_prepare(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _prepare(item) for key, item in value.items()}
+    return value
@@ -2,19 +2,32 @@
 
 import asyncio
 import logging
-from typing import Any, Sequence
+from typing import Any, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
 
 import mcp.types as types
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
+from pydantic import AnyUrl
 
 from .config import get_config
 from .connection import Neo4jConnectionManager
+from .discovery import host_discovery_cache
+from .scheduler import ToolScheduler
+from .spill import SPILL_FORMATS, SPILL_URI_PREFIX
 from .tools.schema import get_neo4j_schema, SCHEMA_TOOL
 from .tools.read import read_neo4j_cypher, READ_TOOL
 from .tools.write import write_neo4j_cypher, WRITE_TOOL
 from .tools.config_tool import neo4j_configure, CONFIG_TOOL
 
+# Tool class used for concurrency limits, keyed by tool name
+TOOL_CLASSES = {
+    "get_neo4j_schema": "schema",
+    "read_neo4j_cypher": "read",
+    "write_neo4j_cypher": "write",
+}
+
 
 class Neo4jMCPServer:
     """Neo4j MCP Server with cross-platform support."""
@@ -23,7 +36,17 @@ class Neo4jMCPServer:
         self.server = Server("neo4j-mcp")
         self.config = get_config()
         self.connection_manager = Neo4jConnectionManager(self.config)
+        self.scheduler = ToolScheduler(
+            {
+                "schema": self.config.schema_concurrency,
+                "read": self.config.read_concurrency,
+                "write": self.config.write_concurrency,
+            },
+            self.config.max_queued_calls,
+        )
         self.logger = logging.getLogger(__name__)
+        self._discovery_task: Optional[asyncio.Task] = None
+        self._warmup_task: Optional[asyncio.Task] = None
 
         # Register handlers
         self._register_handlers()
@@ -54,50 +77,144 @@ class Neo4jMCPServer:
             self.logger.info(f"Tool called: {name} with arguments: {arguments}")
 
             try:
-                if name == "neo4j_configure":
-                    action = arguments.get("action")
-                    tool = arguments.get("tool")
-
-                    if not action:
-                        raise ValueError("Action parameter is required")
-
-                    return await neo4j_configure(self, action, tool)
-
-                elif name == "get_neo4j_schema" and self.config.enable_schema_tool:
-                    return await get_neo4j_schema(self.connection_manager)
-
-                elif name == "read_neo4j_cypher" and self.config.enable_read_tool:
-                    query = arguments.get("query")
-                    params = arguments.get("params", {})
-
-                    if not query:
-                        raise ValueError("Query parameter is required")
-
-                    return await read_neo4j_cypher(self.connection_manager, query, params)
-
-                elif name == "write_neo4j_cypher" and self.config.enable_write_tool:
-                    query = arguments.get("query")
-                    params = arguments.get("params", {})
+                tool_class = TOOL_CLASSES.get(name)
+                if tool_class is None:
+                    return await self._dispatch_tool(name, arguments)
 
-                    if not query:
-                        raise ValueError("Query parameter is required")
-
-                    return await write_neo4j_cypher(self.connection_manager, query, params)
-
-                else:
-                    raise ValueError(f"Tool '{name}' is not available or has been disabled")
+                await self._wait_for_warmup()
+                async with self.scheduler.slot(tool_class):
+                    return await self._dispatch_tool(name, arguments)
 
             except Exception as e:
                 error_msg = f"Error executing tool '{name}': {str(e)}"
                 self.logger.error(error_msg)
                 return [types.TextContent(type="text", text=f"Error: {error_msg}")]
 
+        @self.server.list_resources()
+        async def handle_list_resources() -> list[types.Resource]:
+            """List spill files holding full read results."""
+            resources = []
+            for entry in self.connection_manager.spills.list():
+                description = "Spilled read result"
+                if entry["rows"] is not None:
+                    description += f" ({entry['rows']} records)"
+                resources.append(types.Resource(
+                    uri=entry["uri"],
+                    name=entry["name"],
+                    description=description,
+                    mimeType=SPILL_FORMATS[entry["format"]],
+                    size=entry["size"],
+                ))
+            return resources
+
+        @self.server.read_resource()
+        async def handle_read_resource(uri: AnyUrl) -> list[ReadResourceContents]:
+            """Read a byte range of a spill file, e.g. neo4j-mcp://spill/<file>?offset=0&length=65536."""
+            parsed = urlsplit(str(uri))
+            query = parse_qs(parsed.query)
+            offset = int(query.get("offset", ["0"])[0])
+            length = int(query.get("length", [str(self.config.spill_chunk_bytes)])[0])
+            # Chunks are capped at the configured size so one read cannot load a whole file
+            length = min(length, self.config.spill_chunk_bytes)
+            name = parsed.path.rsplit("/", 1)[-1]
+
+            text, meta = self.connection_manager.spills.read(SPILL_URI_PREFIX + name, offset, length)
+            mime_type = SPILL_FORMATS[name.rsplit(".", 1)[-1]]
+            return [ReadResourceContents(content=text, mime_type=mime_type, meta=meta)]
+
+    def _start_warmup(self) -> None:
+        """Start the background connection warm-up if it is enabled."""
+        if self.config.warmup_enabled and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """Open pooled connections and prefetch the schema, logging any failure."""
+        try:
+            await self.connection_manager.warm_up(
+                self.config.warmup_connections, self.config.warmup_schema
+            )
+        except Exception as e:
+            self.logger.warning(f"Connection warm-up failed, connecting on first use instead: {str(e)}")
+
+    async def _wait_for_warmup(self) -> None:
+        """Let database tool calls wait for a warm-up that is still running."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            # Shield so a cancelled tool call does not cancel the shared warm-up
+            await asyncio.shield(self._warmup_task)
+
+    async def _dispatch_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+        """Run a single tool call once it has been scheduled."""
+        if name == "neo4j_configure":
+            action = arguments.get("action")
+            tool = arguments.get("tool")
+
+            if not action:
+                raise ValueError("Action parameter is required")
+
+            return await neo4j_configure(self, action, tool)
+
+        elif name == "get_neo4j_schema" and self.config.enable_schema_tool:
+            return await get_neo4j_schema(
+                self.connection_manager,
+                since=arguments.get("since"),
+                label_prefix=arguments.get("label_prefix"),
+                label_regex=arguments.get("label_regex"),
+                type_prefix=arguments.get("type_prefix"),
+                type_regex=arguments.get("type_regex"),
+                sections=arguments.get("sections"),
+                page=arguments.get("page"),
+                page_size=arguments.get("page_size")
+            )
+
+        elif name == "read_neo4j_cypher" and self.config.enable_read_tool:
+            query = arguments.get("query")
+            params = arguments.get("params", {})
+            page_size = arguments.get("page_size")
+            cursor = arguments.get("cursor")
+
+            if not query and not cursor:
+                raise ValueError("Query parameter is required")
+
+            if page_size is not None:
+                page_size = max(1, min(int(page_size), self.config.max_page_size))
+            if query:
+                self.connection_manager.query_log.record(query)
+
+            return await read_neo4j_cypher(
+                self.connection_manager, query, params, self.config.read_result_limit,
+                page_size=page_size, cursor=cursor,
+                output_format=arguments.get("format", "json"),
+                spill=arguments.get("spill")
+            )
+
+        elif name == "write_neo4j_cypher" and self.config.enable_write_tool:
+            query = arguments.get("query")
+            params = arguments.get("params", {})
+
+            if not query:
+                raise ValueError("Query parameter is required")
+
+            self.connection_manager.query_log.record(query, write=True)
+            return await write_neo4j_cypher(self.connection_manager, query, params)
+
+        else:
+            raise ValueError(f"Tool '{name}' is not available or has been disabled")
+
     async def run(self):
         """Run the MCP server."""
         try:
             self.logger.info("Starting Neo4j MCP Server...")
 
-            # Run the server (connection will be established on first use)
+            # Resolve WSL host discovery in the background so the first connect finds it cached
+            self._discovery_task = asyncio.create_task(host_discovery_cache.get_async(self.config))
+
+            # Warm up in the background; otherwise the connection is established on first use
+            self._start_warmup()
+            self.connection_manager.start_health_monitor()
+            self.connection_manager.start_schema_refresh()
+
             from mcp.server.stdio import stdio_server
 
             async with stdio_server() as (read_stream, write_stream):
@@ -109,6 +226,7 @@ class Neo4jMCPServer:
                         server_version="1.0.0",
                         capabilities=types.ServerCapabilities(
                             tools=types.ToolsCapability(listChanged=False),
+                            resources=types.ResourcesCapability(subscribe=False, listChanged=False),
                         ),
                     ),
                 )
@@ -116,6 +234,9 @@ class Neo4jMCPServer:
             self.logger.error(f"Server error: {str(e)}")
             raise
         finally:
+            for task in (self._discovery_task, self._warmup_task):
+                if task and not task.done():
+                    task.cancel()
             await self.connection_manager.close()
 
     async def shutdown(self):
@@ -0,0 +1,64 @@
+"""Coalescing of identical concurrent requests."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs one shared task per key for callers that arrive while it is in flight.
+
+    Each caller awaits the shared task through ``asyncio.shield``, so a
+    cancelled caller only stops waiting. The task itself is cancelled once
+    every caller has gone away; an error is raised to every caller.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight task for ``key``, starting it with ``factory`` if there is none."""
+        flight = self._flights.get(key)
+        # A task cancelled by its last caller may not have been removed yet
+        if flight is None or flight.task.cancelled():
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            self.started += 1
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as retrieved when no caller was left to see it
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return in-flight and coalesced request counts."""
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,311 @@
+"""Spill files that hold full read results on local disk."""
+
+import asyncio
+import csv
+import io
+import logging
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .serialization import dumps
+
+
+SPILL_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Resource URIs of spill files look like neo4j-mcp://spill/<id>.<format>
+SPILL_URI_PREFIX = "neo4j-mcp://spill/"
+
+# Names the store gives its files, <YYYYmmdd-HHMMSS>-<8 hex digits>.<format>; only these are adopted on startup
+_SPILL_NAME_RE = re.compile(r"\d{8}-\d{6}-[0-9a-f]{8}\.(%s)" % "|".join(SPILL_FORMATS))
+
+# Converted rows buffered before they are written to disk in a worker thread
+SPILL_FLUSH_BYTES = 1024 * 1024
+
+# Smallest chunk a read returns, so it always holds at least one UTF-8 character
+_MIN_CHUNK_BYTES = 4
+
+
+class SpillNotFoundError(LookupError):
+    """Raised when a spill file is unknown or has been cleaned up."""
+
+
+class SpillWriter:
+    """Writes converted records to one spill file as they are streamed.
+
+    Only up to ``SPILL_FLUSH_BYTES`` of pending rows and the first
+    ``preview_rows`` records are held in memory; ``flush`` writes the pending
+    rows from a worker thread so disk I/O does not block the event loop.
+    Writing stops once the file reaches ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        spill_id: str,
+        path: str,
+        output_format: str,
+        max_bytes: int,
+        convert: Callable[[Any], Dict[str, Any]],
+        preview_rows: int
+    ):
+        self.spill_id = spill_id
+        self.path = path
+        self.output_format = output_format
+        self.max_bytes = max_bytes
+        self.preview_rows = preview_rows
+        self._convert = convert
+        self._file = None
+        self._csv = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Start the file over, e.g. when a read transaction is retried."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        # The file is (re)created with the first flush, or by close when nothing was flushed
+        self._opened = False
+        self._pending: List[str] = []
+        self.pending_bytes = 0
+        self._line = io.StringIO()
+        self._csv = csv.writer(self._line) if self.output_format == "csv" else None
+        self.columns: Optional[List[str]] = None
+        self.preview: List[Dict[str, Any]] = []
+        self.rows = 0
+        self.bytes_written = 0
+        self.truncated = False
+
+    def write(self, record: Any) -> bool:
+        """Append one record; returns False once the size cap has been reached."""
+        row = self._convert(record)
+        if self.columns is None:
+            self.columns = list(row.keys())
+            if self._csv is not None:
+                self.bytes_written += self._write_csv(self.columns)
+
+        if self._csv is not None:
+            size = self._write_csv([_csv_value(value) for value in row.values()])
+        else:
+            size = self._write_line(dumps(row, compact=True) + "\n")
+
+        self.bytes_written += size
+        self.rows += 1
+        if len(self.preview) < self.preview_rows:
+            self.preview.append(row)
+
+        if self.bytes_written >= self.max_bytes:
+            self.truncated = True
+            return False
+        return True
+
+    def _write_csv(self, values: List[Any]) -> int:
+        self._csv.writerow(values)
+        line = self._line.getvalue()
+        self._line.seek(0)
+        self._line.truncate()
+        return self._write_line(line)
+
+    def _write_line(self, line: str) -> int:
+        size = len(line.encode("utf-8"))
+        self._pending.append(line)
+        self.pending_bytes += size
+        return size
+
+    @property
+    def needs_flush(self) -> bool:
+        return self.pending_bytes >= SPILL_FLUSH_BYTES
+
+    async def flush(self) -> None:
+        """Write the pending rows to the file from a worker thread."""
+        text = self._take_pending()
+        if text:
+            await asyncio.to_thread(self._write_text, text)
+
+    def _take_pending(self) -> str:
+        text = "".join(self._pending)
+        self._pending = []
+        self.pending_bytes = 0
+        return text
+
+    def _write_text(self, text: str) -> None:
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._opened = True
+        self._file.write(text)
+
+    def close(self) -> None:
+        """Write any rows still pending and close the file; the file exists afterwards even when empty."""
+        text = self._take_pending()
+        if text or not self._opened:
+            self._write_text(text)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _utf8_boundary(data: bytes) -> int:
+    """Get the length of ``data`` without a trailing, incomplete UTF-8 character."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 != 0x80:
+            # A lead byte: 110xxxxx starts 2 bytes, 1110xxxx 3, 11110xxx 4; ASCII is 1
+            width = 1 if byte < 0x80 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return len(data) if back >= width else len(data) - back
+    return len(data)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return dumps(value, compact=True)
+
+
+class SpillStore:
+    """Spill directory with a per-file size cap and LRU cleanup.
+
+    Files are removed least recently used first once their combined size
+    exceeds ``max_total_bytes`` or there are more than ``max_files`` of them.
+    Files left by an earlier run are picked up again, oldest first; other
+    files in the directory are never listed or removed.
+    """
+
+    def __init__(self, directory: str, max_file_bytes: int, max_total_bytes: int, max_files: int):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_files = max(1, max_files)
+        self.logger = logging.getLogger(__name__)
+        self._files: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._scanned = False
+        self.removed = 0
+
+    def create(self, output_format: str, convert: Callable[[Any], Dict[str, Any]], preview_rows: int) -> SpillWriter:
+        """Open a new spill file for writing."""
+        if output_format not in SPILL_FORMATS:
+            raise ValueError(f"Unknown spill format '{output_format}'. Use: {', '.join(SPILL_FORMATS)}")
+        self._scan()
+        os.makedirs(self.directory, exist_ok=True)
+        spill_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+        path = os.path.join(self.directory, f"{spill_id}.{output_format}")
+        return SpillWriter(spill_id, path, output_format, self.max_file_bytes, convert, preview_rows)
+
+    def register(self, writer: SpillWriter) -> str:
+        """Record a finished spill file, clean up old ones and return its resource URI."""
+        writer.close()
+        name = os.path.basename(writer.path)
+        self._files[name] = {
+            "name": name,
+            "path": writer.path,
+            "format": writer.output_format,
+            "size": os.path.getsize(writer.path),
+            "rows": writer.rows,
+        }
+        self._cleanup(keep=name)
+        return SPILL_URI_PREFIX + name
+
+    def discard(self, writer: SpillWriter) -> None:
+        """Remove a spill file that was not completed."""
+        writer.close()
+        try:
+            os.remove(writer.path)
+        except OSError:
+            pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Get the known spill files, most recently used last."""
+        self._scan()
+        return [dict(entry, uri=SPILL_URI_PREFIX + name) for name, entry in self._files.items()]
+
+    def read(self, uri: str, offset: int = 0, length: int = 65536) -> Tuple[str, Dict[str, Any]]:
+        """Read a chunk of a spill file starting at byte ``offset``.
+
+        The chunk ends at the last newline inside the requested range, so NDJSON
+        chunks hold whole rows; a row longer than ``length`` is cut on a UTF-8
+        character boundary instead. The returned metadata gives the next offset.
+        """
+        self._scan()
+        name = uri[len(SPILL_URI_PREFIX):] if uri.startswith(SPILL_URI_PREFIX) else uri
+        entry = self._files.get(name)
+        if entry is None:
+            raise SpillNotFoundError(f"Unknown or removed spill file: {uri}")
+        self._files.move_to_end(name)
+
+        offset = max(0, offset)
+        with open(entry["path"], "rb") as f:
+            f.seek(offset)
+            data = f.read(max(_MIN_CHUNK_BYTES, length))
+            at_end = not f.read(1)
+
+        if not at_end:
+            cut = data.rfind(b"\n")
+            data = data[:cut + 1] if cut >= 0 else data[:_utf8_boundary(data)]
+
+        next_offset = offset + len(data)
+        meta = {
+            "offset": offset,
+            "length": len(data),
+            "size": entry["size"],
+            "next_offset": next_offset if next_offset < entry["size"] else None,
+        }
+        return data.decode("utf-8", errors="replace"), meta
+
+    def _cleanup(self, keep: Optional[str] = None) -> None:
+        total = sum(entry["size"] for entry in self._files.values())
+        for name in list(self._files):
+            if total <= self.max_total_bytes and len(self._files) <= self.max_files:
+                break
+            if name == keep:
+                continue
+            entry = self._files.pop(name)
+            total -= entry["size"]
+            self.removed += 1
+            try:
+                os.remove(entry["path"])
+            except OSError as e:
+                self.logger.debug(f"Could not remove spill file {entry['path']}: {str(e)}")
+
+    def _scan(self) -> None:
+        """Adopt spill files left in the directory by an earlier run, by their generated names."""
+        if self._scanned:
+            return
+        self._scanned = True
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        found = []
+        for name in names:
+            match = _SPILL_NAME_RE.fullmatch(name)
+            if match is None or name in self._files:
+                continue
+            output_format = match.group(1)
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, {
+                "name": name, "path": path, "format": output_format, "size": stat.st_size, "rows": None,
+            }))
+
+        for _, entry in sorted(found, key=lambda item: item[0]):
+            self._files[entry["name"]] = entry
+        self._cleanup()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return spill file counts and sizes."""
+        return {
+            "directory": self.directory,
+            "files": len(self._files),
+            "total_bytes": sum(entry["size"] for entry in self._files.values()),
+            "max_total_bytes": self.max_total_bytes,
+            "removed": self.removed,
+        }
+
@@ -0,0 +1,136 @@
+"""Per-column summaries computed while a result is streamed."""
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional
+
+from neo4j.time import Date, DateTime, Time
+
+_MASK = (1 << 64) - 1
+
+# Values with a meaningful ordering for min/max
+_ORDERED_TYPES = (int, float, str, Date, DateTime, Time)
+
+
+def _mix(value: int) -> int:
+    """Spread a Python hash over 64 bits (splitmix64 finalizer); small ints otherwise hash to themselves."""
+    value &= _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class DistinctSketch:
+    """K-minimum-values estimate of the number of distinct values.
+
+    Exact until ``k`` distinct hashes have been seen; after that the estimate
+    comes from the k-th smallest hash, using O(k) memory for any input size.
+    """
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self._heap: List[int] = []  # negated, so the root is the largest kept hash
+        self._members = set()
+
+    def add(self, value: Any) -> None:
+        try:
+            hashed = _mix(hash(value))
+        except TypeError:
+            hashed = _mix(hash(repr(value)))
+
+        if hashed in self._members:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -hashed)
+            self._members.add(hashed)
+        elif hashed < -self._heap[0]:
+            dropped = -heapq.heapreplace(self._heap, -hashed)
+            self._members.discard(dropped)
+            self._members.add(hashed)
+
+    def estimate(self) -> int:
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        return int((self.k - 1) * (_MASK + 1) / -self._heap[0])
+
+
+class ColumnSummary:
+    """Count, nulls, min/max and a distinct estimate for one column."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+        self._ordered = True
+        self.distinct = DistinctSketch()
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        if value is None:
+            self.nulls += 1
+            return
+        self.distinct.add(value)
+
+        if not self._ordered:
+            return
+        if not isinstance(value, _ORDERED_TYPES):
+            self._ordered = False
+            return
+        try:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        except TypeError:
+            # Mixed types in one column have no common ordering
+            self._ordered = False
+
+    @property
+    def null_ratio(self) -> float:
+        return self.nulls / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = self._ordered and self.min is not None
+        return {
+            "column": self.name,
+            "count": self.count,
+            "null_ratio": self.null_ratio,
+            "min": self.min if ordered else None,
+            "max": self.max if ordered else None,
+            "distinct_estimate": self.distinct.estimate(),
+        }
+
+
+class ResultSummarizer:
+    """Collects column summaries from raw records as they are read.
+
+    With a ``limit``, records past it are not summarized, so a probe record
+    read only to detect that more exist is left out.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.columns: Dict[str, ColumnSummary] = {}
+        self.records = 0
+        self.limit = limit
+
+    def add(self, record: Any) -> None:
+        if self.limit is not None and self.records >= self.limit:
+            return
+        self.records += 1
+        columns = self.columns
+        for key, value in record.items():
+            summary = columns.get(key)
+            if summary is None:
+                summary = columns[key] = ColumnSummary(key)
+            summary.add(value)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [summary.as_dict() for summary in self.columns.values()]
+
+    def wrap(self, convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Return a record converter that summarizes each record before ``convert`` runs."""
+        def summarize_and_convert(record: Any) -> Any:
+            self.add(record)
+            return convert(record)
+        return summarize_and_convert
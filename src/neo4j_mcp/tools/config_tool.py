@@ -20,7 +20,7 @@ async def neo4j_configure(
 
     Args:
         server_instance: The Neo4jMCPServer instance
-        action: Action to perform - "status", "enable", "disable", "list"
+        action: Action to perform - "status", "enable", "disable", "list", "pool"
         tool: Tool to configure - "schema", "read", "write"
         status: Status to set - "true", "false" (for enable/disable actions)
 
@@ -50,11 +50,104 @@ async def neo4j_configure(
             output_lines.append(f"- **Read Tool** (`read_neo4j_cypher`): {read_status}")
             output_lines.append(f"- **Write Tool** (`write_neo4j_cypher`): {write_status}")
 
+            output_lines.append("")
+            output_lines.append("## Tool Scheduler")
+            for tool_class, stats in server_instance.scheduler.get_stats().items():
+                output_lines.append(
+                    f"- **{tool_class}**: {stats['active']}/{stats['limit']} running, "
+                    f"{stats['queued']}/{stats['max_queued']} queued "
+                    f"(peak {stats['max_queue_depth']}), "
+                    f"{stats['completed']} completed, {stats['rejected']} rejected, "
+                    f"wait avg {stats['avg_wait_ms']:.1f} ms / max {stats['max_wait_ms']:.1f} ms"
+                )
+
+            connection_manager = server_instance.connection_manager
+            output_lines.append("")
+            output_lines.append("## Endpoint Health")
+            output_lines.append(f"- **Active URI**: {connection_manager.active_uri or 'not connected'}")
+            output_lines.append(f"- **Failovers**: {connection_manager.failovers}")
+            for uri, health in connection_manager.endpoint_health.items():
+                health_stats = health.as_dict()
+                latency = health_stats["avg_latency_ms"]
+                latency_str = f"{latency:.1f} ms avg" if latency is not None else "no successful checks"
+                output_lines.append(
+                    f"- **{uri}**: {latency_str}, {health_stats['failures']}/{health_stats['checks']} checks failed"
+                    + (f" (last error: {health_stats['last_error']})" if health_stats["consecutive_failures"] else "")
+                )
+
+            cursor_stats = connection_manager.cursors.get_stats()
+            output_lines.append("")
+            output_lines.append("## Paginated Reads")
+            output_lines.append(
+                f"- **Open cursors**: {cursor_stats['open']}/{cursor_stats['max_cursors']} "
+                f"({cursor_stats['opened']} opened, {cursor_stats['expired']} expired, {cursor_stats['evicted']} evicted)"
+            )
+
+            cache_stats = connection_manager.read_cache.get_stats()
+            output_lines.append("")
+            output_lines.append("## Read Cache")
+            output_lines.append(
+                f"- **Entries**: {cache_stats['entries']}/{cache_stats['max_entries']} (TTL {cache_stats['ttl']:g}s)"
+            )
+            output_lines.append(
+                f"- **Hits**: {cache_stats['hits']}, **misses**: {cache_stats['misses']} "
+                f"({cache_stats['hit_ratio']:.0%} hit ratio)"
+            )
+            output_lines.append(
+                f"- **Evictions**: {cache_stats['evictions']}, **expirations**: {cache_stats['expirations']}, "
+                f"**invalidations**: {cache_stats['invalidations']}"
+            )
+            flight_stats = connection_manager.read_flights.get_stats()
+            output_lines.append(
+                f"- **Coalesced reads**: {flight_stats['coalesced']} joined an identical in-flight read "
+                f"({flight_stats['in_flight']} in flight)"
+            )
+
+            schema_stats = connection_manager.schema_cache.get_stats()
+            output_lines.append("")
+            output_lines.append("## Schema Cache")
+            if schema_stats["version"] is not None:
+                output_lines.append(
+                    f"- **Snapshot**: version {schema_stats['version']} (hash `{schema_stats['hash']}`), "
+                    f"{schema_stats['age']:.0f}s old, {schema_stats['history']} recent versions kept"
+                    + (" (restored from disk)" if schema_stats["restored"] else "")
+                )
+            else:
+                output_lines.append("- **Snapshot**: none")
+            output_lines.append(
+                f"- **Hits**: {schema_stats['hits']}, **misses**: {schema_stats['misses']}, "
+                f"**refreshes**: {schema_stats['refreshes']}, **invalidations**: {schema_stats['invalidations']}"
+            )
+            if schema_stats["last_invalidation"]:
+                output_lines.append(f"- **Last invalidation**: {schema_stats['last_invalidation']}")
+            query_log = connection_manager.query_log
+            output_lines.append(
+                f"- **Index advisor query log**: {len(query_log)}/{query_log.max_queries} distinct queries"
+            )
+
+            spill_stats = connection_manager.spills.get_stats()
+            output_lines.append("")
+            output_lines.append("## Spill Files")
+            output_lines.append(f"- **Directory**: {spill_stats['directory']}")
+            output_lines.append(
+                f"- **Files**: {spill_stats['files']} ({spill_stats['total_bytes']:,} of "
+                f"{spill_stats['max_total_bytes']:,} bytes, {spill_stats['removed']} removed)"
+            )
+
+            retry_stats = connection_manager.retry_stats.as_dict()
+            output_lines.append("")
+            output_lines.append("## Write Retries")
+            output_lines.append(f"- **Retries**: {retry_stats['retries']}")
+            output_lines.append(f"- **Gave up**: {retry_stats['gave_up']}")
+            for error_class, count in sorted(retry_stats["errors"].items()):
+                output_lines.append(f"- **{error_class}**: {count}")
+
             output_lines.append("")
             output_lines.append("## Quick Commands")
             output_lines.append("- **Disable writes**: Use tool `neo4j_configure` with `action=disable, tool=write`")
             output_lines.append("- **Enable writes**: Use tool `neo4j_configure` with `action=enable, tool=write`")
             output_lines.append("- **Check status**: Use tool `neo4j_configure` with `action=status`")
+            output_lines.append("- **Inspect pool**: Use tool `neo4j_configure` with `action=pool`")
 
             return [TextContent(type="text", text="\n".join(output_lines))]
 
@@ -120,8 +213,47 @@ async def neo4j_configure(
 
             return [TextContent(type="text", text="\n".join(output_lines))]
 
+        elif action == "pool":
+            stats = server_instance.connection_manager.get_pool_stats()
+
+            output_lines = []
+            output_lines.append("# Neo4j Connection Pool")
+            output_lines.append("")
+            if not stats["connected"]:
+                output_lines.append("Not connected yet - the pool is created on first use.")
+                output_lines.append("")
+            else:
+                output_lines.append(f"- **URI**: {stats['uri']}")
+            output_lines.append(f"- **In use**: {stats['in_use']}")
+            output_lines.append(f"- **Idle**: {stats['idle']}")
+            output_lines.append(f"- **Max pool size**: {stats['max_connection_pool_size']}")
+            output_lines.append(f"- **Acquisition timeout**: {stats['connection_acquisition_timeout']} s")
+            output_lines.append(f"- **Max connection lifetime**: {stats['max_connection_lifetime']} s")
+            liveness = stats["liveness_check_timeout"]
+            output_lines.append(f"- **Liveness check**: {f'after {liveness} s idle' if liveness is not None else 'disabled'}")
+
+            output_lines.append("")
+            output_lines.append("## Acquisitions")
+            output_lines.append(f"- **Successful**: {stats['acquisitions']}")
+            output_lines.append(f"- **Failed**: {stats['acquisition_failures']}")
+            output_lines.append(f"- **Wait**: avg {stats['avg_acquisition_ms']:.1f} ms / max {stats['max_acquisition_ms']:.1f} ms")
+
+            if stats["routing"]:
+                output_lines.append("")
+                output_lines.append("## Routing Table")
+                for role, addresses in stats["routing"].items():
+                    output_lines.append(f"- **{role.capitalize()}**: {', '.join(addresses) if addresses else 'none'}")
+
+            if stats["addresses"]:
+                output_lines.append("")
+                output_lines.append("## By Address")
+                for address, counts in stats["addresses"].items():
+                    output_lines.append(f"- **{address}**: {counts['in_use']} in use, {counts['idle']} idle")
+
+            return [TextContent(type="text", text="\n".join(output_lines))]
+
         else:
-            return [TextContent(type="text", text=f"Error: Unknown action '{action}'. Use: status, enable, disable, or list")]
+            return [TextContent(type="text", text=f"Error: Unknown action '{action}'. Use: status, enable, disable, list, or pool")]
 
     except Exception as e:
         error_msg = f"Failed to configure server: {str(e)}"
@@ -138,8 +270,8 @@ CONFIG_TOOL = Tool(
         "properties": {
             "action": {
                 "type": "string",
-                "description": "Action to perform: 'status' (show current config), 'enable' (enable specific tool), 'disable' (disable specific tool), 'list' (show available tools)",
-                "enum": ["status", "enable", "disable", "list"]
+                "description": "Action to perform: 'status' (show current config), 'enable' (enable specific tool), 'disable' (disable specific tool), 'list' (show available tools), 'pool' (show connection pool usage)",
+                "enum": ["status", "enable", "disable", "list", "pool"]
             },
             "tool": {
                 "type": "string",
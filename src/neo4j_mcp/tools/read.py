@@ -1,34 +1,80 @@
 """Neo4j read query execution tool."""
 
-import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from mcp.types import Tool, TextContent
 
 from ..connection import Neo4jConnectionManager
+from ..encoding import ColumnarResultEncoder, GraphResultEncoder
+from ..serialization import dumps
+from ..spill import SPILL_FORMATS
+from ..summaries import ResultSummarizer
 
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_FORMATS = ("json", "graph", "columnar", "ndjson")
+
+# Records of a spilled result shown inline
+SPILL_PREVIEW_ROWS = 20
+
 
 async def read_neo4j_cypher(
     connection_manager: Neo4jConnectionManager,
     query: str,
-    params: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None,
+    max_records: int = 1000,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    output_format: str = "json",
+    spill: Optional[str] = None
 ) -> list[TextContent]:
     """
     Execute a read Cypher query on the Neo4j database.
 
+    Results are streamed and reading stops after ``max_records`` + 1 records,
+    so a query matching millions of rows never gets materialized in memory.
+    The output budget decides how many of them are shown; only rows that can
+    fit in it are kept, while column summaries cover every record read.
+    With ``page_size`` the result is returned page by page instead: each page
+    carries a continuation token that is passed back as ``cursor``. With
+    ``spill`` the full result is written to a local file that is exposed as
+    an MCP resource, and only a preview is returned.
+
     Args:
         connection_manager: Neo4jConnectionManager instance
         query: The Cypher query to execute
         params: Optional parameters to pass to the Cypher query
+        max_records: Records to read before reporting that more exist
+        page_size: Records per page for a paginated read
+        cursor: Continuation token from a previous page
+        output_format: "json" for one object per record, "graph" for rows
+            that reference deduplicated node and relationship tables,
+            "columnar" for a single column header plus value arrays, or
+            "ndjson" for one compact JSON object per line
+        spill: "ndjson" or "csv" to write the full result to a spill file
 
     Returns:
         List of TextContent with query results
     """
+    if output_format not in OUTPUT_FORMATS:
+        return [TextContent(
+            type="text",
+            text=f"Error: Unknown format '{output_format}'. Use: {', '.join(OUTPUT_FORMATS)}"
+        )]
+
+    if spill is not None:
+        if page_size is not None or cursor is not None:
+            return [TextContent(type="text", text="Error: 'spill' cannot be combined with 'page_size' or 'cursor'.")]
+        return await _read_spill(connection_manager, query, params, spill)
+
+    if page_size is not None or cursor is not None:
+        return await _read_page(connection_manager, query, params, page_size or max_records, cursor, output_format)
+
     try:
+        compact = connection_manager.config.compact_json
+
         # Validate that this is likely a read-only query
         query_lower = query.strip().lower()
         write_keywords = []#['create', 'merge', 'delete', 'remove', 'set', 'detach delete']
@@ -40,8 +86,22 @@ async def read_neo4j_cypher(
                 text="Warning: This query appears to contain write operations. Use write_neo4j_cypher for write queries."
             )]
 
-        # Execute the read query
-        results = await connection_manager.execute_read_query(query, params)
+        # Execute the read query, reading one record past the cap to detect more.
+        # Column summaries are collected from the raw records in the same pass;
+        # records past the output budget are only summarized, not converted.
+        config = connection_manager.config
+        encoder = _make_encoder(connection_manager, output_format)
+        summarizer = ResultSummarizer(limit=max_records)
+        convert = summarizer.wrap(_BudgetedConverter(
+            encoder.encode_record if encoder else connection_manager._convert_record,
+            config.read_output_budget, config.read_output_budget_unit
+        ))
+        read = await connection_manager.execute_read_query(
+            query, params, limit=max_records + 1, convert=convert
+        )
+        has_more = len(read) > max_records
+        total_read = min(len(read), max_records)
+        results = [row for row in read[:max_records] if row is not _OVER_BUDGET]
 
         # Format results
         output_lines = []
@@ -50,34 +110,34 @@ async def read_neo4j_cypher(
         output_lines.append(f"**Query:** `{query}`")
 
         if params:
-            output_lines.append(f"**Parameters:** `{json.dumps(params, indent=2)}`")
+            output_lines.append(f"**Parameters:** `{dumps(params, compact)}`")
 
-        output_lines.append(f"**Records returned:** {len(results)}")
+        if has_more:
+            output_lines.append(f"**Records returned:** more than {max_records} (stopped reading after {max_records + 1})")
+        else:
+            output_lines.append(f"**Records returned:** {total_read}")
         output_lines.append("")
 
-        if results:
-            # Show results in a formatted way
+        if total_read:
             output_lines.append("## Results")
             output_lines.append("")
 
-            # If results are small, show them nicely formatted
-            if len(results) <= 100:
-                output_lines.append("```json")
-                output_lines.append(json.dumps(results, indent=2, default=str))
-                output_lines.append("```")
-            else:
-                # For large results, show first few records and summary
-                output_lines.append("**First 10 records:**")
-                output_lines.append("```json")
-                output_lines.append(json.dumps(results[:10], indent=2, default=str))
-                output_lines.append("```")
-                output_lines.append("")
-                output_lines.append(f"**Note:** Showing first 10 of {len(results)} total records.")
+            # Show as many records as fit in the output budget
+            def render(count: int) -> List[str]:
+                return _format_rows(results[:count], encoder, output_format, compact)
+
+            shown = _fit_rows(results, render, config.read_output_budget, config.read_output_budget_unit)
+            if shown:
+                output_lines.extend(render(shown))
 
-                # Show column summary if available
-                if results:
-                    columns = list(results[0].keys())
-                    output_lines.append(f"**Columns:** {', '.join(columns)}")
+            if shown < total_read or has_more:
+                total = f"more than {max_records}" if has_more else str(total_read)
+                output_lines.append("")
+                output_lines.append(f"**Note:** Showing first {shown} of {total} records "
+                                    f"(output budget: {config.read_output_budget} {config.read_output_budget_unit}). "
+                                    "Add a LIMIT, filter or aggregation to narrow the result.")
+                output_lines.append("")
+                output_lines.extend(_format_summaries(summarizer, compact, has_more))
 
         else:
             output_lines.append("## Results")
@@ -100,6 +160,250 @@ async def read_neo4j_cypher(
         )]
 
 
+async def _read_page(
+    connection_manager: Neo4jConnectionManager,
+    query: Optional[str],
+    params: Optional[Dict[str, Any]],
+    page_size: int,
+    cursor: Optional[str],
+    output_format: str = "json"
+) -> list[TextContent]:
+    """Return one page of a paginated read, opening the cursor on the first call."""
+    try:
+        compact = connection_manager.config.compact_json
+        encoder = _make_encoder(connection_manager, output_format)
+        convert = encoder.encode_record if encoder else None
+        if cursor:
+            query = connection_manager.cursors.get_query(cursor) or query
+            results, next_cursor, page = await connection_manager.fetch_read_cursor(cursor, page_size, convert)
+        else:
+            results, next_cursor, page = await connection_manager.open_read_cursor(query, params, page_size, convert)
+
+        output_lines = []
+        output_lines.append(f"# Query Results (page {page})")
+        output_lines.append("")
+        output_lines.append(f"**Query:** `{query}`")
+
+        if params and not cursor:
+            output_lines.append(f"**Parameters:** `{dumps(params, compact)}`")
+
+        output_lines.append(f"**Records in page:** {len(results)}")
+        output_lines.append("")
+        output_lines.append("## Results")
+        output_lines.append("")
+
+        if results:
+            output_lines.extend(_format_rows(results, encoder, output_format, compact))
+        else:
+            output_lines.append("No records returned.")
+
+        output_lines.append("")
+        if next_cursor:
+            output_lines.append(f"**Next page:** call `read_neo4j_cypher` with `cursor: \"{next_cursor}\"`")
+        else:
+            output_lines.append("**Last page** - the result is exhausted.")
+
+        return [TextContent(
+            type="text",
+            text="\n".join(output_lines)
+        )]
+
+    except Exception as e:
+        error_msg = f"Failed to execute read query: {str(e)}"
+        logger.error(error_msg)
+
+        return [TextContent(
+            type="text",
+            text=f"Error: {error_msg}\n\nQuery: {query}\nParameters: {params}"
+        )]
+
+
+async def _read_spill(
+    connection_manager: Neo4jConnectionManager,
+    query: str,
+    params: Optional[Dict[str, Any]],
+    spill: str
+) -> list[TextContent]:
+    """Write the full result to a spill file and return a preview plus its resource URI."""
+    if spill not in SPILL_FORMATS:
+        return [TextContent(
+            type="text",
+            text=f"Error: Unknown spill format '{spill}'. Use: {', '.join(SPILL_FORMATS)}"
+        )]
+
+    try:
+        config = connection_manager.config
+        compact = config.compact_json
+        writer, uri = await connection_manager.spill_read_query(query, params, spill, SPILL_PREVIEW_ROWS)
+
+        output_lines = []
+        output_lines.append("# Query Results (spilled to file)")
+        output_lines.append("")
+        output_lines.append(f"**Query:** `{query}`")
+
+        if params:
+            output_lines.append(f"**Parameters:** `{dumps(params, compact)}`")
+
+        output_lines.append(f"**Records written:** {writer.rows}")
+        output_lines.append(f"**File size:** {writer.bytes_written:,} bytes ({spill})")
+        if writer.truncated:
+            output_lines.append(f"**Truncated:** the file reached the {config.spill_max_file_bytes:,} byte cap "
+                                "and the rest of the result was not written.")
+        output_lines.append(f"**Resource:** `{uri}`")
+        output_lines.append("")
+
+        output_lines.append("## Preview")
+        output_lines.append("")
+        preview = writer.preview
+
+        def render(count: int) -> List[str]:
+            return _format_rows(preview[:count], None, "json", compact)
+
+        shown = _fit_rows(preview, render, config.read_output_budget, config.read_output_budget_unit)
+        if shown:
+            output_lines.extend(render(shown))
+            output_lines.append(f"Showing first {shown} of {writer.rows} records.")
+        else:
+            output_lines.append("No records returned." if not writer.rows else "Records are too large to preview.")
+
+        output_lines.append("")
+        output_lines.append(f"**Reading the file:** read the resource `{uri}` in chunks of up to "
+                            f"{config.spill_chunk_bytes:,} bytes. Add `?offset=<byte>&length=<bytes>` for a "
+                            "byte range; each chunk's metadata gives `next_offset`.")
+
+        return [TextContent(
+            type="text",
+            text="\n".join(output_lines)
+        )]
+
+    except Exception as e:
+        error_msg = f"Failed to execute read query: {str(e)}"
+        logger.error(error_msg)
+
+        return [TextContent(
+            type="text",
+            text=f"Error: {error_msg}\n\nQuery: {query}\nParameters: {params}"
+        )]
+
+
+# Placeholder for records read past the output budget
+_OVER_BUDGET = object()
+
+
+class _BudgetedConverter:
+    """Converts records until their compact size passes the output budget.
+
+    One record past the budget is kept, as ``_fit_rows`` needs it to find
+    the cut; later records become ``_OVER_BUDGET`` without being converted,
+    so a long read holds no more rows than the output can show.
+    """
+
+    def __init__(self, convert: Callable[[Any], Any], budget: int, unit: str):
+        self.convert = convert
+        self.budget = budget
+        self.unit = unit
+        self.used = 0
+
+    def __call__(self, record: Any) -> Any:
+        if self.used > self.budget:
+            return _OVER_BUDGET
+        row = self.convert(record)
+        self.used += _measure(dumps(row, compact=True), self.unit)
+        return row
+
+
+def _measure(text: str, unit: str) -> int:
+    """Size of ``text`` in bytes, or in estimated tokens (about 4 characters each)."""
+    if unit == "tokens":
+        return -(-len(text) // 4)
+    return len(text.encode("utf-8"))
+
+
+def _fit_rows(
+    rows: List[Any],
+    render: Callable[[int], List[str]],
+    budget: int,
+    unit: str
+) -> int:
+    """Find how many leading rows render within ``budget``.
+
+    Compact per-row sizes give a cheap upper bound, so the rendered block is
+    only built for row counts near the budget rather than for every row.
+    """
+    upper, used = 0, 0
+    for row in rows:
+        used += _measure(dumps(row, compact=True), unit)
+        if used > budget:
+            break
+        upper += 1
+    upper = min(len(rows), upper + 1)
+
+    low, high = 0, upper
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _measure("\n".join(render(middle)), unit) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _format_summaries(summarizer: ResultSummarizer, compact: bool, has_more: bool = False) -> List[str]:
+    """Render per-column summaries of every record read as a markdown table."""
+    if has_more:
+        heading = f"## Column Summary (first {summarizer.records} records; reading stopped there)"
+    else:
+        heading = f"## Column Summary (all {summarizer.records} records)"
+    lines = [heading, "",
+             "| Column | Count | Null ratio | Min | Max | Distinct (est.) |",
+             "|---|---|---|---|---|---|"]
+    for summary in summarizer.summaries():
+        bounds = [_short(dumps(summary[key], compact=True)) if summary[key] is not None else ""
+                  for key in ("min", "max")]
+        lines.append(f"| {summary['column']} | {summary['count']} | {summary['null_ratio']:.2f} | "
+                     f"{bounds[0]} | {bounds[1]} | {summary['distinct_estimate']} |")
+    return lines
+
+
+def _short(text: str, width: int = 40) -> str:
+    text = text.replace("|", "\\|")
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def _make_encoder(connection_manager: Neo4jConnectionManager, output_format: str) -> Optional[Any]:
+    """Get the record encoder for an output format; None means plain per-record dicts."""
+    if output_format == "graph":
+        return GraphResultEncoder()
+    if output_format in ("columnar", "ndjson"):
+        return ColumnarResultEncoder(connection_manager._convert_neo4j_value)
+    return None
+
+
+def _format_rows(
+    rows: List[Any],
+    encoder: Optional[Any] = None,
+    output_format: str = "json",
+    compact: bool = False
+) -> List[str]:
+    """Render result rows as a fenced block in the requested shape."""
+    if isinstance(encoder, ColumnarResultEncoder):
+        columns = encoder.columns or []
+        if output_format == "ndjson":
+            lines = [dumps(dict(zip(columns, row)), compact=True) for row in rows]
+            return ["```ndjson", *lines, "```"]
+        # One array per line keeps wide results compact but still scannable
+        body = ",\n".join(dumps(row, compact=True) for row in rows)
+        return ["```json", f'{{"columns":{dumps(columns, compact=True)},"rows":[', body, "]}", "```"]
+
+    if encoder is not None:
+        payload = encoder.encode_result(rows)
+        summary = (f"**Unique nodes:** {len(payload['nodes'])}, "
+                   f"**unique relationships:** {len(payload['relationships'])}")
+        return [summary, "", "```json", dumps(payload, compact), "```"]
+
+    return ["```json", dumps(rows, compact), "```"]
+
+
 # Tool definition for MCP
 READ_TOOL = Tool(
     name="read_neo4j_cypher",
@@ -109,15 +413,35 @@ READ_TOOL = Tool(
         "properties": {
             "query": {
                 "type": "string",
-                "description": "The Cypher query to execute (read-only operations like MATCH, RETURN, WITH, etc.)"
+                "description": "The Cypher query to execute (read-only operations like MATCH, RETURN, WITH, etc.). Required unless 'cursor' is given."
             },
             "params": {
                 "type": "object",
                 "description": "Optional parameters for parameterized queries (e.g., {name: 'John', age: 30})",
                 "default": {},
                 "additionalProperties": True
+            },
+            "page_size": {
+                "type": "integer",
+                "description": "Return the result page by page with this many records per page. The response includes a cursor for the next page.",
+                "minimum": 1
+            },
+            "cursor": {
+                "type": "string",
+                "description": "Continuation token from a previous page. Returns the next page of that result; 'query' is not needed."
+            },
+            "spill": {
+                "type": "string",
+                "description": "Write the full result to a local file in this format instead of truncating it. Returns a preview and a resource URI that can be read in byte-range chunks; use for exports beyond a few hundred rows.",
+                "enum": list(SPILL_FORMATS)
+            },
+            "format": {
+                "type": "string",
+                "description": "Result shape: 'json' (one pretty-printed object per record), 'graph' (rows reference deduplicated 'nodes' and 'relationships' tables by element ID; best for path and traversal queries), 'columnar' (column names once, then one value array per row; smallest for wide tabular results) or 'ndjson' (one compact JSON object per line)",
+                "enum": list(OUTPUT_FORMATS),
+                "default": "json"
             }
         },
-        "required": ["query"]
+        "required": []
     }
 )
\ No newline at end of file
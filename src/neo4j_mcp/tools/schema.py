@@ -1,17 +1,43 @@
 """Neo4j schema introspection tool."""
 
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional
 
 from mcp.types import Tool, TextContent
 
 from ..connection import Neo4jConnectionManager
+from ..index_advisor import advise
+from ..schema_diff import COUNT_SECTIONS, DIFF_SECTIONS, diff_schemas
+from ..schema_view import SCHEMA_PAGE_SIZE, SCHEMA_SECTIONS, SchemaView
+from ..serialization import dumps
 
 
 logger = logging.getLogger(__name__)
 
 
-async def get_neo4j_schema(connection_manager: Neo4jConnectionManager) -> list[TextContent]:
+# Headings for the sections of a schema diff
+DIFF_TITLES = {
+    "nodes": "Node Labels",
+    "relationships": "Relationship Types",
+    "indexes": "Indexes",
+    "constraints": "Constraints",
+    "counts": "Node Counts by Label",
+    "relationship_counts": "Relationship Counts by Type",
+}
+
+
+async def get_neo4j_schema(
+    connection_manager: Neo4jConnectionManager,
+    since: Optional[str] = None,
+    label_prefix: Optional[str] = None,
+    label_regex: Optional[str] = None,
+    type_prefix: Optional[str] = None,
+    type_regex: Optional[str] = None,
+    sections: Optional[List[str]] = None,
+    page: Optional[int] = None,
+    page_size: Optional[int] = None
+) -> list[TextContent]:
     """
     Get comprehensive schema information from the Neo4j database.
 
@@ -20,32 +46,100 @@ async def get_neo4j_schema(connection_manager: Neo4jConnectionManager) -> list[T
 
     Args:
         connection_manager: Neo4jConnectionManager instance
+        since: Schema hash from an earlier call; only the changes since that version are returned
+        label_prefix: Only labels starting with this prefix
+        label_regex: Only labels fully matching this regular expression
+        type_prefix: Only relationship types starting with this prefix
+        type_regex: Only relationship types fully matching this regular expression
+        sections: Sections to include (see ``SCHEMA_SECTIONS``)
+        page: 1-based page of labels and relationship types
+        page_size: Labels and relationship types per page
 
     Returns:
         List of TextContent with schema information including:
         - Node labels and counts
         - Relationship types
+        - Property names, types and mandatory flags per label and type
         - Basic schema structure
-        Note: For detailed property information, APOC plugin would be needed (optional)
     """
     try:
-        schema_info = await connection_manager.get_schema_info()
-
-        # Format the schema information
         output_lines = []
         output_lines.append("# Neo4j Database Schema")
         output_lines.append("")
 
+        view_args = (label_prefix, label_regex, type_prefix, type_regex, sections, page, page_size)
+        if any(arg is not None for arg in view_args):
+            # Filtered views skip the diff and snapshot paths
+            view = SchemaView(
+                label_prefix, label_regex, type_prefix, type_regex, sections,
+                page=page or 1, page_size=page_size or SCHEMA_PAGE_SIZE
+            )
+            result = await connection_manager.get_schema_view(view)
+            schema_info = result["schema"]
+            filters = view.describe()
+            output_lines.append(
+                f"**View:** {', '.join(filters) if filters else 'all labels and types'}; "
+                f"sections: {', '.join(s for s in SCHEMA_SECTIONS if view.wants(s))}; "
+                f"page {view.page} ({view.page_size} per page, from {result['source']})"
+            )
+            output_lines.append("")
+        else:
+            view = None
+            snapshot = await connection_manager.get_schema_snapshot()
+            schema_info = snapshot["schema"]
+            complete = not schema_info.get("errors")
+            versioned = snapshot["version"] is not None
+
+            # Answer with a diff when the caller already has a version we still keep
+            previous = None
+            if since and complete and versioned:
+                if since == snapshot.get("hash"):
+                    previous = snapshot
+                else:
+                    previous = connection_manager.schema_cache.find(since)
+            if previous is not None:
+                return [TextContent(type="text", text=_format_diff(previous, snapshot))]
+
+            age = max(0.0, time.time() - snapshot["fetched_at"])
+            if not complete:
+                source = "partial, not cached"
+            elif not versioned:
+                source = "not cached, the schema changed while it was read"
+            elif snapshot.get("restored"):
+                source = "restored from disk"
+            else:
+                source = "cached snapshot"
+            version = snapshot["version"] if versioned else "none"
+            output_lines.append(f"**Schema version:** {version} ({source}, fetched {age:.0f}s ago)")
+            if complete and versioned and snapshot.get("hash"):
+                output_lines.append(f"**Schema hash:** `{snapshot['hash']}` (pass as `since` to get only later changes)")
+            if since and previous is None:
+                output_lines.append(f"Schema hash `{since}` is no longer kept; the full schema follows.")
+            output_lines.append("")
+
+        if schema_info.get("errors"):
+            output_lines.append("## Incomplete Sections")
+            output_lines.append("These sections timed out or failed; the rest of the schema is shown below.")
+            output_lines.append("")
+            for section, error in schema_info["errors"].items():
+                output_lines.append(f"- **{section}**: {error}")
+            output_lines.append("")
+
         # Check if we have basic or detailed schema info
-        has_detailed_props = schema_info.get("nodes") and any(
-            node.get("properties") for node in schema_info["nodes"]
+        has_detailed_props = any(
+            entry.get("properties")
+            for key in ("nodes", "relationships")
+            for entry in schema_info.get(key) or []
         )
+        property_sources = schema_info.get("property_sources") or {}
 
         # Node labels and properties
         if schema_info.get("nodes"):
             output_lines.append("## Node Labels")
             if has_detailed_props:
                 output_lines.append("(With Properties)")
+            if "nodes" in property_sources:
+                output_lines.append(f"Property source: {property_sources['nodes']}")
             output_lines.append("")
 
             for node_info in schema_info["nodes"]:
@@ -72,6 +166,8 @@ async def get_neo4j_schema(connection_manager: Neo4jConnectionManager) -> list[T
             output_lines.append("## Relationship Types")
             if has_detailed_props:
                 output_lines.append("(With Properties)")
+            if "relationships" in property_sources:
+                output_lines.append(f"Property source: {property_sources['relationships']}")
             output_lines.append("")
 
             for rel_info in schema_info["relationships"]:
@@ -92,36 +188,113 @@ async def get_neo4j_schema(connection_manager: Neo4jConnectionManager) -> list[T
                 else:
                     output_lines.append(f"- **{rel_type}**")
 
-        # Node counts if available (from basic fallback)
+        # Per-label and per-type counts from the count store
         if schema_info.get("counts"):
             output_lines.append("")
             output_lines.append("## Node Counts by Label")
             output_lines.append("")
             for count_info in schema_info["counts"]:
+                label = count_info.get("label", "Unknown")
+                count = count_info.get("count", 0)
+                output_lines.append(f"- **{label}**: {count:,} nodes")
+
+        if schema_info.get("relationship_counts"):
+            output_lines.append("")
+            output_lines.append("## Relationship Counts by Type")
+            output_lines.append("")
+            for count_info in schema_info["relationship_counts"]:
+                rel_type = count_info.get("relationshipType", "Unknown")
+                count = count_info.get("count", 0)
+                output_lines.append(f"- **{rel_type}**: {count:,} relationships")
+
+        # Label combinations, only when sampling is enabled
+        combinations = schema_info.get("label_combinations")
+        if combinations and combinations.get("rows"):
+            output_lines.append("")
+            output_lines.append(f"## Label Combinations (sample of {combinations['sample']:,} nodes)")
+            output_lines.append("")
+            for count_info in combinations["rows"]:
                 labels = count_info.get("labels", [])
                 count = count_info.get("count", 0)
-                label_str = ":".join(labels) if labels else "Unknown"
+                label_str = ":".join(labels) if labels else "(no labels)"
                 output_lines.append(f"- **{label_str}**: {count:,} nodes")
 
+        # Indexes, constraints and the advisor
+        if schema_info.get("indexes"):
+            output_lines.append("")
+            output_lines.append("## Indexes")
+            output_lines.append("")
+            for index in schema_info["indexes"]:
+                output_lines.append(f"- **{index.get('name')}**: {_describe_index(index)}{_index_usage(index)}")
+
+        if schema_info.get("constraints"):
+            output_lines.append("")
+            output_lines.append("## Constraints")
+            output_lines.append("")
+            for constraint in schema_info["constraints"]:
+                output_lines.append(f"- **{constraint.get('name')}**: {_describe_index(constraint)}")
+
+        if schema_info.get("indexes") is not None:
+            # Read counts in the snapshot can be stale, so the advisor uses a recent listing
+            max_age = connection_manager.config.index_usage_max_age
+            try:
+                indexes = await connection_manager.list_indexes(max_age)
+                usage = f"index read counts at most {max_age:g}s old" if max_age > 0 else "current index read counts"
+            except Exception as e:
+                logger.warning(f"Could not list indexes for the advisor: {str(e)}")
+                indexes = schema_info["indexes"]
+                usage = "index read counts from the schema snapshot, which may be out of date"
+            advice = advise(connection_manager.query_log.entries(), indexes)
+            if view is not None:
+                advice["unused"] = view.filter_entities(advice["unused"])
+            output_lines.append("")
+            output_lines.append("## Index Advisor")
+            output_lines.append(
+                f"Based on the last {len(connection_manager.query_log)} distinct tool queries and {usage}."
+            )
+            output_lines.append("")
+            for found in advice["missing"]:
+                names = ":".join(found["labelsOrTypes"])
+                pattern = f"(:{names})" if found["entityType"] == "NODE" else f"[:{names}]"
+                output_lines.append(
+                    f"- **Missing index** on {pattern}.{found['property']}: filtered without an index "
+                    f"in {found['runs']} run(s), e.g. `{found['example']}`"
+                )
+            for index in advice["unused"]:
+                output_lines.append(f"- **Unused index** {index.get('name')}: no reads recorded by the server")
+            if not advice["missing"] and not advice["unused"]:
+                output_lines.append("- No unindexed predicates or unused indexes found")
+
         # Full schema visualization if available
         if schema_info.get("schema") and len(schema_info["schema"]) > 0:
             output_lines.append("")
             output_lines.append("## Schema Visualization")
             output_lines.append("")
             output_lines.append("```json")
-            import json
             # Limit output size for readability
             schema_data = schema_info["schema"][:5] if len(schema_info["schema"]) > 5 else schema_info["schema"]
-            output_lines.append(json.dumps(schema_data, indent=2))
+            output_lines.append(dumps(schema_data, connection_manager.config.compact_json))
             if len(schema_info["schema"]) > 5:
                 output_lines.append(f"\n... and {len(schema_info['schema']) - 5} more items")
             output_lines.append("```")
 
+        # Point at the next page when this one did not hold every match
+        page_info = schema_info.get("page")
+        if page_info and any(page_info["more"].values()):
+            kinds = [
+                "labels" if kind == "nodes" else "relationship types"
+                for kind, more in page_info["more"].items() if more
+            ]
+            output_lines.append("")
+            output_lines.append(
+                f"**More {' and '.join(kinds)} match.** Call again with `page={page_info['number'] + 1}` for the next page."
+            )
+
         # Add helpful note about functionality
         output_lines.append("")
         output_lines.append("## About This Schema")
         output_lines.append("Generated using **standard Neo4j procedures only** - no APOC plugin required.")
-        output_lines.append("Provides complete database structure: labels, relationships, counts, and schema visualization.")
+        output_lines.append("Provides complete database structure: labels, relationships, properties, counts, indexes, constraints, and schema visualization.")
         output_lines.append("Compatible with all Neo4j versions and deployments.")
 
         schema_text = "\n".join(output_lines)
@@ -141,13 +314,142 @@ async def get_neo4j_schema(connection_manager: Neo4jConnectionManager) -> list[T
         )]
 
 
+def _format_diff(previous: Dict[str, Any], snapshot: Dict[str, Any]) -> str:
+    """Render the changes between two schema snapshots."""
+    output_lines = []
+    output_lines.append("# Neo4j Schema Changes")
+    output_lines.append("")
+    output_lines.append(
+        f"**Schema hash:** `{snapshot['hash']}` (version {snapshot['version']}), "
+        f"changes since `{previous['hash']}` (version {previous['version']})"
+    )
+
+    changes = diff_schemas(previous["schema"], snapshot["schema"])
+    if not any(section not in COUNT_SECTIONS for section in changes):
+        output_lines.append("")
+        output_lines.append("No changes to labels, relationship types, properties, indexes or constraints.")
+        if not changes:
+            output_lines.append("Counts are not part of the hash; call without `since` for current counts.")
+
+    # Count changes are listed after the structural ones; they do not change the hash
+    for section, title in DIFF_TITLES.items():
+        if section not in changes:
+            continue
+        key_field = DIFF_SECTIONS[section]
+        output_lines.append("")
+        output_lines.append(f"## {title}")
+        output_lines.append("")
+        for entry in changes[section]["added"]:
+            output_lines.append(f"- added **{entry.get(key_field)}**{_entry_detail(entry)}")
+        for entry in changes[section]["removed"]:
+            output_lines.append(f"- removed **{entry.get(key_field)}**")
+        for change in changes[section]["changed"]:
+            details = [_change_detail(field, value) for field, value in change.items() if field != key_field]
+            output_lines.append(f"- changed **{change[key_field]}**: {'; '.join(details)}")
+
+    return "\n".join(output_lines)
+
+
+def _entry_detail(entry: Dict[str, Any]) -> str:
+    if "name" in entry:
+        return f": {_describe_index(entry)}"
+    if "count" in entry:
+        return f": {entry['count']:,}"
+    if entry.get("properties"):
+        return ": " + ", ".join(_format_property(prop) for prop in entry["properties"])
+    return ""
+
+
+def _change_detail(field: str, value: Dict[str, Any]) -> str:
+    if "before" not in value:
+        parts: List[str] = []
+        parts.extend(f"added property {_format_property(prop)}" for prop in value["added"])
+        parts.extend(f"removed property {prop.get('property')}" for prop in value["removed"])
+        for change in value["changed"]:
+            fields = [_change_detail(key, before_after) for key, before_after in change.items() if key != "property"]
+            parts.append(f"property {change['property']} {', '.join(fields)}")
+        return ", ".join(parts)
+
+    before, after = value["before"], value["after"]
+    if field == "count":
+        return f"{before or 0:,} -> {after or 0:,}"
+    if isinstance(before, list) or isinstance(after, list):
+        before, after = "/".join(before or []) or "none", "/".join(after or []) or "none"
+    return f"{field} {before} -> {after}"
+
+
+def _describe_index(entry: Dict[str, Any]) -> str:
+    if not entry.get("labelsOrTypes"):
+        # Legacy constraint listings only have a description; token lookup indexes have no labels
+        return entry.get("description") or f"{entry.get('type') or 'index'} on {(entry.get('entityType') or 'all').lower()} tokens"
+    names = "|".join(entry["labelsOrTypes"])
+    pattern = f"(:{names})" if entry.get("entityType") != "RELATIONSHIP" else f"[:{names}]"
+    return f"{entry.get('type') or 'index'} on {pattern}({', '.join(entry.get('properties') or [])})"
+
+
+def _index_usage(index: Dict[str, Any]) -> str:
+    details = []
+    if index.get("state"):
+        state = index["state"]
+        if index.get("populationPercent") is not None and state != "ONLINE":
+            state += f" {index['populationPercent']:.0f}%"
+        details.append(state)
+    if index.get("readCount") is not None:
+        details.append(f"{index['readCount']:,} reads")
+    if index.get("lastRead"):
+        details.append(f"last read {index['lastRead']}")
+    return f" ({', '.join(details)})" if details else ""
+
+
+def _format_property(prop: Dict[str, Any]) -> str:
+    types = ", ".join(prop.get("types") or []) or "unknown"
+    mandatory = " (mandatory)" if prop.get("mandatory") else ""
+    return f"{prop.get('property', 'unknown')}: {types}{mandatory}"
+
+
 # Tool definition for MCP
 SCHEMA_TOOL = Tool(
     name="get_neo4j_schema",
-    description="Get Neo4j database schema using plain Cypher queries only (no APOC required). Lists node labels, relationship types, counts, and basic structure. Works with any Neo4j database.",
+    description="Get Neo4j database schema using plain Cypher queries only (no APOC required). Lists node labels, relationship types with their property names and types, counts, indexes and constraints with usage, and basic structure; flags unindexed predicates in recent queries and unused indexes. Works with any Neo4j database.",
     inputSchema={
         "type": "object",
-        "properties": {},
+        "properties": {
+            "since": {
+                "type": "string",
+                "description": "Schema hash from an earlier get_neo4j_schema call; returns only the labels, types, properties, indexes and constraints that changed since then, with any count changes listed separately. Ignored when filters, sections or paging are given"
+            },
+            "label_prefix": {
+                "type": "string",
+                "description": "Only include node labels starting with this prefix"
+            },
+            "label_regex": {
+                "type": "string",
+                "description": "Only include node labels fully matching this regular expression (Cypher =~)"
+            },
+            "type_prefix": {
+                "type": "string",
+                "description": "Only include relationship types starting with this prefix"
+            },
+            "type_regex": {
+                "type": "string",
+                "description": "Only include relationship types fully matching this regular expression (Cypher =~)"
+            },
+            "sections": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(SCHEMA_SECTIONS)},
+                "description": "Sections to include; defaults to nodes, relationships, counts and properties when filtering or paging. 'properties' lists labels and types with their properties; 'indexes' adds indexes, constraints and the index advisor"
+            },
+            "page": {
+                "type": "integer",
+                "description": "1-based page of labels and relationship types",
+                "minimum": 1
+            },
+            "page_size": {
+                "type": "integer",
+                "description": f"Labels and relationship types per page (default: {SCHEMA_PAGE_SIZE})",
+                "minimum": 1
+            }
+        },
         "required": []
     }
 )
\ No newline at end of file
@@ -1,12 +1,12 @@
 """Neo4j write query execution tool."""
 
-import json
 import logging
 from typing import Any, Dict, Optional
 
 from mcp.types import Tool, TextContent
 
 from ..connection import Neo4jConnectionManager
+from ..serialization import dumps
 
 
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ async def write_neo4j_cypher(
         output_lines.append(f"**Query:** `{query}`")
 
         if params:
-            output_lines.append(f"**Parameters:** `{json.dumps(params, indent=2)}`")
+            output_lines.append(f"**Parameters:** `{dumps(params, connection_manager.config.compact_json)}`")
 
         output_lines.append("")
         output_lines.append("## Execution Statistics")
@@ -1,18 +1,50 @@
 """Comprehensive tests for Neo4j MCP Server."""
 
 import asyncio
+import datetime
+import time
 import pytest
 import json
-from unittest.mock import Mock, AsyncMock, patch
+import re
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
 from typing import Dict, Any, List
 
-from neo4j.exceptions import ServiceUnavailable, AuthError
+import mcp.types as types
+from neo4j import READ_ACCESS, Record
+from neo4j.graph import Graph, Node, Path
+from neo4j.time import Date, DateTime
+from neo4j.exceptions import (
+    ServiceUnavailable, AuthError, ClientError, ConnectionAcquisitionTimeoutError, TransientError, SessionExpired
+)
 
 from neo4j_mcp.config import Neo4jConfig
+from neo4j_mcp.discovery import HostDiscoveryCache, host_discovery_cache
 from neo4j_mcp.connection import Neo4jConnectionManager
 from neo4j_mcp.tools.schema import get_neo4j_schema
 from neo4j_mcp.tools.read import read_neo4j_cypher
 from neo4j_mcp.tools.write import write_neo4j_cypher
+from neo4j_mcp.server import Neo4jMCPServer
+from neo4j_mcp.scheduler import ToolScheduler, ToolQueueFullError
+from neo4j_mcp.cursors import CursorNotFoundError
+from neo4j_mcp.encoding import ColumnarResultEncoder, GraphResultEncoder
+from neo4j_mcp import serialization
+from neo4j_mcp.summaries import DistinctSketch, ResultSummarizer
+from neo4j_mcp.spill import SpillStore, SpillNotFoundError
+from neo4j_mcp.result_cache import ReadResultCache, query_scope, write_scope
+from neo4j_mcp.singleflight import SingleFlight
+from neo4j_mcp import schema_cache
+from neo4j_mcp.schema_properties import property_type
+from neo4j_mcp.schema_diff import diff_schemas, schema_hash
+from neo4j_mcp.schema_view import SchemaView
+from neo4j_mcp.index_advisor import QueryLog, advise, normalize_index, query_predicates
+
+
+@pytest.fixture(autouse=True)
+def clear_host_discovery_cache():
+    """Keep cached WSL discovery results from leaking between tests."""
+    host_discovery_cache.clear()
+    yield
+    host_discovery_cache.clear()
 
 
 class TestNeo4jConfig:
@@ -114,6 +146,7 @@ class TestNeo4jConnectionManager:
     async def test_connect_success(self, connection_manager):
         """Test successful connection."""
         mock_driver = AsyncMock()
+        mock_driver.session = MagicMock()
         mock_session = AsyncMock()
         mock_result = AsyncMock()
         mock_record = Mock()
@@ -123,14 +156,14 @@ class TestNeo4jConnectionManager:
         mock_session.run.return_value = mock_result
         mock_driver.session.return_value.__aenter__.return_value = mock_session
 
-        with patch('neo4j_mcp.connection.GraphDatabase.driver', return_value=mock_driver):
+        with patch('neo4j_mcp.connection.AsyncGraphDatabase.driver', return_value=mock_driver):
             driver = await connection_manager.connect()
             assert driver == mock_driver
 
     @pytest.mark.asyncio
     async def test_connect_failure_all_uris(self, connection_manager):
         """Test connection failure for all URIs."""
-        with patch('neo4j_mcp.connection.GraphDatabase.driver') as mock_driver_func:
+        with patch('neo4j_mcp.connection.AsyncGraphDatabase.driver') as mock_driver_func:
             mock_driver_func.side_effect = ServiceUnavailable("Connection failed")
 
             with pytest.raises(ServiceUnavailable):
@@ -143,12 +176,18 @@ class TestNeo4jConnectionManager:
         mock_result = AsyncMock()
 
         # Mock async iteration
-        async def async_iter():
-            yield {"name": "Alice", "age": 30}
-            yield {"name": "Bob", "age": 25}
+        mock_result.__aiter__.return_value = [
+            {"name": "Alice", "age": 30},
+            {"name": "Bob", "age": 25}
+        ]
+        mock_tx = AsyncMock()
+        mock_tx.run.return_value = mock_result
 
-        mock_result.__aiter__ = async_iter
-        mock_session.run.return_value = mock_result
+        async def execute_read(transaction_function, *args):
+            return await transaction_function(mock_tx, *args)
+
+        mock_session.execute_read.side_effect = execute_read
+        connection_manager.driver = AsyncMock()
 
         with patch.object(connection_manager, 'get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = mock_session
@@ -173,7 +212,10 @@ class TestNeo4jConnectionManager:
         mock_summary.result_consumed_after = 15
 
         mock_result.consume.return_value = mock_summary
-        mock_session.run.return_value = mock_result
+        mock_tx = AsyncMock()
+        mock_tx.run.return_value = mock_result
+        mock_session.begin_transaction.return_value.__aenter__.return_value = mock_tx
+        connection_manager.driver = AsyncMock()
 
         with patch.object(connection_manager, 'get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = mock_session
@@ -183,6 +225,7 @@ class TestNeo4jConnectionManager:
             assert summary["counters"]["nodes_created"] == 1
             assert summary["counters"]["properties_set"] == 2
             assert summary["result_available_after"] == 10
+            mock_tx.commit.assert_awaited_once()
 
 
 class TestNeo4jTools:
@@ -216,12 +259,15 @@ class TestNeo4jTools:
             ]
         }
 
-        mock_connection_manager.get_schema_info.return_value = mock_schema_info
+        mock_connection_manager.get_schema_snapshot.return_value = {
+            "version": 1, "fetched_at": time.time(), "schema": mock_schema_info
+        }
 
         results = await get_neo4j_schema(mock_connection_manager)
 
         assert len(results) == 1
         assert results[0].type == "text"
+        assert "Schema version:** 1" in results[0].text
         assert "Person" in results[0].text
         assert "KNOWS" in results[0].text
 
@@ -342,6 +388,7 @@ class TestCrossPlatformConnectivity:
             else:
                 # Second URI succeeds
                 mock_driver = AsyncMock()
+                mock_driver.session = MagicMock()
                 mock_session = AsyncMock()
                 mock_result = AsyncMock()
                 mock_record = Mock()
@@ -355,12 +402,2119 @@ class TestCrossPlatformConnectivity:
             "neo4j://127.0.0.1:7687",
             "neo4j://172.19.0.1:7687"
         ]), \
-             patch('neo4j_mcp.connection.GraphDatabase.driver', side_effect=mock_driver_side_effect):
+             patch('neo4j_mcp.connection.AsyncGraphDatabase.driver', side_effect=mock_driver_side_effect):
 
             driver = await connection_manager.connect()
             assert driver is not None
             assert call_count == 2  # Should have tried both URIs
 
 
+class _SlowAsyncResult:
+    """Async result stub that yields its rows after a delay."""
+
+    def __init__(self, rows, delay):
+        self.rows = rows
+        self.delay = delay
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.delay)
+        for row in self.rows:
+            yield row
+
+
+class _SlowAsyncSession:
+    """Async session stub that records how many queries run at once."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None):
+        self.driver.in_flight += 1
+        self.driver.max_in_flight = max(self.driver.max_in_flight, self.driver.in_flight)
+        try:
+            await asyncio.sleep(self.driver.delay)
+        finally:
+            self.driver.in_flight -= 1
+        return _SlowAsyncResult([{"value": 1}], 0)
+
+    async def execute_read(self, transaction_function, *args, **kwargs):
+        self.driver.transactions.append("read")
+        return await transaction_function(self, *args, **kwargs)
+
+    async def execute_write(self, transaction_function, *args, **kwargs):
+        self.driver.transactions.append("write")
+        return await transaction_function(self, *args, **kwargs)
+
+
+class _SlowAsyncDriver:
+    """AsyncDriver stub whose sessions take ``delay`` seconds per query."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sessions = []
+        self.transactions = []
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return _SlowAsyncSession(self)
+
+    async def close(self):
+        pass
+
+
+async def _call_tool(server, name, arguments):
+    """Invoke the registered MCP call_tool handler like the stdio loop does."""
+    handler = server.server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments),
+    )
+    return await handler(request)
+
+
+class TestConcurrentToolCalls:
+    """Test that tool calls do not block the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_read_calls_overlap(self):
+        """Several read_neo4j_cypher calls should run concurrently."""
+        server = Neo4jMCPServer()
+        driver = _SlowAsyncDriver(delay=0.2)
+        server.connection_manager.driver = driver
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*[
+            _call_tool(server, "read_neo4j_cypher", {"query": f"RETURN {i} AS value"})
+            for i in range(3)
+        ])
+        elapsed = loop.time() - started
+
+        assert driver.max_in_flight == 3
+        assert elapsed < 0.5
+        for result in results:
+            assert "Records returned" in result.root.content[0].text
+
+
+class TestToolScheduler:
+    """Test per-tool-class concurrency limits."""
+
+    @pytest.mark.asyncio
+    async def test_slow_writes_do_not_block_reads(self):
+        """A busy write class should not delay read calls."""
+        scheduler = ToolScheduler({"read": 2, "write": 1}, max_queued=4)
+        write_started = asyncio.Event()
+        release_write = asyncio.Event()
+
+        async def slow_write():
+            async with scheduler.slot("write"):
+                write_started.set()
+                await release_write.wait()
+
+        write_task = asyncio.create_task(slow_write())
+        await write_started.wait()
+
+        async def read():
+            async with scheduler.slot("read"):
+                await asyncio.sleep(0)
+
+        await asyncio.wait_for(asyncio.gather(read(), read(), read()), timeout=1)
+        release_write.set()
+        await write_task
+
+        stats = scheduler.get_stats()
+        assert stats["read"]["completed"] == 3
+        assert stats["write"]["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejects(self):
+        """Calls beyond the wait queue bound are rejected."""
+        scheduler = ToolScheduler({"write": 1}, max_queued=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("write"):
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ToolQueueFullError):
+            async with scheduler.slot("write"):
+                pass
+
+        stats = scheduler.get_stats()["write"]
+        assert stats["active"] == 1
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+
+    @pytest.mark.asyncio
+    async def test_status_reports_scheduler_stats(self):
+        """neo4j_configure status shows the scheduler section."""
+        server = Neo4jMCPServer()
+        result = await _call_tool(server, "neo4j_configure", {"action": "status"})
+        text = result.root.content[0].text
+        assert "## Tool Scheduler" in text
+        assert "**read**" in text
+
+
+class _ProbeResult:
+    """Result stub for the ``RETURN 1 as test`` connectivity check."""
+
+    async def single(self):
+        return {"test": 1}
+
+
+class _ProbeSession:
+    """Session stub whose connectivity check takes ``delay`` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None):
+        await asyncio.sleep(self.delay)
+        return _ProbeResult()
+
+
+class _ProbeDriver:
+    """AsyncDriver stub used to simulate slow or dead URIs."""
+
+    def __init__(self, uri, delay):
+        self.uri = uri
+        self.delay = delay
+        self.closed = False
+
+    def session(self, **kwargs):
+        return _ProbeSession(self.delay)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestConcurrentUriProbing:
+    """Test parallel URI probing and the persisted winner cache."""
+
+    @pytest.mark.asyncio
+    async def test_first_healthy_uri_wins(self, tmp_path):
+        """A hanging first URI does not delay connecting to a healthy one."""
+        config = Neo4jConfig(uri="neo4j://127.0.0.1:7687", state_dir=str(tmp_path),
+                             connection_probe_stagger=0.01)
+        manager = Neo4jConnectionManager(config)
+        delays = {"neo4j://127.0.0.1:7687": 30, "neo4j://172.19.0.1:7687": 0}
+        drivers = []
+
+        def make_driver(uri, **kwargs):
+            driver = _ProbeDriver(uri, delays[uri])
+            drivers.append(driver)
+            return driver
+
+        with patch.object(Neo4jConfig, 'get_connection_uris_async', AsyncMock(return_value=list(delays))), \
+             patch('neo4j_mcp.connection.AsyncGraphDatabase.driver', side_effect=make_driver):
+            driver = await asyncio.wait_for(manager.connect(), timeout=1)
+
+        assert driver.uri == "neo4j://172.19.0.1:7687"
+        assert manager.active_uri == "neo4j://172.19.0.1:7687"
+        losers = [d for d in drivers if d is not driver]
+        assert losers and all(d.closed for d in losers)
+
+        # The winner is tried first by the next connection manager
+        next_manager = Neo4jConnectionManager(config)
+        assert next_manager._order_uris(list(delays))[0] == "neo4j://172.19.0.1:7687"
+
+    def test_cache_disabled_without_state_dir(self):
+        """Without a state dir the configured URI order is kept."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        manager._save_cached_uri("neo4j://172.19.0.1:7687")
+        uris = ["neo4j://127.0.0.1:7687", "neo4j://172.19.0.1:7687"]
+        assert manager._order_uris(uris) == uris
+
+
+class TestHostDiscoveryCache:
+    """Test cached WSL host discovery."""
+
+    def test_discovery_runs_once_per_key(self, tmp_path):
+        """Repeated URI builds reuse the cached discovery result."""
+        config = Neo4jConfig(state_dir=str(tmp_path))
+        cache = HostDiscoveryCache()
+
+        with patch('neo4j_mcp.discovery.get_discovery_key', return_value="boot-1:1"), \
+             patch.object(Neo4jConfig, 'detect_wsl_environment', return_value=True) as detect, \
+             patch.object(Neo4jConfig, 'get_windows_host_ip', return_value="172.19.0.1") as host_ip:
+            assert cache.get(config)["windows_ip"] == "172.19.0.1"
+            assert cache.get(config)["windows_ip"] == "172.19.0.1"
+            assert detect.call_count == 1
+            assert host_ip.call_count == 1
+
+            # A fresh process reads the result back from the state dir
+            assert HostDiscoveryCache().peek(config)["windows_ip"] == "172.19.0.1"
+
+        with patch('neo4j_mcp.discovery.get_discovery_key', return_value="boot-2:1"):
+            assert cache.peek(config) is None
+
+    @pytest.mark.asyncio
+    async def test_async_uris_use_cache_without_thread(self):
+        """A warm cache answers the async path without running discovery."""
+        config = Neo4jConfig(uri="neo4j://127.0.0.1:7687")
+
+        with patch('neo4j_mcp.discovery.get_discovery_key', return_value="boot-1:1"), \
+             patch.object(Neo4jConfig, 'detect_wsl_environment', return_value=True), \
+             patch.object(Neo4jConfig, 'get_windows_host_ip', return_value="172.19.0.1"):
+            uris = await config.get_connection_uris_async()
+            assert uris == ["neo4j://127.0.0.1:7687", "neo4j://172.19.0.1:7687"]
+
+            with patch('neo4j_mcp.discovery.asyncio.to_thread') as to_thread:
+                assert await config.get_connection_uris_async() == uris
+                to_thread.assert_not_called()
+
+
+class _StubConnection:
+    def __init__(self, in_use):
+        self.in_use = in_use
+
+
+class _StubPool:
+    """Pool stub exposing the attributes the pool metrics read."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.connections = {"localhost:7687": [_StubConnection(True), _StubConnection(False)]}
+
+    async def acquire(self, *args, **kwargs):
+        if self.fail:
+            raise ServiceUnavailable("pool exhausted")
+        return self.connections["localhost:7687"][0]
+
+
+class TestConnectionPool:
+    """Test pool tuning options and pool metrics."""
+
+    @patch.dict('os.environ', {
+        'NEO4J_MAX_POOL_SIZE': '20',
+        'NEO4J_ACQUISITION_TIMEOUT': '5',
+        'NEO4J_LIVENESS_CHECK_TIMEOUT': '30'
+    })
+    def test_pool_options_passed_to_driver(self):
+        """Pool settings from the environment reach the driver factory."""
+        manager = Neo4jConnectionManager(Neo4jConfig.from_env())
+        options = manager._driver_options()
+        assert options["max_connection_pool_size"] == 20
+        assert options["connection_acquisition_timeout"] == 5.0
+        assert options["max_connection_lifetime"] == 3600.0
+        assert options["liveness_check_timeout"] == 30.0
+
+    @pytest.mark.asyncio
+    async def test_pool_stats(self):
+        """Acquisitions are timed and pool usage is reported."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = Mock()
+        driver._pool = _StubPool()
+        manager._instrument_pool(driver)
+        manager.driver = driver
+
+        await driver._pool.acquire()
+        driver._pool.fail = True
+        with pytest.raises(ServiceUnavailable):
+            await driver._pool.acquire()
+
+        stats = manager.get_pool_stats()
+        assert stats["in_use"] == 1
+        assert stats["idle"] == 1
+        assert stats["acquisitions"] == 1
+        assert stats["acquisition_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_configure_pool_action(self):
+        """neo4j_configure action=pool reports pool usage."""
+        server = Neo4jMCPServer()
+        result = await _call_tool(server, "neo4j_configure", {"action": "pool"})
+        text = result.root.content[0].text
+        assert "# Neo4j Connection Pool" in text
+        assert "Not connected yet" in text
+
+
+class TestReadRouting:
+    """Test that reads are routed to read-access sessions."""
+
+    @pytest.mark.asyncio
+    async def test_read_query_uses_read_access(self):
+        """read_neo4j_cypher runs a managed read transaction on a READ session."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _SlowAsyncDriver(delay=0)
+        manager.driver = driver
+
+        results = await manager.execute_read_query("MATCH (n) RETURN n")
+
+        assert results == [{"value": 1}]
+        assert driver.sessions[0]["default_access_mode"] == READ_ACCESS
+        assert driver.transactions == ["read"]
+
+    @pytest.mark.asyncio
+    async def test_schema_uses_read_access(self):
+        """Schema introspection goes through the same read path."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _SlowAsyncDriver(delay=0)
+        manager.driver = driver
+
+        await manager.get_schema_info()
+
+        assert driver.sessions
+        assert all(session["default_access_mode"] == READ_ACCESS for session in driver.sessions)
+        assert set(driver.transactions) == {"read"}
+
+
+class _FlakyWriteSession:
+    """Session stub whose write transactions fail with queued errors first."""
+
+    def __init__(self, errors, summary, sessions):
+        self.errors = errors
+        self.summary = summary
+        self.commits = 0
+        sessions.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def begin_transaction(self):
+        return self
+
+    async def run(self, query, parameters=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        result = AsyncMock()
+        result.consume.return_value = self.summary
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+
+class TestWriteRetries:
+    """Test managed write transactions with transient-error retry."""
+
+    @pytest.fixture
+    def summary(self):
+        summary = Mock()
+        summary.counters.nodes_created = 1
+        summary.result_available_after = 1
+        summary.result_consumed_after = 2
+        return summary
+
+    def _manager(self, errors, summary, sessions, **config):
+        manager = Neo4jConnectionManager(Neo4jConfig(write_retry_initial_delay=0.001, **config))
+        manager.driver = Mock()
+        manager.driver.session = Mock(side_effect=lambda **kwargs: _FlakyWriteSession(errors, summary, sessions))
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, summary):
+        """Deadlocks and leader switches are retried and counted per error class."""
+        sessions = []
+        errors = [TransientError("deadlock"), SessionExpired("leader switch")]
+        manager = self._manager(errors, summary, sessions)
+
+        result = await manager.execute_write_query("CREATE (n:Person)")
+
+        assert result["counters"]["nodes_created"] == 1
+        assert len(sessions) == 3
+        # Each attempt is one explicit transaction, so only the successful one commits
+        assert [session.commits for session in sessions] == [0, 0, 1]
+        stats = manager.retry_stats.as_dict()
+        assert stats["retries"] == 2
+        assert stats["errors"] == {"TransientError": 1, "SessionExpired": 1}
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_exhausted(self, summary):
+        """Writes give up once the retry budget is spent."""
+        sessions = []
+        errors = [TransientError("deadlock") for _ in range(5)]
+        manager = self._manager(errors, summary, sessions, write_retry_attempts=2)
+
+        with pytest.raises(TransientError):
+            await manager.execute_write_query("CREATE (n:Person)")
+
+        assert len(sessions) == 3
+        assert manager.retry_stats.gave_up == 1
+
+    @pytest.mark.asyncio
+    async def test_non_transient_errors_are_not_retried(self, summary):
+        """Client errors such as syntax errors fail immediately."""
+        sessions = []
+        manager = self._manager([ClientError("syntax error")], summary, sessions)
+
+        with pytest.raises(ClientError):
+            await manager.execute_write_query("CREAT (n)")
+
+        assert len(sessions) == 1
+        assert manager.retry_stats.retries == 0
+
+
+class _WarmupTransaction:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        self.driver.open_transactions += 1
+        self.driver.max_open_transactions = max(self.driver.max_open_transactions, self.driver.open_transactions)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.driver.open_transactions -= 1
+        return False
+
+    async def run(self, query, parameters=None):
+        return AsyncMock()
+
+
+class _WarmupSession(_SlowAsyncSession):
+    async def begin_transaction(self):
+        return _WarmupTransaction(self.driver)
+
+
+class _WarmupDriver(_SlowAsyncDriver):
+    """Driver stub counting transactions that are open at the same time."""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.open_transactions = 0
+        self.max_open_transactions = 0
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return _WarmupSession(self)
+
+
+class TestWarmup:
+    """Test background connection warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_pooled_connections(self):
+        """Warm-up holds one transaction per requested connection at once."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _WarmupDriver()
+        manager.driver = driver
+
+        await manager.warm_up(connections=3, prefetch_schema=True)
+
+        assert driver.max_open_transactions == 3
+        assert driver.open_transactions == 0
+        assert manager.schema_cache.snapshot is not None
+
+        # The prefetched schema answers the next call without querying again
+        sessions_before = len(driver.sessions)
+        assert await manager.get_schema_info() is not None
+        assert len(driver.sessions) == sessions_before
+
+    @pytest.mark.asyncio
+    async def test_first_call_waits_for_warmup(self):
+        """A tool call made during warm-up waits for it to finish."""
+        server = Neo4jMCPServer()
+        server.config.warmup_enabled = True
+        server.connection_manager.driver = _SlowAsyncDriver(delay=0)
+        order = []
+
+        async def slow_warm_up(connections, prefetch_schema):
+            await asyncio.sleep(0.05)
+            order.append("warm-up")
+
+        with patch.object(server.connection_manager, 'warm_up', side_effect=slow_warm_up):
+            server._start_warmup()
+            await _call_tool(server, "read_neo4j_cypher", {"query": "RETURN 1 AS value"})
+            order.append("call")
+
+        assert order == ["warm-up", "call"]
+
+    @pytest.mark.asyncio
+    async def test_failed_warmup_does_not_block_calls(self):
+        """Warm-up errors are logged and tool calls still run."""
+        server = Neo4jMCPServer()
+        server.config.warmup_enabled = True
+        server.connection_manager.driver = _SlowAsyncDriver(delay=0)
+
+        with patch.object(server.connection_manager, 'warm_up', side_effect=ServiceUnavailable("down")):
+            server._start_warmup()
+            result = await _call_tool(server, "read_neo4j_cypher", {"query": "RETURN 1 AS value"})
+
+        assert "Records returned" in result.root.content[0].text
+
+
+class _DeadSession(_ProbeSession):
+    async def run(self, query, parameters=None):
+        raise ServiceUnavailable("connection refused")
+
+
+class _DeadDriver(_ProbeDriver):
+    """Driver stub for an endpoint that stopped answering."""
+
+    def session(self, **kwargs):
+        return _DeadSession(0)
+
+
+class TestHealthMonitor:
+    """Test periodic health checks and failover."""
+
+    @pytest.mark.asyncio
+    async def test_failover_after_repeated_failures(self):
+        """The active endpoint is replaced once pings fail often enough."""
+        config = Neo4jConfig(uri="neo4j://127.0.0.1:7687", health_failure_threshold=2,
+                             failover_drain_timeout=0.01, connection_probe_stagger=0)
+        manager = Neo4jConnectionManager(config)
+        old_driver = _DeadDriver("neo4j://127.0.0.1:7687", 0)
+        manager.driver = old_driver
+        manager.active_uri = "neo4j://127.0.0.1:7687"
+        uris = ["neo4j://127.0.0.1:7687", "neo4j://172.19.0.1:7687"]
+
+        def make_driver(uri, **kwargs):
+            if uri == "neo4j://127.0.0.1:7687":
+                return _DeadDriver(uri, 0)
+            return _ProbeDriver(uri, 0)
+
+        with patch.object(Neo4jConfig, 'get_connection_uris_async', AsyncMock(return_value=uris)), \
+             patch('neo4j_mcp.connection.AsyncGraphDatabase.driver', side_effect=make_driver):
+            assert await manager.health_monitor.check() is False
+            assert manager.driver is old_driver
+
+            assert await manager.health_monitor.check() is False
+            assert manager.active_uri == "neo4j://172.19.0.1:7687"
+            assert manager.failovers == 1
+
+            # The old driver is closed once its drain timeout passes
+            assert not old_driver.closed
+            await asyncio.sleep(0.05)
+            assert old_driver.closed
+
+            assert await manager.health_monitor.check() is True
+
+        health = manager.endpoint_health
+        assert health["neo4j://127.0.0.1:7687"].failures >= 2
+        assert health["neo4j://172.19.0.1:7687"].avg_latency_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_failover_keeps_driver_when_nothing_is_healthy(self):
+        """Without a healthy alternative the current driver stays in place."""
+        manager = Neo4jConnectionManager(Neo4jConfig(health_failure_threshold=1, connection_probe_stagger=0))
+        old_driver = _DeadDriver("neo4j://127.0.0.1:7687", 0)
+        manager.driver = old_driver
+        manager.active_uri = "neo4j://127.0.0.1:7687"
+
+        with patch.object(Neo4jConfig, 'get_connection_uris_async',
+                          AsyncMock(return_value=["neo4j://127.0.0.1:7687", "neo4j://172.19.0.1:7687"])), \
+             patch('neo4j_mcp.connection.AsyncGraphDatabase.driver',
+                   side_effect=lambda uri, **kwargs: _DeadDriver(uri, 0)):
+            assert await manager.health_monitor.check() is False
+
+        assert manager.driver is old_driver
+        assert manager.failovers == 0
+
+    @pytest.mark.asyncio
+    async def test_single_uri_is_not_failed_over_to_itself(self):
+        """With one configured URI there is nothing to switch to, so the warm driver is kept unprobed."""
+        manager = Neo4jConnectionManager(Neo4jConfig(health_failure_threshold=1))
+        old_driver = _DeadDriver("neo4j://127.0.0.1:7687", 0)
+        manager.driver = old_driver
+        manager.active_uri = "neo4j://127.0.0.1:7687"
+
+        make_driver = Mock(side_effect=lambda uri, **kwargs: _ProbeDriver(uri, 0))
+        with patch.object(Neo4jConfig, 'get_connection_uris_async',
+                          AsyncMock(return_value=["neo4j://127.0.0.1:7687"])), \
+             patch('neo4j_mcp.connection.AsyncGraphDatabase.driver', make_driver):
+            assert await manager.health_monitor.check() is False
+
+        make_driver.assert_not_called()
+        assert manager.driver is old_driver and manager.failovers == 0
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_is_not_an_endpoint_failure(self):
+        """A ping that cannot get a pooled connection is skipped, not counted as a failure."""
+        manager = Neo4jConnectionManager(Neo4jConfig(health_failure_threshold=1, max_connection_pool_size=2,
+                                                     health_check_timeout=0.05))
+        driver = _DeadDriver("neo4j://127.0.0.1:7687", 0)
+        driver._pool = Mock(connections={"127.0.0.1:7687": [Mock(in_use=True), Mock(in_use=True)]})
+        manager.driver = driver
+        manager.active_uri = "neo4j://127.0.0.1:7687"
+
+        with patch.object(Neo4jConnectionManager, "failover", AsyncMock()) as failover:
+            assert await manager.health_monitor.check() is True
+            driver._pool.connections["127.0.0.1:7687"][0].in_use = False
+            with patch.object(Neo4jConnectionManager, "_test_connection",
+                              AsyncMock(side_effect=ConnectionAcquisitionTimeoutError("pool full"))):
+                assert await manager.health_monitor.check() is True
+
+        failover.assert_not_called()
+        assert manager.get_endpoint_health("neo4j://127.0.0.1:7687").failures == 0
+
+
+class _CountingResult:
+    """Result stub that generates rows lazily and counts how many were pulled."""
+
+    def __init__(self, total):
+        self.total = total
+        self.pulled = 0
+
+    async def __aiter__(self):
+        for i in range(self.total):
+            self.pulled += 1
+            yield {"i": i}
+
+
+class _CountingSession(_SlowAsyncSession):
+    async def run(self, query, parameters=None):
+        return self.driver.result
+
+
+class _CountingDriver(_SlowAsyncDriver):
+    def __init__(self, total):
+        super().__init__(delay=0)
+        self.result = _CountingResult(total)
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return _CountingSession(self)
+
+
+class TestStreamingReads:
+    """Test bounded streaming reads."""
+
+    @pytest.mark.asyncio
+    async def test_limit_stops_consuming(self):
+        """Only ``limit`` records are pulled from a huge result."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _CountingDriver(total=1_000_000)
+        manager.driver = driver
+
+        results = await manager.execute_read_query("MATCH (n) RETURN n", limit=101)
+
+        assert len(results) == 101
+        assert driver.result.pulled == 101
+        assert driver.sessions[0]["fetch_size"] == 101
+
+    @pytest.mark.asyncio
+    async def test_read_tool_reports_more_rows(self):
+        """The read tool says 'more than N' instead of counting every row."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _CountingDriver(total=1_000_000)
+        manager.driver = driver
+
+        results = await read_neo4j_cypher(manager, "MATCH (n) RETURN n", max_records=100)
+
+        text = results[0].text
+        assert "more than 100" in text
+        assert "Showing first 100 of more than 100 records" in text
+        assert "Column Summary (first 100 records; reading stopped there)" in text
+        assert driver.result.pulled == 101
+
+    @pytest.mark.asyncio
+    async def test_read_tool_small_result(self):
+        """Results within the cap are shown in full."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        manager.driver = _CountingDriver(total=3)
+
+        results = await read_neo4j_cypher(manager, "MATCH (n) RETURN n", max_records=100)
+
+        assert "**Records returned:** 3" in results[0].text
+
+
+class _PagedResult:
+    """AsyncResult stub supporting fetch() and peek()."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    async def fetch(self, n):
+        page, self.rows = self.rows[:n], self.rows[n:]
+        return page
+
+    async def peek(self):
+        return self.rows[0] if self.rows else None
+
+
+class _PagedTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, query, parameters=None):
+        return _PagedResult({"i": i} for i in range(self.session.driver.total))
+
+    async def close(self):
+        self.session.tx_closed = True
+
+
+class _PagedSession:
+    def __init__(self, driver):
+        self.driver = driver
+        self.tx_closed = False
+        self.closed = False
+
+    async def begin_transaction(self):
+        return _PagedTransaction(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class _PagedDriver:
+    """Driver stub whose sessions serve paged results of ``total`` rows."""
+
+    def __init__(self, total):
+        self.total = total
+        self.sessions = []
+
+    def session(self, **kwargs):
+        session = _PagedSession(self)
+        self.sessions.append(session)
+        return session
+
+
+class TestPaginatedReads:
+    """Test cursor-based pagination of read results."""
+
+    @pytest.mark.asyncio
+    async def test_walk_pages_with_cursor(self):
+        """Pages continue where the previous one stopped until exhausted."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        manager.driver = _PagedDriver(total=5)
+
+        records, token, page = await manager.open_read_cursor("MATCH (n) RETURN n", {}, 2)
+        assert [r["i"] for r in records] == [0, 1] and token and page == 1
+
+        records, token, page = await manager.fetch_read_cursor(token, 2)
+        assert [r["i"] for r in records] == [2, 3] and token and page == 2
+
+        records, last_token, page = await manager.fetch_read_cursor(token, 2)
+        assert [r["i"] for r in records] == [4] and last_token is None and page == 3
+
+        # The exhausted cursor has released its transaction and session
+        session = manager.driver.sessions[0]
+        assert session.tx_closed and session.closed
+        with pytest.raises(CursorNotFoundError):
+            await manager.fetch_read_cursor(token, 2)
+
+    @pytest.mark.asyncio
+    async def test_cursor_table_is_bounded(self):
+        """Opening more cursors than allowed evicts the oldest one."""
+        manager = Neo4jConnectionManager(Neo4jConfig(max_open_cursors=2))
+        manager.driver = _PagedDriver(total=10)
+
+        tokens = []
+        for _ in range(3):
+            _, token, _ = await manager.open_read_cursor("MATCH (n) RETURN n", {}, 1)
+            tokens.append(token)
+
+        assert len(manager.cursors) == 2
+        assert manager.driver.sessions[0].closed
+        with pytest.raises(CursorNotFoundError):
+            await manager.fetch_read_cursor(tokens[0], 1)
+
+    @pytest.mark.asyncio
+    async def test_idle_cursors_expire(self):
+        """Cursors idle for longer than the TTL are closed."""
+        manager = Neo4jConnectionManager(Neo4jConfig(cursor_ttl=0))
+        manager.driver = _PagedDriver(total=10)
+
+        _, token, _ = await manager.open_read_cursor("MATCH (n) RETURN n", {}, 1)
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(CursorNotFoundError):
+            await manager.fetch_read_cursor(token, 1)
+        assert manager.cursors.get_stats()["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_cursors_expire_without_another_call(self):
+        """The background sweep closes idle cursors even when no further page is requested."""
+        manager = Neo4jConnectionManager(Neo4jConfig(cursor_ttl=0.05))
+        manager.driver = _PagedDriver(total=10)
+
+        await manager.open_read_cursor("MATCH (n) RETURN n", {}, 1)
+        await asyncio.sleep(0.3)
+
+        session = manager.driver.sessions[0]
+        assert session.tx_closed and session.closed
+        assert len(manager.cursors) == 0 and manager.cursors.get_stats()["expired"] == 1
+        await manager.cursors.close_all()
+
+    @pytest.mark.asyncio
+    async def test_read_tool_pages(self):
+        """read_neo4j_cypher returns a cursor and accepts it on the next call."""
+        server = Neo4jMCPServer()
+        server.connection_manager.driver = _PagedDriver(total=3)
+
+        first = await _call_tool(server, "read_neo4j_cypher", {"query": "MATCH (n) RETURN n", "page_size": 2})
+        text = first.root.content[0].text
+        assert "page 1" in text
+        token = text.split('cursor: \"')[1].split('\"')[0]
+
+        second = await _call_tool(server, "read_neo4j_cypher", {"cursor": token})
+        text = second.root.content[0].text
+        assert "page 2" in text
+        assert "Last page" in text
+
+
+def _path_graph(path_count):
+    """Build ``path_count`` paths that all run through the same hub node."""
+    graph = Graph()
+    hub = Node(graph, "4:db:0", 0, ["Hub"], {"name": "hub", "blob": "x" * 1000})
+    knows = graph.relationship_type("KNOWS")
+    paths = []
+    for i in range(1, path_count + 1):
+        leaf = Node(graph, f"4:db:{i}", i, ["Leaf"], {"name": f"leaf{i}"})
+        rel = knows(graph, f"5:db:{i}", i, {"weight": i})
+        rel._start_node = hub
+        rel._end_node = leaf
+        paths.append(Path(hub, rel))
+    return hub, paths
+
+
+class TestGraphEncoding:
+    """Test the deduplicated graph result encoding."""
+
+    def test_hub_node_stored_once(self):
+        """A node shared by every path appears once in the node table."""
+        hub, paths = _path_graph(50)
+        encoder = GraphResultEncoder()
+        rows = [encoder.encode_record(Record({"p": path})) for path in paths]
+        payload = encoder.encode_result(rows)
+
+        assert len(payload["nodes"]) == 51
+        assert len(payload["relationships"]) == 50
+        assert [n for n in payload["nodes"] if n["id"] == hub.element_id][0]["labels"] == ["Hub"]
+        assert rows[0]["p"] == {"path_ref": {"nodes": ["4:db:0", "4:db:1"], "relationships": ["5:db:1"]}}
+
+        default = [Neo4jConnectionManager(Neo4jConfig())._convert_record(Record({"p": path})) for path in paths]
+        assert len(json.dumps(payload)) * 2 < len(json.dumps(default))
+
+    def test_tables_limited_to_shown_rows(self):
+        """Only entities referenced by the displayed rows are included."""
+        _, paths = _path_graph(20)
+        encoder = GraphResultEncoder()
+        rows = [encoder.encode_record(Record({"p": path})) for path in paths]
+
+        payload = encoder.encode_result(rows[:2])
+        assert {n["id"] for n in payload["nodes"]} == {"4:db:0", "4:db:1", "4:db:2"}
+        assert len(payload["relationships"]) == 2
+
+    def test_deep_nesting_is_iterative(self):
+        """Deeply nested lists do not hit the recursion limit."""
+        value = "leaf"
+        for _ in range(5000):
+            value = [value]
+        encoder = GraphResultEncoder()
+        row = encoder.encode_record(Record({"v": value, "m": {"a": 1, "b": [2, 3]}}))
+
+        depth, item = 0, row["v"]
+        while isinstance(item, list):
+            depth, item = depth + 1, item[0]
+        assert depth == 5000 and item == "leaf"
+        assert row["m"] == {"a": 1, "b": [2, 3]}
+
+
+class _RecordsResult:
+    def __init__(self, records):
+        self.records = records
+
+    async def __aiter__(self):
+        for record in self.records:
+            yield record
+
+
+class TestColumnarFormats:
+    """Test the columnar and NDJSON read result formats."""
+
+    def _wide_records(self, count):
+        return [
+            Record({"customer_identifier": i, "customer_display_name": f"name-{i}", "lifetime_order_total": i * 1.5})
+            for i in range(count)
+        ]
+
+    def test_encoder_uses_values(self):
+        """Rows are value arrays and the column names are kept once."""
+        encoder = ColumnarResultEncoder(Neo4jConnectionManager(Neo4jConfig())._convert_neo4j_value)
+        rows = [encoder.encode_record(record) for record in self._wide_records(3)]
+
+        assert rows[1] == [1, "name-1", 1.5]
+        assert encoder.encode_result(rows)["columns"] == [
+            "customer_identifier", "customer_display_name", "lifetime_order_total"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_columnar_is_smaller_than_json(self):
+        """The columnar rendering of a wide result is much smaller than pretty JSON."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _CountingDriver(total=0)
+        driver.result = _RecordsResult(self._wide_records(50))
+        manager.driver = driver
+
+        pretty = (await read_neo4j_cypher(manager, "MATCH (c) RETURN c", max_records=100))[0].text
+        columnar = (await read_neo4j_cypher(manager, "MATCH (c) RETURN c", max_records=100,
+                                            output_format="columnar"))[0].text
+
+        block = columnar.split("```json\n", 1)[1].rsplit("\n```", 1)[0]
+        payload = json.loads(block)
+        assert payload["columns"][0] == "customer_identifier"
+        assert payload["rows"][49] == [49, "name-49", 73.5]
+        assert len(columnar) * 2 < len(pretty)
+
+    @pytest.mark.asyncio
+    async def test_ndjson_one_object_per_line(self):
+        """NDJSON output has one compact object per row."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        driver = _CountingDriver(total=0)
+        driver.result = _RecordsResult(self._wide_records(3))
+        manager.driver = driver
+
+        text = (await read_neo4j_cypher(manager, "MATCH (c) RETURN c", output_format="ndjson"))[0].text
+
+        lines = text.split("```ndjson\n", 1)[1].rsplit("\n```", 1)[0].splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[2]) == {
+            "customer_identifier": 2, "customer_display_name": "name-2", "lifetime_order_total": 3.0
+        }
+        assert " " not in lines[0]
+
+
+class TestSerialization:
+    """Test the tool output serializer."""
+
+    def _neo4j_values(self):
+        from neo4j.spatial import CartesianPoint
+        from neo4j.time import Date, DateTime, Duration
+        return {
+            "born": Date(1990, 5, 17),
+            "seen": DateTime(2024, 1, 2, 3, 4, 5),
+            "tenure": Duration(months=2, days=3),
+            "home": CartesianPoint((1.5, 2.5)),
+        }
+
+    @pytest.mark.parametrize("backend", ["orjson", "json"])
+    def test_neo4j_types_encoded_natively(self, backend):
+        """Temporal, duration and spatial values get the same encoding on both backends."""
+        orjson_module = serialization.orjson if backend == "orjson" else None
+        with patch.object(serialization, "orjson", orjson_module):
+            decoded = json.loads(serialization.dumps(self._neo4j_values()))
+
+        assert decoded == {
+            "born": "1990-05-17",
+            "seen": "2024-01-02T03:04:05.000000000",
+            "tenure": "P2M3D",
+            "home": {"srid": 7203, "x": 1.5, "y": 2.5},
+        }
+
+    def test_compact_output(self):
+        """Compact output has no indentation or separator padding."""
+        text = serialization.dumps({"a": [1, 2], "b": "x"}, compact=True)
+        assert text == '{"a":[1,2],"b":"x"}'
+        assert "\n  " in serialization.dumps({"a": [1, 2]})
+
+    def test_oversized_int_falls_back(self):
+        """Values orjson rejects are serialized by the stdlib instead."""
+        assert json.loads(serialization.dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+
+class TestOutputBudget:
+    """Test budget-driven truncation and column summaries."""
+
+    def _manager(self, records, **config):
+        manager = Neo4jConnectionManager(Neo4jConfig(**config))
+        driver = _CountingDriver(total=0)
+        driver.result = _RecordsResult(records)
+        manager.driver = driver
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_large_rows_cut_to_budget(self):
+        """A few huge rows are truncated to the byte budget."""
+        records = [Record({"id": i, "text": "x" * 5000}) for i in range(10)]
+        manager = self._manager(records, read_output_budget=12000)
+
+        text = (await read_neo4j_cypher(manager, "MATCH (n) RETURN n"))[0].text
+
+        block = text.split("```json\n", 1)[1].split("\n```", 1)[0]
+        assert len(json.loads(block)) == 2
+        assert "Showing first 2 of 10 records" in text
+        assert "| text | 10 | 0.00 |" in text
+
+    @pytest.mark.asyncio
+    async def test_small_rows_not_cut(self):
+        """Many tiny rows within the budget are all shown; the budget, not a record cap, decides."""
+        records = [Record({"id": i}) for i in range(500)]
+        manager = self._manager(records)
+
+        text = (await read_neo4j_cypher(manager, "MATCH (n) RETURN n"))[0].text
+
+        block = text.split("```json\n", 1)[1].split("\n```", 1)[0]
+        assert len(json.loads(block)) == 500
+        assert "**Records returned:** 500" in text and "Column Summary" not in text
+
+    @pytest.mark.asyncio
+    async def test_summaries_cover_rows_past_the_budget(self):
+        """Rows past the budget are summarized but not kept for display."""
+        records = [Record({"id": i, "text": "x" * 1000}) for i in range(300)]
+        manager = self._manager(records, read_output_budget=5000)
+        converted = []
+        original = manager._convert_record
+
+        def convert(record):
+            converted.append(record)
+            return original(record)
+
+        with patch.object(manager, "_convert_record", convert):
+            text = (await read_neo4j_cypher(manager, "MATCH (n) RETURN n"))[0].text
+
+        assert "Showing first 4 of 300 records" in text
+        assert "## Column Summary (all 300 records)" in text
+        assert "| id | 300 | 0.00 | 0 | 299 |" in text
+        assert len(converted) < 10
+
+    @pytest.mark.asyncio
+    async def test_summary_heading_stops_at_the_limit(self):
+        """The record read to detect more rows is left out of the summaries."""
+        records = [Record({"id": i, "text": "x" * 1000}) for i in range(1200)]
+        manager = self._manager(records, read_output_budget=5000)
+        limit = manager.config.read_result_limit
+
+        text = (await read_neo4j_cypher(manager, "MATCH (n) RETURN n", max_records=limit))[0].text
+
+        assert "**Records returned:** more than 1000" in text
+        assert "## Column Summary (first 1000 records; reading stopped there)" in text
+        assert "| id | 1000 | 0.00 | 0 | 999 |" in text
+
+    @pytest.mark.asyncio
+    async def test_token_budget(self):
+        """A token budget is measured at about four characters per token."""
+        records = [Record({"id": i, "text": "y" * 400}) for i in range(20)]
+        manager = self._manager(records, read_output_budget=1000, read_output_budget_unit="tokens")
+
+        text = (await read_neo4j_cypher(manager, "MATCH (n) RETURN n", output_format="ndjson"))[0].text
+
+        lines = text.split("```ndjson\n", 1)[1].split("\n```", 1)[0].splitlines()
+        assert len(lines) == 9
+        assert "(output budget: 1000 tokens)" in text
+
+    def test_column_summaries(self):
+        """Count, null ratio, min/max and distinct estimates come from one pass."""
+        summarizer = ResultSummarizer()
+        for i in range(1000):
+            summarizer.add(Record({"n": i % 50, "name": None if i % 4 == 0 else f"n{i}", "tags": [i]}))
+
+        n, name, tags = summarizer.summaries()
+        assert (n["count"], n["min"], n["max"], n["distinct_estimate"]) == (1000, 0, 49, 50)
+        assert name["null_ratio"] == 0.25
+        assert tags["min"] is None and tags["distinct_estimate"] > 0
+
+    def test_distinct_estimate_is_close(self):
+        """The sketch estimates large cardinalities within a few percent."""
+        sketch = DistinctSketch()
+        # Integers hash the same in every run; str hashes are randomized per process
+        for i in range(100_000):
+            sketch.add(i * 7919)
+        assert abs(sketch.estimate() - 100_000) < 15_000
+
+
+class TestSpillFiles:
+    """Test spilling full read results to files exposed as resources."""
+
+    def _server(self, tmp_path, records, **limits):
+        server = Neo4jMCPServer()
+        driver = _CountingDriver(total=0)
+        driver.result = _RecordsResult(records)
+        server.connection_manager.driver = driver
+        server.connection_manager.spills = SpillStore(
+            str(tmp_path), limits.get("max_file_bytes", 10 ** 9),
+            limits.get("max_total_bytes", 10 ** 9), limits.get("max_files", 20)
+        )
+        return server
+
+    async def _read_resource(self, server, uri):
+        handler = server.server.request_handlers[types.ReadResourceRequest]
+        request = types.ReadResourceRequest(method="resources/read", params=types.ReadResourceRequestParams(uri=uri))
+        return (await handler(request)).root.contents[0]
+
+    @pytest.mark.asyncio
+    async def test_full_result_spilled_and_read_in_chunks(self, tmp_path):
+        """Every record lands in the NDJSON file and chunks cover it without splitting rows."""
+        server = self._server(tmp_path, [Record({"id": i, "name": f"n{i}"}) for i in range(5000)])
+
+        result = await _call_tool(server, "read_neo4j_cypher", {"query": "MATCH (n) RETURN n", "spill": "ndjson"})
+        text = result.root.content[0].text
+        uri = text.split("**Resource:** `", 1)[1].split("`", 1)[0]
+        assert "**Records written:** 5000" in text
+        assert "Showing first 20 of 5000 records" in text
+
+        rows, offset = [], 0
+        while offset is not None:
+            chunk = await self._read_resource(server, f"{uri}?offset={offset}&length=10000")
+            assert chunk.text.endswith("\n")
+            rows.extend(json.loads(line) for line in chunk.text.splitlines())
+            offset = chunk.meta["next_offset"]
+        assert len(rows) == 5000 and rows[-1] == {"id": 4999, "name": "n4999"}
+
+        listed = await server.server.request_handlers[types.ListResourcesRequest](
+            types.ListResourcesRequest(method="resources/list")
+        )
+        assert [str(resource.uri) for resource in listed.root.resources] == [uri]
+
+    @pytest.mark.asyncio
+    async def test_csv_and_size_cap(self, tmp_path):
+        """CSV spills have a header row and stop at the per-file size cap."""
+        server = self._server(tmp_path, [Record({"id": i, "tags": ["a", i]}) for i in range(1000)],
+                              max_file_bytes=2000)
+
+        text = (await _call_tool(server, "read_neo4j_cypher",
+                                 {"query": "MATCH (n) RETURN n", "spill": "csv"})).root.content[0].text
+
+        assert "**Truncated:**" in text
+        path = next(tmp_path.glob("*.csv"))
+        lines = path.read_text().splitlines()
+        assert lines[0] == "id,tags"
+        assert lines[1] == '0,"[""a"",0]"'
+        assert len(lines) < 1000
+
+    @pytest.mark.asyncio
+    async def test_chunk_length_capped_and_cut_on_characters(self, tmp_path):
+        """Requested lengths are capped at the chunk size; long rows are split between characters."""
+        server = self._server(tmp_path, [Record({"text": "é€😀" * 2000})])
+        server.config.spill_chunk_bytes = 1000
+        result = await _call_tool(server, "read_neo4j_cypher", {"query": "MATCH (n) RETURN n", "spill": "ndjson"})
+        uri = result.root.content[0].text.split("**Resource:** `", 1)[1].split("`", 1)[0]
+
+        chunks, offset = [], 0
+        while offset is not None:
+            chunk = await self._read_resource(server, f"{uri}?offset={offset}&length=10000000000")
+            assert chunk.meta["length"] <= 1000 and "�" not in chunk.text
+            chunks.append(chunk.text)
+            offset = chunk.meta["next_offset"]
+        assert json.loads("".join(chunks)) == {"text": "é€😀" * 2000}
+
+    @pytest.mark.asyncio
+    async def test_rows_flushed_in_batches(self, tmp_path):
+        """Rows are written to disk in batches from a worker thread, not one write per row."""
+        store = SpillStore(str(tmp_path), 10 ** 9, 10 ** 9, 10)
+        writer = store.create("ndjson", lambda record: record, preview_rows=0)
+        with patch("neo4j_mcp.spill.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            for i in range(3000):
+                writer.write({"blob": "x" * 1000, "i": i})
+                if writer.needs_flush:
+                    await writer.flush()
+            await writer.flush()
+        uri = store.register(writer)
+
+        assert 1 < to_thread.call_count < 10
+        assert writer.pending_bytes == 0
+        assert store.list()[0]["size"] == writer.bytes_written
+        assert json.loads(store.read(uri, 0, 2000)[0].splitlines()[0])["i"] == 0
+
+    def test_lru_cleanup(self, tmp_path):
+        """The least recently read files are removed once the total cap is exceeded."""
+        store = SpillStore(str(tmp_path), 10 ** 6, 250, 10)
+        uris = []
+        for i in range(3):
+            writer = store.create("ndjson", lambda record: record, preview_rows=0)
+            writer.write({"blob": "x" * 100})
+            uris.append(store.register(writer))
+            if i == 1:
+                store.read(uris[0])
+
+        assert [entry["uri"] for entry in store.list()] == [uris[0], uris[2]]
+        with pytest.raises(SpillNotFoundError):
+            store.read(uris[1])
+        assert len(list(tmp_path.iterdir())) == 2
+
+
+    def test_only_own_files_are_adopted(self, tmp_path):
+        """Files the store did not name are left alone when it adopts an earlier run's files."""
+        (tmp_path / "20260102-030405-0123abcd.ndjson").write_text('{"id": 1}\n')
+        (tmp_path / "customers.csv").write_text("id\n1\n")
+        (tmp_path / "export.ndjson").write_text('{"id": 2}\n')
+
+        store = SpillStore(str(tmp_path), 10 ** 6, 1, 1)
+
+        assert store.list() == []
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["customers.csv", "export.ndjson"]
+
+
+def _write_summary(**counters):
+    names = ["nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted",
+             "properties_set", "labels_added", "labels_removed", "indexes_added", "indexes_removed",
+             "constraints_added", "constraints_removed"]
+    summary = Mock()
+    summary.counters = Mock(**{name: counters.get(name, 0) for name in names})
+    return summary
+
+
+class TestReadResultCache:
+    """Test the read result cache and its write-driven invalidation."""
+
+    def _manager(self, **config):
+        manager = Neo4jConnectionManager(Neo4jConfig(**config))
+        driver = _CountingDriver(total=0)
+        driver.result = _RecordsResult([Record({"id": 1, "name": "Ada"})])
+        manager.driver = driver
+        return manager, driver
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_hits_cache(self):
+        """Whitespace and parameter order do not defeat the cache."""
+        manager, driver = self._manager()
+
+        first = await manager.execute_read_query("MATCH (c:Customer {id:$id}) RETURN c", {"id": 1, "x": 2})
+        second = await manager.execute_read_query("MATCH  (c:Customer {id:$id})\n RETURN c", {"x": 2, "id": 1})
+        third = await manager.execute_read_query("MATCH (c:Customer {id:$id}) RETURN c", {"id": 2, "x": 2})
+
+        assert first == second == [{"id": 1, "name": "Ada"}]
+        assert len(driver.sessions) == 2
+        stats = manager.read_cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert third == first
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self):
+        """Data-changing writes drop cached results; schema-only writes do not."""
+        manager, driver = self._manager()
+        query = "MATCH (c:Customer {id:$id}) RETURN c"
+        await manager.execute_read_query(query, {"id": 1})
+
+        with patch.object(Neo4jConnectionManager, "_run_write_with_retry",
+                          AsyncMock(return_value=_write_summary(indexes_added=1))):
+            await manager.execute_write_query("CREATE INDEX FOR (c:Customer) ON (c.id)")
+        await manager.execute_read_query(query, {"id": 1})
+        assert len(driver.sessions) == 1
+
+        with patch.object(Neo4jConnectionManager, "_run_write_with_retry",
+                          AsyncMock(return_value=_write_summary(properties_set=1))):
+            await manager.execute_write_query("MATCH (c:Customer {id: 1}) SET c.name = 'Bea'")
+        await manager.execute_read_query(query, {"id": 1})
+        assert len(driver.sessions) == 2
+
+    def test_label_scoped_invalidation(self):
+        """CREATE-only writes drop only results that can see the created labels."""
+        cache = ReadResultCache(max_entries=10, ttl=60)
+        queries = {
+            "customer": "MATCH (c:Customer) RETURN c",
+            "order": "MATCH (o:Order)-[:PLACED_BY]->(c:Customer) RETURN o",
+            "product": "MATCH (p:Product) RETURN p",
+            "any": "MATCH (n) RETURN count(n)",
+        }
+        keys = {name: cache.make_key("neo4j", query, None, None) for name, query in queries.items()}
+        for name, query in queries.items():
+            cache.put(keys[name], query, [name], cache.generation)
+
+        dropped = cache.invalidate_write("CREATE (:Customer {id: $id})", {"nodes_created": 1})
+
+        assert dropped == 3
+        assert cache.get(keys["product"]) == ["product"]
+        assert cache.get(keys["customer"]) is None
+
+        cache.invalidate_write("MATCH (p:Product) DETACH DELETE p", {"nodes_deleted": 1})
+        assert cache.get(keys["product"]) is None
+
+    def test_label_expressions_are_not_scoped(self):
+        """Label expressions and dynamic labels depend on, or change, more than the names they spell."""
+        for query in (
+            "MATCH (n:Person|Customer) RETURN count(n)",
+            "MATCH (n:!Person) RETURN n",
+            "MATCH (n:%) RETURN n",
+            "MATCH (n:(A|B)&C) RETURN n",
+            "MATCH ()-[r:KNOWS|LIKES]->() RETURN r",
+        ):
+            assert query_scope(query) is None, query
+        for query in ("CREATE (n:A&B)", "CREATE (n:$($label))"):
+            assert write_scope(query) is None, query
+        assert query_scope("MATCH (c:Customer {id: $id}) RETURN c") == {"Customer"}
+
+        cache = ReadResultCache(max_entries=10, ttl=60)
+        query = "MATCH (n:Person|Customer) RETURN count(n)"
+        key = cache.make_key("neo4j", query, None, None)
+        cache.put(key, query, [1], cache.generation)
+        cache.invalidate_write("CREATE (:Customer)", {"nodes_created": 1})
+        assert cache.get(key) is None
+
+    def test_lru_and_ttl(self):
+        """Entries are evicted least recently used first and expire after the TTL."""
+        cache = ReadResultCache(max_entries=2, ttl=60)
+        for i in range(3):
+            cache.put(("k", i), "RETURN 1", [i], cache.generation)
+        assert cache.get(("k", 0)) is None and cache.get_stats()["evictions"] == 1
+
+        with patch("neo4j_mcp.result_cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.get(("k", 2)) is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_read_racing_a_write_is_not_stored(self):
+        """A result read before an invalidation is not cached afterwards."""
+        cache = ReadResultCache(max_entries=2, ttl=60)
+        generation = cache.generation
+        cache.invalidate_write("MATCH (n) SET n.x = 1", {"properties_set": 1})
+        cache.put(("k",), "MATCH (n) RETURN n", [1], generation)
+        assert cache.get(("k",)) is None
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight reads."""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_execution(self):
+        """Concurrent identical reads open one session; different params do not coalesce."""
+        manager = Neo4jConnectionManager(Neo4jConfig(read_cache_size=0))
+        driver = _SlowAsyncDriver(delay=0.1)
+        manager.driver = driver
+
+        results = await asyncio.gather(
+            *[manager.execute_read_query("RETURN $v AS value", {"v": 1}) for _ in range(5)],
+            manager.execute_read_query("RETURN $v AS value", {"v": 2}),
+        )
+
+        assert len(driver.sessions) == 2
+        assert all(result == results[0] for result in results[:5])
+        assert manager.read_flights.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_read_after_write_does_not_join_earlier_read(self):
+        """A read issued after an invalidating write runs again instead of sharing the pre-write one."""
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        release = asyncio.Event()
+        values = iter(["before", "after"])
+
+        async def run_read(self, query, parameters, limit, convert):
+            value = next(values)
+            if value == "before":
+                await release.wait()
+            return [{"value": value}]
+
+        with patch.object(Neo4jConnectionManager, "_run_read", run_read):
+            first = asyncio.create_task(manager.execute_read_query("MATCH (n:Person) RETURN count(n)"))
+            await asyncio.sleep(0)
+            manager.read_cache.invalidate_write("CREATE (:Person)", {"nodes_created": 1})
+            second = asyncio.create_task(manager.execute_read_query("MATCH (n:Person) RETURN count(n)"))
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(first, second)
+
+        assert [result[0]["value"] for result in results] == ["before", "after"]
+        assert manager.read_flights.get_stats()["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """One cancelled caller leaves the shared task running for the rest."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.run("k", work))
+        second = asyncio.create_task(flights.run("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled() and runs == 1
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancels_task(self):
+        """The shared task is cancelled when every caller has gone away, and a new call starts over."""
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(10)
+
+        caller = asyncio.create_task(flights.run("k", hang))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        async def quick():
+            return 42
+
+        assert await flights.run("k", quick) == 42
+        assert flights.get_stats()["started"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """A failing shared read raises in every waiting caller."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ServiceUnavailable("down")
+
+        results = await asyncio.gather(*[flights.run("k", fail) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, ServiceUnavailable) for result in results)
+
+
+class TestSchemaSnapshot:
+    """Test the cached schema snapshot."""
+
+    _SCHEMA = {
+        "nodes": [{"label": "Customer", "properties": []}],
+        "relationships": [{"relationshipType": "PLACED", "properties": []}],
+        "schema": [],
+        "counts": [],
+    }
+
+    def _manager(self, **config):
+        manager = Neo4jConnectionManager(Neo4jConfig(**config))
+        driver = _SlowAsyncDriver(delay=0)
+        manager.driver = driver
+        return manager, driver
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_use_snapshot(self):
+        """Only the first schema call queries the database."""
+        manager, driver = self._manager()
+
+        first = await manager.get_schema_snapshot()
+        sessions = len(driver.sessions)
+        second = await manager.get_schema_snapshot()
+
+        assert sessions > 0 and len(driver.sessions) == sessions
+        assert second is first and second["version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_schema_changing_writes_invalidate(self):
+        """Index changes and new labels invalidate; writes with known labels do not."""
+        manager, _ = self._manager()
+        cache = manager.schema_cache
+        cache.store(self._SCHEMA, cache.generation)
+
+        assert not cache.invalidate_write("CREATE (:Customer {id: 1})", {"nodes_created": 1, "labels_added": 1})
+        assert not cache.invalidate_write("MATCH (c:Customer) SET c.x = 1", {"properties_set": 1})
+        assert cache.snapshot is not None
+
+        assert cache.invalidate_write("CREATE (:Supplier)", {"nodes_created": 1, "labels_added": 1})
+        assert cache.snapshot is None
+
+        cache.store(self._SCHEMA, cache.generation)
+        with patch.object(Neo4jConnectionManager, "_run_write_with_retry",
+                          AsyncMock(return_value=_write_summary(indexes_added=1))):
+            await manager.execute_write_query("CREATE INDEX FOR (c:Customer) ON (c.id)")
+        assert cache.snapshot is None
+        assert "indexes_added" in cache.get_stats()["last_invalidation"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_restored_after_restart(self, tmp_path):
+        """A saved snapshot answers the first call of a new manager for the same database."""
+        manager, _ = self._manager(state_dir=str(tmp_path))
+        manager.schema_cache.store(self._SCHEMA, manager.schema_cache.generation)
+
+        restarted, driver = self._manager(state_dir=str(tmp_path))
+        snapshot = await restarted.get_schema_snapshot()
+        assert snapshot["schema"] == self._SCHEMA and snapshot["restored"]
+        assert driver.sessions == []
+
+        other, driver = self._manager(state_dir=str(tmp_path), database="other")
+        await other.get_schema_snapshot()
+        assert driver.sessions != []
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self):
+        """The snapshot is refreshed on the configured interval."""
+        manager, _ = self._manager(schema_refresh_interval=0.01)
+        manager.start_schema_refresh()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await manager.close()
+
+        assert manager.schema_cache.refreshes >= 2
+        # Refreshes that find the same schema keep its version
+        assert manager.schema_cache.snapshot["version"] == 1
+
+
+
+class TestSchemaCounts:
+    """Test count-store based schema counts."""
+
+    @staticmethod
+    def _fake_read(labels, types, queries):
+        async def read(self, query, parameters=None, limit=None, convert=None, cache=True):
+            queries.append((query, parameters))
+            if "db.labels()" in query:
+                return [{"label": label, "properties": []} for label in labels]
+            if "db.relationshipTypes()" in query:
+                return [{"relationshipType": rel_type, "properties": []} for rel_type in types]
+            if "WITH count(r) AS count" in query:
+                return [{"relationshipType": name, "count": 7} for name in parameters.values()]
+            if "WITH count(n) AS count" in query:
+                return [{"label": name, "count": 3} for name in parameters.values()]
+            if "labels(n)" in query:
+                return [{"labels": ["A", "B"], "count": parameters["sample"]}]
+            return []
+        return read
+
+    @pytest.mark.asyncio
+    async def test_counts_per_label_and_type(self):
+        """Counts use one labelled pattern per branch and never scan all nodes."""
+        labels = [f"L{i}" for i in range(schema_cache.COUNT_BATCH_SIZE + 5)] + ["Odd`Name"]
+        queries = []
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        with patch.object(Neo4jConnectionManager, "execute_read_query", self._fake_read(labels, ["KNOWS"], queries)):
+            schema = await manager._fetch_schema_info()
+
+        assert [row["label"] for row in schema["counts"]] == labels
+        assert schema["relationship_counts"] == [{"relationshipType": "KNOWS", "count": 7}]
+        assert "label_combinations" not in schema
+        assert not any("labels(n)" in query for query, _ in queries)
+
+        label_batches = [query for query, _ in queries if "WITH count(n) AS count" in query]
+        assert len(label_batches) == 2
+        assert "MATCH (n:`Odd``Name`)" in label_batches[1]
+        assert "MATCH ()-[r:`KNOWS`]->()" in "".join(query for query, _ in queries)
+
+    def test_count_branches_have_no_grouping_key(self):
+        """Each branch aggregates without a grouping key, the shape planned from the count store.
+
+        ``EXPLAIN`` on a branch shows ``NodeCountFromCountStore`` /
+        ``RelationshipCountFromCountStore``; returning the name next to
+        ``count()`` would make it a grouping key and plan a label scan.
+        """
+        queries = schema_cache.label_count_queries(["A", "B"]) + schema_cache.relationship_count_queries(["KNOWS"])
+        branches = [branch for query, _ in queries for branch in query.split("\nUNION ALL\n")]
+        assert len(branches) == 3
+        for branch in branches:
+            match, projection = branch.split(" RETURN ")
+            assert re.fullmatch(r"MATCH (\(n:`\w+`\)|\(\)-\[r:`\w+`\]->\(\)) WITH count\([nr]\) AS count", match)
+            assert re.fullmatch(r"\$name\d+ AS (label|relationshipType), count", projection)
+
+    @pytest.mark.asyncio
+    async def test_label_combinations_opt_in(self):
+        """The label combination breakdown runs only when sampling is configured."""
+        queries = []
+        manager = Neo4jConnectionManager(Neo4jConfig(schema_combination_sample=500))
+        with patch.object(Neo4jConnectionManager, "execute_read_query", self._fake_read(["A", "B"], [], queries)):
+            schema = await manager._fetch_schema_info()
+
+        assert schema["label_combinations"] == {"sample": 500, "rows": [{"labels": ["A", "B"], "count": 500}]}
+
+        mock_manager = Mock()
+        mock_manager.config = Neo4jConfig()
+        mock_manager.query_log = QueryLog(10)
+        mock_manager.get_schema_snapshot = AsyncMock(return_value={
+            "version": 1, "fetched_at": time.time(), "schema": schema
+        })
+        text = (await get_neo4j_schema(mock_manager))[0].text
+        assert "- **A**: 3 nodes" in text
+        assert "## Label Combinations (sample of 500 nodes)" in text
+        assert "- **A:B**: 500 nodes" in text
+
+
+    @pytest.mark.asyncio
+    async def test_sections_run_concurrently_with_partial_results(self):
+        """A slow and a failing section are reported while the other sections are kept."""
+        fake_read = self._fake_read(["A"], ["KNOWS"], [])
+
+        async def read(self, query, parameters=None, limit=None, convert=None, cache=True):
+            await asyncio.sleep(0.05)
+            if "db.schema.visualization" in query:
+                await asyncio.sleep(10)
+            if "db.relationshipTypes()" in query:
+                raise ClientError("procedure not allowed")
+            return await fake_read(self, query, parameters, limit, convert, cache)
+
+        manager = Neo4jConnectionManager(Neo4jConfig(schema_query_timeout=0.2))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with patch.object(Neo4jConnectionManager, "execute_read_query", read):
+            snapshot = await manager.schema_cache.refresh()
+        elapsed = loop.time() - started
+
+        schema = snapshot["schema"]
+        assert elapsed < 0.5
+        assert schema["nodes"] == [{"label": "A", "properties": []}]
+        assert schema["counts"] == [{"label": "A", "count": 3}]
+        assert schema["schema"] == [] and schema["relationship_counts"] == []
+        assert schema["errors"]["schema"] == "timed out after 0.2s"
+        assert "procedure not allowed" in schema["errors"]["relationships"]
+        assert "skipped" in schema["errors"]["relationship_counts"]
+        # Partial results are not kept as the snapshot
+        assert manager.schema_cache.snapshot is None
+
+        mock_manager = Mock()
+        mock_manager.config = Neo4jConfig()
+        mock_manager.query_log = QueryLog(10)
+        mock_manager.get_schema_snapshot = AsyncMock(return_value=snapshot)
+        text = (await get_neo4j_schema(mock_manager))[0].text
+        assert "## Incomplete Sections" in text
+        assert "- **schema**: timed out after 0.2s" in text
+        assert "- **A**: 3 nodes" in text
+
+
+
+class TestSchemaProperties:
+    """Test property-level schema from the db.schema procedures and sampling."""
+
+    _NODE_TYPE_ROWS = [
+        {"nodeType": ":`A`", "nodeLabels": ["A"], "propertyName": "name", "propertyTypes": ["String"], "mandatory": True},
+        {"nodeType": ":`A`", "nodeLabels": ["A"], "propertyName": "age", "propertyTypes": ["Long"], "mandatory": True},
+        {"nodeType": ":`A`:`B`", "nodeLabels": ["A", "B"], "propertyName": "name", "propertyTypes": ["String"], "mandatory": True},
+        {"nodeType": ":`C`", "nodeLabels": ["C"], "propertyName": None, "propertyTypes": None, "mandatory": False},
+    ]
+    _REL_TYPE_ROWS = [
+        {"relType": ":`KNOWS`", "propertyName": "since", "propertyTypes": ["Date"], "mandatory": False},
+    ]
+    _SAMPLES = {
+        "A": [{"name": "x", "tags": ["a"]}, {"name": "y", "born": DateTime(2000, 1, 1, tzinfo=datetime.timezone.utc)}],
+        "B": [], "C": [],
+    }
+
+    def _read(self, queries, procedure_error=None):
+        counts = TestSchemaCounts._fake_read(["A", "B", "C"], ["KNOWS"], queries)
+
+        async def read(self_, query, parameters=None, limit=None, convert=None, cache=True):
+            if "db.schema.nodeTypeProperties" in query or "db.schema.relTypeProperties" in query:
+                queries.append((query, parameters))
+                if procedure_error:
+                    raise procedure_error
+                return self._NODE_TYPE_ROWS if "nodeType" in query else self._REL_TYPE_ROWS
+            if "properties(n) AS props" in query:
+                queries.append((query, parameters))
+                return [
+                    {"label": name, "props": props}
+                    for name in parameters.values() if name in self._SAMPLES
+                    for props in self._SAMPLES[name][:parameters["sample"]]
+                ]
+            if "properties(r) AS props" in query:
+                queries.append((query, parameters))
+                return [{"relationshipType": "KNOWS", "props": {"weight": 1.5}}]
+            return await counts(self_, query, parameters, limit, convert, cache)
+        return read
+
+    @staticmethod
+    def _properties(schema, kind, name_field):
+        return {row[name_field]: row["properties"] for row in schema[kind]}
+
+    @pytest.mark.asyncio
+    async def test_procedure_properties(self):
+        """Below the scan limit, properties come from the db.schema procedures."""
+        queries = []
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        with patch.object(Neo4jConnectionManager, "execute_read_query", self._read(queries)):
+            schema = await manager._fetch_schema_info()
+
+        nodes = self._properties(schema, "nodes", "label")
+        assert nodes["A"] == [
+            {"property": "age", "types": ["Long"], "mandatory": False},
+            {"property": "name", "types": ["String"], "mandatory": True},
+        ]
+        assert nodes["B"] == [{"property": "name", "types": ["String"], "mandatory": True}]
+        assert nodes["C"] == []
+        assert self._properties(schema, "relationships", "relationshipType")["KNOWS"] == [
+            {"property": "since", "types": ["Date"], "mandatory": False}
+        ]
+        assert schema["property_sources"]["nodes"] == "db.schema procedure"
+        assert not any("props" in query for query, _ in queries)
+
+        mock_manager = Mock()
+        mock_manager.config = Neo4jConfig()
+        mock_manager.query_log = QueryLog(10)
+        mock_manager.get_schema_snapshot = AsyncMock(return_value={
+            "version": 1, "fetched_at": time.time(), "schema": schema
+        })
+        text = (await get_neo4j_schema(mock_manager))[0].text
+        assert "  - name: String (mandatory)" in text
+        assert "### KNOWS" in text and "  - since: Date" in text
+
+    @pytest.mark.asyncio
+    async def test_large_graphs_are_sampled(self):
+        """Above the scan limit, or when the procedure fails, a bounded sample per label is read."""
+        for config, error in ((Neo4jConfig(schema_property_scan_limit=5), None),
+                              (Neo4jConfig(), ClientError("procedure not found"))):
+            queries = []
+            manager = Neo4jConnectionManager(config)
+            with patch.object(Neo4jConnectionManager, "execute_read_query", self._read(queries, error)):
+                schema = await manager._fetch_schema_info()
+
+            assert "errors" not in schema
+            assert self._properties(schema, "nodes", "label")["A"] == [
+                {"property": "born", "types": ["DateTime"], "mandatory": False},
+                {"property": "name", "types": ["String"], "mandatory": True},
+                {"property": "tags", "types": ["StringArray"], "mandatory": False},
+            ]
+            assert self._properties(schema, "relationships", "relationshipType")["KNOWS"] == [
+                {"property": "weight", "types": ["Double"], "mandatory": True}
+            ]
+            assert schema["property_sources"]["nodes"] == "sampled, up to 100 per label"
+            sample_queries = [query for query, _ in queries if "properties(n) AS props" in query]
+            assert sample_queries and all("LIMIT $sample" in query for query in sample_queries)
+
+    def test_property_type_names(self):
+        """Sampled values are named like the procedure's property types."""
+        assert [property_type(value) for value in (True, 1, 1.0, "s", [1, 2], [])] == [
+            "Boolean", "Long", "Double", "String", "LongArray", "List"
+        ]
+        assert property_type(DateTime(2000, 1, 1)) == "LocalDateTime"
+        assert property_type(Date(2000, 1, 1)) == "Date"
+
+
+
+class TestSchemaDiff:
+    """Test schema content hashes and `since` diffs."""
+
+    _SCHEMA = {
+        "nodes": [
+            {"label": "Customer", "properties": [{"property": "id", "types": ["Long"], "mandatory": True}]},
+            {"label": "Legacy", "properties": []},
+        ],
+        "relationships": [{"relationshipType": "PLACED", "properties": []}],
+        "schema": [],
+        "counts": [{"label": "Customer", "count": 10}, {"label": "Legacy", "count": 1}],
+        "relationship_counts": [{"relationshipType": "PLACED", "count": 4}],
+    }
+
+    def _changed_schema(self):
+        schema = json.loads(json.dumps(self._SCHEMA))
+        schema["nodes"][0]["properties"] = [
+            {"property": "id", "types": ["String"], "mandatory": True},
+            {"property": "email", "types": ["String"], "mandatory": False},
+        ]
+        del schema["nodes"][1]
+        schema["nodes"].append({"label": "Supplier", "properties": []})
+        schema["counts"] = [{"label": "Customer", "count": 12}, {"label": "Supplier", "count": 3}]
+        return schema
+
+    def test_hash_is_stable_and_diff_lists_changes(self):
+        """Equal content hashes equally; the diff names added, removed and changed entries."""
+        reordered = dict(reversed(list(self._SCHEMA.items())))
+        assert schema_hash(reordered) == schema_hash(self._SCHEMA)
+        assert schema_hash(dict(self._SCHEMA, errors={})) == schema_hash(self._SCHEMA)
+        # Data writes change counts, not the schema
+        recounted = dict(self._SCHEMA, counts=[{"label": "Customer", "count": 11}], relationship_counts=[])
+        assert schema_hash(recounted) == schema_hash(self._SCHEMA)
+        assert diff_schemas(self._SCHEMA, self._SCHEMA) == {}
+
+        changes = diff_schemas(self._SCHEMA, self._changed_schema())
+        assert set(changes) == {"nodes", "counts"}
+        assert [entry["label"] for entry in changes["nodes"]["added"]] == ["Supplier"]
+        assert [entry["label"] for entry in changes["nodes"]["removed"]] == ["Legacy"]
+        properties = changes["nodes"]["changed"][0]["properties"]
+        assert [prop["property"] for prop in properties["added"]] == ["email"]
+        assert properties["changed"] == [{"property": "id", "types": {"before": ["Long"], "after": ["String"]}}]
+        assert changes["counts"]["changed"] == [{"label": "Customer", "count": {"before": 10, "after": 12}}]
+
+    @pytest.mark.asyncio
+    async def test_since_returns_only_changes(self):
+        """A kept hash gets a diff, the current hash a no-change reply, an unknown hash the full schema."""
+        manager = Neo4jConnectionManager(Neo4jConfig(schema_history_size=2))
+        cache = manager.schema_cache
+        first = cache.store(self._SCHEMA, cache.generation)
+        assert cache.store(self._SCHEMA, cache.generation)["version"] == first["version"]
+        recounted = cache.store(dict(self._SCHEMA, counts=[{"label": "Customer", "count": 11}]), cache.generation)
+        assert (recounted["version"], recounted["hash"]) == (first["version"], first["hash"])
+        cache.invalidate("test")
+        # Partial and raced fetches are not kept and use up no version numbers
+        assert cache.store(dict(self._changed_schema(), errors={"counts": "timed out"}), cache.generation)["version"] is None
+        assert cache.store(self._changed_schema(), cache.generation - 1)["version"] is None
+        second = cache.store(self._changed_schema(), cache.generation)
+        assert second["version"] == first["version"] + 1
+
+        with patch.object(Neo4jConnectionManager, "get_schema_snapshot", AsyncMock(return_value=second)):
+            diff = (await get_neo4j_schema(manager, since=first["hash"]))[0].text
+            unchanged = (await get_neo4j_schema(manager, since=second["hash"]))[0].text
+            full = (await get_neo4j_schema(manager, since="0123456789abcdef"))[0].text
+
+        assert diff.startswith("# Neo4j Schema Changes")
+        assert "- added **Supplier**" in diff and "- removed **Legacy**" in diff
+        assert "- changed **Customer**: added property email: String, property id types Long -> String" in diff
+        assert "- changed **Customer**: 11 -> 12" in diff
+        assert diff.index("## Node Labels") < diff.index("## Node Counts by Label")
+        assert "PLACED" not in diff
+        assert "No changes" in unchanged
+        assert "call without `since` for current counts" in unchanged
+        assert "is no longer kept" in full and f"`{second['hash']}`" in full and "## Node Labels" in full
+
+        # Only the configured number of versions is kept
+        cache.invalidate("test")
+        cache.store(dict(self._SCHEMA, relationships=[]), cache.generation)
+        assert cache.find(first["hash"]) is None and cache.find(second["hash"]) is not None
+
+
+
+class TestSchemaViews:
+    """Test filtered and paginated schema views."""
+
+    _LABELS = [f"TenantA_{i:03d}" for i in range(250)] + ["TenantB_Order", "Shared"]
+
+    def _read(self, queries):
+        counts = TestSchemaCounts._fake_read(self._LABELS, ["TenantA_OWNS", "LINKS"], queries)
+
+        async def read(self_, query, parameters=None, limit=None, convert=None, cache=True):
+            if "SKIP $skip" in query:
+                queries.append((query, parameters))
+                field = "label" if "db.labels()" in query else "relationshipType"
+                names = self._LABELS if field == "label" else ["LINKS", "TenantA_OWNS"]
+                names = sorted(name for name in names if name.startswith(parameters.get("prefix", "")))
+                page = names[parameters["skip"]:parameters["skip"] + parameters["limit"]]
+                return [{field: name, "properties": []} for name in page]
+            return await counts(self_, query, parameters, limit, convert, cache)
+        return read
+
+    def test_names_query_filters_in_cypher(self):
+        """Prefix and regex filters and paging go into the listing query."""
+        view = SchemaView(label_prefix="TenantA_", label_regex="TenantA_0.*", page=3, page_size=50)
+        query, parameters = view.names_query("nodes")
+        assert "CALL db.labels() YIELD label WHERE label STARTS WITH $prefix AND label =~ $regex" in query
+        assert "ORDER BY label SKIP $skip LIMIT $limit" in query
+        assert parameters == {"skip": 100, "limit": 51, "prefix": "TenantA_", "regex": "TenantA_0.*"}
+
+        query, parameters = view.names_query("relationships")
+        assert "WHERE" not in query and parameters == {"skip": 100, "limit": 51}
+
+        with pytest.raises(ValueError):
+            SchemaView(label_regex="(")
+        with pytest.raises(ValueError):
+            SchemaView(sections=["indexes!"])
+
+    @pytest.mark.asyncio
+    async def test_uncached_view_reads_only_one_page(self):
+        """Without a snapshot, only the filtered page is listed and counted."""
+        queries = []
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        with patch.object(Neo4jConnectionManager, "execute_read_query", self._read(queries)):
+            text = (await get_neo4j_schema(
+                manager, label_prefix="TenantA_", type_prefix="TenantA_", sections=["nodes", "counts"], page_size=100
+            ))[0].text
+
+        count_params = [params for query, params in queries if "WITH count(n) AS count" in query]
+        counted = [name for params in count_params for name in params.values()]
+        assert counted == self._LABELS[:100]
+        assert not any("visualization" in query or "nodeTypeProperties" in query for query, _ in queries)
+        assert manager.schema_cache.snapshot is None
+
+        assert "- **TenantA_099**: 3 nodes" in text and "TenantA_100" not in text
+        assert "Shared" not in text and "## Relationship Types" not in text
+        assert "**More labels match.** Call again with `page=2`" in text
+
+    @pytest.mark.asyncio
+    async def test_cached_snapshot_is_filtered_in_memory(self):
+        """With a snapshot, views filter it without querying the database."""
+        schema = {
+            "nodes": [{"label": name, "properties": [{"property": "id", "types": ["Long"], "mandatory": True}]}
+                      for name in self._LABELS],
+            "relationships": [{"relationshipType": "LINKS", "properties": []},
+                              {"relationshipType": "TenantA_OWNS", "properties": []}],
+            "schema": [],
+            "counts": [{"label": name, "count": 3} for name in self._LABELS],
+            "relationship_counts": [],
+        }
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        manager.schema_cache.store(schema, manager.schema_cache.generation)
+
+        with patch.object(Neo4jConnectionManager, "execute_read_query", AsyncMock(side_effect=AssertionError)):
+            result = await manager.get_schema_view(SchemaView(label_regex="TenantB_.*|Shared", sections=["nodes"]))
+
+        view = result["schema"]
+        assert result["source"] == "snapshot version 1"
+        assert [row["label"] for row in view["nodes"]] == ["TenantB_Order", "Shared"]
+        assert all(row["properties"] == [] for row in view["nodes"])
+        assert "counts" not in view and "relationships" not in view
+        assert view["page"]["more"] == {"nodes": False, "relationships": False}
+
+        paged = SchemaView(label_prefix="TenantA_", page=3, page_size=100).apply(schema)
+        assert [row["label"] for row in paged["nodes"]] == self._LABELS[200:250]
+        assert [row["label"] for row in paged["counts"]] == self._LABELS[200:250]
+
+        properties = SchemaView(label_regex="Shared", sections=["properties"]).apply(schema)
+        assert properties["nodes"] == [{"label": "Shared", "properties": schema["nodes"][0]["properties"]}]
+        assert "counts" not in properties
+
+    @pytest.mark.asyncio
+    async def test_properties_section_lists_names(self):
+        """Selecting only properties still returns the labels and types they belong to."""
+        queries = []
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        with patch.object(Neo4jConnectionManager, "execute_read_query", self._read(queries)):
+            result = await manager.get_schema_view(SchemaView(label_prefix="TenantB_", sections=["properties"]))
+
+        assert [row["label"] for row in result["schema"]["nodes"]] == ["TenantB_Order"]
+        assert "relationships" in result["schema"]
+        assert any("properties(n)" in query for query, _ in queries)
+
+
+
+class TestIndexAdvisor:
+    """Test index and constraint introspection and the index advisor."""
+
+    _INDEXES = [
+        {"id": 1, "name": "person_email", "state": "ONLINE", "populationPercent": 100.0, "type": "RANGE",
+         "entityType": "NODE", "labelsOrTypes": ["Person"], "properties": ["email"], "indexProvider": "range-1.0",
+         "owningConstraint": None, "lastRead": DateTime(2026, 1, 2, 3, 4, 5), "readCount": 42},
+        {"id": 2, "name": "order_legacy", "state": "ONLINE", "populationPercent": 100.0, "type": "RANGE",
+         "entityType": "NODE", "labelsOrTypes": ["Order"], "properties": ["legacyId"], "indexProvider": "range-1.0",
+         "owningConstraint": None, "lastRead": None, "readCount": 0},
+        {"id": 3, "name": "index_343aff4e", "state": "ONLINE", "populationPercent": 100.0, "type": "LOOKUP",
+         "entityType": "NODE", "labelsOrTypes": None, "properties": None, "indexProvider": "token-lookup-1.0",
+         "owningConstraint": None, "lastRead": None, "readCount": 0},
+    ]
+
+    def test_query_predicates(self):
+        """Lookups in MATCH/MERGE maps and WHERE comparisons count; CREATE maps and SET do not."""
+        assert query_predicates(
+            "MATCH (p:Person {email: $email})-[r:KNOWS]->(f:Person) WHERE f.age > 30 AND r.since STARTS WITH '19'"
+        ) == {("NODE", ("Person",), "email"), ("NODE", ("Person",), "age"), ("RELATIONSHIP", ("KNOWS",), "since")}
+        assert query_predicates("MERGE (c:Customer {id: $id}) ON CREATE SET c.name = $name") == {
+            ("NODE", ("Customer",), "id")
+        }
+        assert query_predicates("MATCH (c:Customer:VIP {id: $id}) WHERE c.tier > 1 RETURN c") == {
+            ("NODE", ("Customer", "VIP"), "id"), ("NODE", ("Customer", "VIP"), "tier")
+        }
+        assert query_predicates("CREATE (c:Customer {id: 1}) RETURN c.id = 1") == set()
+        assert query_predicates("MATCH (n) WHERE n.id = 1 RETURN n") == set()
+
+    @pytest.mark.asyncio
+    async def test_indexes_and_constraints_are_listed(self):
+        """SHOW INDEXES rows are normalized; a failing SHOW CONSTRAINTS falls back to db.constraints()."""
+        queries = []
+        counts = TestSchemaCounts._fake_read(["Person", "Order"], [], queries)
+
+        async def read(self_, query, parameters=None, limit=None, convert=None, cache=True):
+            if query == "SHOW INDEXES YIELD *":
+                return self._INDEXES
+            if query == "SHOW CONSTRAINTS YIELD *":
+                raise ClientError("Invalid input 'SHOW'")
+            if query == "CALL db.constraints()":
+                return [{"name": "order_id", "description": "CONSTRAINT ON ( order:Order ) ASSERT (order.id) IS UNIQUE"}]
+            return await counts(self_, query, parameters, limit, convert, cache)
+
+        manager = Neo4jConnectionManager(Neo4jConfig())
+        with patch.object(Neo4jConnectionManager, "execute_read_query", read):
+            schema = await manager._fetch_schema_info()
+
+        assert "errors" not in schema
+        assert schema["indexes"][0] == {
+            "name": "person_email", "type": "RANGE", "entityType": "NODE", "labelsOrTypes": ["Person"],
+            "properties": ["email"], "state": "ONLINE", "populationPercent": 100.0, "readCount": 42,
+            "lastRead": "2026-01-02T03:04:05.000000000", "owningConstraint": None,
+        }
+        assert schema["constraints"] == [
+            {"name": "order_id", "description": "CONSTRAINT ON ( order:Order ) ASSERT (order.id) IS UNIQUE"}
+        ]
+
+        # Read counts change with every query; they do not change the schema hash
+        busier = dict(schema, indexes=[dict(schema["indexes"][0], readCount=43)] + schema["indexes"][1:])
+        assert schema_hash(busier) == schema_hash(schema)
+        assert diff_schemas(schema, busier) == {}
+
+    @pytest.mark.asyncio
+    async def test_advisor_flags_missing_and_unused_indexes(self):
+        """Recent tool queries filtering on unindexed properties are flagged, as are unread indexes."""
+        server = Neo4jMCPServer()
+        server.connection_manager.driver = _SlowAsyncDriver(delay=0)
+        for _ in range(3):
+            await _call_tool(server, "read_neo4j_cypher", {"query": "MATCH (o:Order) WHERE o.status = $s RETURN o"})
+        await _call_tool(server, "read_neo4j_cypher", {"query": "MATCH (p:Person {email: $e}) RETURN p"})
+        query_log = server.connection_manager.query_log
+        assert len(query_log) == 2 and query_log.entries()[1]["runs"] == 3
+
+        indexes = [normalize_index(row) for row in self._INDEXES]
+        advice = advise(query_log.entries(), indexes)
+        assert [(found["labelsOrTypes"], found["property"], found["runs"]) for found in advice["missing"]] == [
+            (["Order"], "status", 3)
+        ]
+        assert [index["name"] for index in advice["unused"]] == ["order_legacy"]
+
+        schema = {"nodes": [{"label": "Order", "properties": []}], "indexes": indexes, "constraints": []}
+        with patch.object(Neo4jConnectionManager, "get_schema_snapshot",
+                          AsyncMock(return_value={"version": 1, "fetched_at": time.time(), "schema": schema})), \
+                patch.object(Neo4jConnectionManager, "list_indexes", AsyncMock(return_value=indexes)):
+            text = (await get_neo4j_schema(server.connection_manager))[0].text
+
+        assert "- **person_email**: RANGE on (:Person)(email) (ONLINE, 42 reads, last read 2026-01-02" in text
+        assert "**Missing index** on (:Order).status: filtered without an index in 3 run(s)" in text
+        assert "**Unused index** order_legacy" in text
+        assert "index_343aff4e" in text and "Unused index** index_343aff4e" not in text
+
+    @pytest.mark.asyncio
+    async def test_advisor_reads_current_usage(self):
+        """Unused indexes are judged on a fresh listing, not the snapshot's read counts."""
+        server = Neo4jMCPServer()
+        server.connection_manager.query_log.record("MATCH (c:Customer:VIP {id: $id}) RETURN c")
+        stale = [normalize_index(row) for row in self._INDEXES]
+        current = [dict(index, readCount=7) if index["name"] == "order_legacy" else index for index in stale]
+        current.append({"name": "vip_id", "type": "RANGE", "entityType": "NODE", "labelsOrTypes": ["VIP"],
+                        "properties": ["id"], "readCount": 1})
+
+        schema = {"nodes": [], "indexes": stale, "constraints": []}
+        with patch.object(Neo4jConnectionManager, "get_schema_snapshot",
+                          AsyncMock(return_value={"version": 1, "fetched_at": time.time(), "schema": schema})), \
+                patch.object(Neo4jConnectionManager, "list_indexes", AsyncMock(return_value=current)):
+            text = (await get_neo4j_schema(server.connection_manager))[0].text
+
+        assert "index read counts at most 60s old" in text
+        assert "Unused index" not in text and "Missing index" not in text
+
+        with patch.object(Neo4jConnectionManager, "get_schema_snapshot",
+                          AsyncMock(return_value={"version": 1, "fetched_at": time.time(), "schema": schema})), \
+                patch.object(Neo4jConnectionManager, "list_indexes", AsyncMock(side_effect=ServiceUnavailable("down"))):
+            text = (await get_neo4j_schema(server.connection_manager))[0].text
+
+        assert "read counts from the schema snapshot, which may be out of date" in text
+        assert "**Missing index** on (:Customer:VIP).id" in text
+
+    @pytest.mark.asyncio
+    async def test_recent_index_listing_is_reused(self):
+        """An indexes view without a snapshot lists indexes once; a schema write forces a new listing."""
+        queries = []
+        counts = TestSchemaCounts._fake_read(["Person", "Order"], [], queries)
+
+        async def read(self_, query, parameters=None, limit=None, convert=None, cache=True):
+            if query == "SHOW INDEXES YIELD *":
+                queries.append(query)
+                return self._INDEXES
+            if query == "SHOW CONSTRAINTS YIELD *":
+                return []
+            return await counts(self_, query, parameters, limit, convert, cache)
+
+        server = Neo4jMCPServer()
+        manager = server.connection_manager
+        with patch.object(Neo4jConnectionManager, "execute_read_query", read):
+            text = (await get_neo4j_schema(manager, label_prefix="Ord", sections=["indexes"]))[0].text
+            assert "## Index Advisor" in text and "**Unused index** order_legacy" in text
+            # The advisor reads the unfiltered listing, so person_email is not judged from the view
+            assert "person_email" not in text
+            assert queries.count("SHOW INDEXES YIELD *") == 1
+
+            manager.schema_cache.invalidate("write reported indexes_added")
+            await manager.list_indexes(60.0)
+            assert queries.count("SHOW INDEXES YIELD *") == 2
+            await manager.list_indexes()
+            assert queries.count("SHOW INDEXES YIELD *") == 3
+
+    def test_views_filter_indexes(self):
+        """Filtered views keep indexes on matching labels and token lookup indexes."""
+        indexes = [normalize_index(row) for row in self._INDEXES]
+        view = SchemaView(label_prefix="Ord", sections=["indexes"]).apply({"nodes": [], "indexes": indexes})
+        assert [index["name"] for index in view["indexes"]] == ["order_legacy", "index_343aff4e"]
+        assert "nodes" not in view
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file